@@ -1,4 +1,41 @@
+const fs = require('fs');
+const path = require('path');
+
+// Content-hashed copies written by scripts/csv-to-json.py --hashed-filenames
+// (e.g. landmarks.9c1005aa.json, with .gz/.br copies); only top-level files
+// are hashed, so this never matches the landmark shard or tour bundle
+// directories, whose files keep fixed names
+const HASHED_DATA_FILE = '/data/:file([\\w.-]+\\.[0-9a-f]{8}\\.json(?:\\.gz|\\.br)?)';
+
 /** @type {import('next').NextConfig} */
-const nextConfig = {};
+const nextConfig = {
+  env: {
+    // '1' when scripts/csv-to-json.py --hashed-filenames wrote a data manifest
+    // before the build; otherwise the data loaders never request it
+    NEXT_PUBLIC_DATA_MANIFEST:
+      process.env.NEXT_PUBLIC_DATA_MANIFEST ??
+      (fs.existsSync(path.join(__dirname, 'public', 'data', 'manifest.json')) ? '1' : '0'),
+    // '1' when scripts/csv-to-json.py --search-index wrote a prebuilt search
+    // index; otherwise SearchBar builds a Fuse.js index from the loaded data
+    NEXT_PUBLIC_SEARCH_INDEX:
+      process.env.NEXT_PUBLIC_SEARCH_INDEX ??
+      (fs.existsSync(path.join(__dirname, 'public', 'data', 'search-index.json')) ? '1' : '0'),
+  },
+  async headers() {
+    // The last matching rule wins: everything under /data (the manifest,
+    // fixed names, shards, the spatial grid and tour bundles) revalidates,
+    // and only hashed copies, which never change, are cached as immutable
+    return [
+      {
+        source: '/data/:path*',
+        headers: [{ key: 'Cache-Control', value: 'public, max-age=0, must-revalidate' }],
+      },
+      {
+        source: HASHED_DATA_FILE,
+        headers: [{ key: 'Cache-Control', value: 'public, max-age=31536000, immutable' }],
+      },
+    ];
+  },
+};
 
 module.exports = nextConfig;
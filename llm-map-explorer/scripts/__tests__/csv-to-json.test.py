@@ -6,17 +6,45 @@ Run with:
     python -m pytest scripts/__tests__/csv-to-json.test.py -v
 """
 
+import copy
+import gzip
+import importlib.util
+import io
 import json
 import tempfile
+import threading
+import time
+import tracemalloc
 import pytest
 from pathlib import Path
 from csv import DictWriter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
 from typing import Dict, Any, List
 
 # Import the converter
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from csv_to_json import CSVToJSONConverter
+from csv_to_json import (
+    AssetManifestWriter,
+    CapabilityGeometryWriter,
+    Column,
+    CoordinateRecord,
+    CSVToJSONConverter,
+    Diagnostic,
+    get_json_backend,
+    JSONBackend,
+    MappedCSVReader,
+    PipelineMetrics,
+    RECORD_MODELS,
+    ReferenceChecker,
+    REQUIRED_FIELDS,
+    RowCache,
+    SearchIndexBuilder,
+    TourBundleWriter,
+    register_entity,
+)
+import csv_to_json
 
 
 class TestCSVToJSONConverter:
@@ -29,6 +57,7 @@ class TestCSVToJSONConverter:
         with tempfile.TemporaryDirectory() as tmpdir:
             converter.csv_dir = Path(tmpdir) / "csv"
             converter.output_dir = Path(tmpdir) / "data"
+            converter.cache_dir = Path(tmpdir) / "cache"
             converter.csv_dir.mkdir()
             converter.output_dir.mkdir()
             yield converter
@@ -298,6 +327,65 @@ class TestCSVToJSONConverter:
         with pytest.raises(ValueError):
             converter._read_csv(converter.csv_dir / "test.csv")
 
+    def test_mapped_reader_matches_dict_reader(self, converter):
+        """Test the mmap reader returns the same rows as the csv reader, also per byte range."""
+        csv_path = converter.csv_dir / "test.csv"
+        csv_path.write_bytes(
+            'id,name,notes\r\n'
+            '1,"Multi\r\nline, quoted ""name""",x\r\n'
+            ',,\r\n'
+            '\r\n'
+            '2,Ünïcode\r\n'
+            '3,Extra,y,z\r\n'
+            '4,"Last",'.encode("utf-8")
+        )
+        expected = converter._read_csv(csv_path)
+
+        with MappedCSVReader(csv_path) as reader:
+            assert [dict(row) for row in reader.rows()] == [
+                {key: value for key, value in row.items() if key is not None} for row in expected
+            ]
+            ranges = reader.row_ranges(2)
+            assert len(ranges) == 3
+            assert [row for start, end in ranges for row in reader.rows(start, end)] == list(reader.rows())
+
+        converter.csv_reader = "mmap"
+        assert converter._read_csv(csv_path)[0] == {"id": "1", "name": 'Multi\nline, quoted "name"', "notes": "x"}
+
+    def test_mapped_reader_projects_wide_rows(self, converter):
+        """Test slicing the kept fields out of wide rows reads like the csv reader."""
+        csv_path = converter.csv_dir / "test.csv"
+        csv_path.write_bytes(
+            'id,name,a,b,c,d\r\n'
+            '1,"Multi\r\nline, quoted ""name""",x,y,z,w\r\n'
+            ',,,,,\r\n'
+            '\r\n'
+            '2,Ünïcode\r\n'
+            '3,"x",y,"z,"",q",r,s\r\n'
+            '4,ab"c"d,x,"unused, ""quoted""",,\r\n'
+            ',Nameless,x,y,z,w\r\n'
+            '5\r\n'
+            '6,"two\nlines",x,"y\nz",,\r\n'
+            '"7",Last,,,,'.encode("utf-8")
+        )
+        expected = [{"id": row["id"], "name": row["name"]} for row in converter._read_csv(csv_path)]
+
+        with MappedCSVReader(csv_path, ["id", "name"]) as reader:
+            assert reader.projected
+            assert list(reader.rows()) == expected
+            ranges = reader.row_ranges(3)
+            assert [row for start, end in ranges for row in reader.rows(start, end)] == expected
+        with MappedCSVReader(csv_path, ["id", "name", "a", "b"]) as reader:
+            assert not reader.projected
+
+    def test_mapped_reader_keeps_used_columns(self, converter):
+        """Test the mmap reader only builds the columns an entity type reads."""
+        rows = [{"id": "org-1", "scratch": "unused", "name": "Org", "color": "#000000"}]
+        csv_path = self.create_csv_file(converter, "organizations.csv", rows)
+        converter.csv_reader = "mmap"
+
+        assert converter._read_csv(csv_path) == [{"id": "org-1", "name": "Org", "color": "#000000"}]
+
     # Type coercion tests
     def test_coerce_types_capabilities(self, converter):
         """Test type coercion for capabilities."""
@@ -392,6 +480,1390 @@ class TestCSVToJSONConverter:
             assert "organizations" in code
             assert "json.load" in code
 
+    # In-process validation tests
+    def test_validate_records_valid(self):
+        """Test in-process validation accepts complete records."""
+        records = [{"id": "org-001", "name": "Org", "description": "D", "landmarkIds": [], "color": "#000000"}]
+
+        assert CSVToJSONConverter._validate_records("organizations", records) is None
+
+    def test_validate_records_messages(self):
+        """Test in-process validation reports the subprocess error messages."""
+        records = [
+            {"id": "org-001", "name": "Org", "description": "D", "landmarkIds": [], "color": "#000000"},
+            {"id": "org-002", "name": "Org 2", "description": "D", "landmarkIds": []},
+        ]
+
+        assert (
+            CSVToJSONConverter._validate_records("organizations", records)
+            == "Row 3: Missing required field 'color'"
+        )
+        assert CSVToJSONConverter._validate_records("organizations", {}) == "Expected array at root, got dict"
+        assert CSVToJSONConverter._validate_records("unknown", []) == "Unknown entity type: unknown"
+        assert (
+            CSVToJSONConverter._validate_records("organizations", ["x"])
+            == "Row 2: Expected object, got str"
+        )
+
+    def test_validate_records_checks_models(self, converter):
+        """Test record models are validated through their fields, not waved through."""
+        organization = converter._coerce_record("organizations", {"id": "org-001", "name": "Org", "color": "#000000"})
+        point = CoordinateRecord(1200, 800)
+
+        assert CSVToJSONConverter._validate_records("organizations", [organization]) is None
+        assert (
+            CSVToJSONConverter._validate_records("organizations", [organization, point])
+            == "Row 3: Missing required field 'id'"
+        )
+
+    def test_validate_json_file_uses_records_in_memory(self, converter):
+        """Test validation checks the coerced records without re-reading the file."""
+        json_path = converter.output_dir / "organizations.json"
+        json_path.write_text("not json", encoding="utf-8")
+        records = [{"id": "org-001", "name": "Org", "description": "D", "landmarkIds": [], "color": "#000000"}]
+
+        assert converter._validate_json_file(json_path, records) is True
+        assert converter.errors == []
+
+    def test_validate_json_file_isolated(self, converter):
+        """Test opt-in subprocess validation reads the file from disk."""
+        converter.isolated_validation = True
+        json_path = converter.output_dir / "organizations.json"
+        json_path.write_text(json.dumps([{"id": "org-001"}]), encoding="utf-8")
+
+        assert converter._validate_json_file(json_path, []) is False
+        assert "Missing required field 'name'" in converter.errors[0]
+
+    # Streaming conversion tests
+    def test_streaming_output_matches_batch(self, converter):
+        """Test streaming conversion writes the same bytes as batch conversion."""
+        data = [
+            {"id": "org-001", "name": "Org", "description": "D", "website": "", "landmarkIds": "lm-001", "color": "#000000", "logo": ""},
+            {"id": "org-002", "name": "Örg", "description": "D", "website": "", "landmarkIds": "", "color": "#FFFFFF", "logo": ""},
+        ]
+        csv_path = self.create_csv_file(converter, "organizations.csv", data)
+        output_path = converter.output_dir / "organizations.json"
+
+        assert converter._convert_file(csv_path) is True
+        batch_bytes = output_path.read_bytes()
+
+        converter.stream = True
+        assert converter._convert_file(csv_path) is True
+
+        assert output_path.read_bytes() == batch_bytes
+        assert converter.stream_validation["organizations"] is None
+        assert converter._validate_json_file(output_path) is True
+
+    def test_streaming_failure_keeps_previous_output(self, converter):
+        """Test a failed streaming conversion leaves the existing JSON in place."""
+        converter.stream = True
+        output_path = converter.output_dir / "capabilities.json"
+        output_path.write_text("[]", encoding="utf-8")
+        self.create_csv_file(converter, "capabilities.csv", [{"id": "cap-001", "zoomThreshold": "x"}])
+
+        assert converter._convert_file(converter.csv_dir / "capabilities.csv") is False
+        assert output_path.read_text(encoding="utf-8") == "[]"
+        assert converter.errors[0].startswith("capabilities.csv: Row 2:")
+        assert list(converter.output_dir.iterdir()) == [output_path]
+
+    # Chunked coercion tests
+    def test_chunked_coercion_matches_serial(self):
+        """Test chunked coercion keeps record order, warnings and row numbers."""
+        rows = [
+            {"id": f"org-{i:03d}", "name": "Org", "description": "D", "landmarkIds": "", "color": "#000000"}
+            for i in range(7)
+        ]
+        serial = CSVToJSONConverter()._coerce_types("organizations", rows)
+
+        chunked = CSVToJSONConverter(jobs=2, chunk_size=2)._coerce_types("organizations", rows)
+
+        assert chunked == serial
+
+    def test_chunked_coercion_errors_and_warnings(self):
+        """Test chunked coercion reports the original row and collects warnings."""
+        def capability(i: int, lat: int, zoom: str = "0") -> Dict[str, Any]:
+            return {"id": f"cap-{i}", "polygonCoordinates": f"[[{lat}, 500]]", "zoomThreshold": zoom}
+
+        rows = [capability(0, 5000), capability(1, 500), capability(2, 6000), capability(3, 500, zoom="x"), capability(4, 7000)]
+        converter = CSVToJSONConverter(jobs=2, chunk_size=2)
+
+        with pytest.raises(ValueError, match=r"^Row 5: "):
+            converter._coerce_types("capabilities", rows)
+
+        assert len(converter.warnings) == 2
+        assert "cap-0" in converter.warnings[0]
+        assert "cap-2" in converter.warnings[1]
+
+    def test_mmap_chunked_ranges_match_csv_reader(self, converter):
+        """Test workers reading byte ranges report the same records, warnings and row numbers."""
+        rows = [
+            {"id": f"cap-{i}", "polygonCoordinates": f"[[{lat}, 500]]", "zoomThreshold": zoom}
+            for i, (lat, zoom) in enumerate([(5000, "0"), (500, "0"), (6000, "0"), (500, "0"), (500, "x"), (7000, "0")])
+        ]
+        csv_path = self.create_csv_file(converter, "capabilities.csv", rows)
+        outcomes = []
+        for reader in ("csv", "mmap"):
+            converter.jobs, converter.chunk_size, converter.csv_reader = 2, 2, reader
+            converter.warnings = []
+            records = []
+            with pytest.raises(ValueError, match=r"^Row 6: "):
+                for record in converter._iter_records("capabilities", csv_path):
+                    records.append(record)
+            outcomes.append((records, converter.warnings))
+
+        assert len(outcomes[1][0]) == 4
+        assert outcomes[1] == outcomes[0]
+
+    # Diagnostics tests
+    def test_coordinate_warnings_are_located(self, converter):
+        """Test coordinate warnings record file, row, record, field and vertex."""
+        rows = [
+            {"id": "cap-0", "polygonCoordinates": "[[500, 500]]"},
+            {"id": "cap-1", "polygonCoordinates": "[[500, 500], [5000, 500]]"},
+        ]
+        csv_path = self.create_csv_file(converter, "capabilities.csv", rows)
+
+        list(converter._iter_records("capabilities", csv_path))
+
+        warning = converter.warnings[-1]
+        assert isinstance(warning, Diagnostic)
+        assert (warning.file, warning.row, warning.entity, warning.field, warning.vertex) == (
+            "capabilities.csv", 3, "capability 'cap-1'", "polygonCoordinates", 2,
+        )
+        assert warning == (
+            "capabilities.csv: Row 3: capability 'cap-1' polygon vertex 2: "
+            "coordinate (5000, 500) is outside map bounds [0,3072]x[0,4096]"
+        )
+
+    def test_max_diagnostics_caps_each_file(self, converter):
+        """Test diagnostics over the per-file cap are counted instead of kept."""
+        converter.max_diagnostics = 3
+        rows = [{"id": f"cap-{i}", "polygonCoordinates": "[[5000, 500], [500, 9000]]"} for i in range(4)]
+        csv_path = self.create_csv_file(converter, "capabilities.csv", rows)
+
+        records = list(converter._iter_records("capabilities", csv_path))
+
+        assert len(records) == 4
+        assert [(w.row, w.vertex) for w in converter.warnings] == [(2, 1), (2, 2), (3, 1)]
+        assert converter.suppressed_diagnostics == {"capabilities.csv": 5}
+
+        checker = ReferenceChecker({"organizations": [{"id": "org-1", "landmarkIds": ["a", "b", "c"]}]}, max_problems=2)
+        assert len(checker.check()) == 2
+        assert checker.suppressed == {"organizations.csv": 1}
+
+    def test_diagnostics_json_report(self, capsys):
+        """Test --diagnostics-json writes located errors and warnings."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            converter = CSVToJSONConverter(strict_references=True, diagnostics_path=Path(tmpdir) / "diagnostics.json")
+            converter.csv_dir = Path(tmpdir) / "csv"
+            converter.output_dir = Path(tmpdir) / "data"
+            converter.cache_dir = Path(tmpdir) / "cache"
+            converter.csv_dir.mkdir()
+            self.create_csv_file(converter, "organizations.csv", [
+                {"id": "org-1", "name": "Org", "description": "D", "landmarkIds": "lm-1", "color": "#000000"},
+            ])
+
+            assert converter.run() == 1
+            report = json.loads(converter.diagnostics_path.read_text(encoding="utf-8"))
+
+        assert report["errors"] == [{
+            "severity": "error",
+            "file": "organizations.csv",
+            "row": 2,
+            "entity": None,
+            "field": "landmarkIds",
+            "vertex": None,
+            "message": "landmarkIds references unknown landmark 'lm-1'",
+            "text": "organizations.csv: Row 2: landmarkIds references unknown landmark 'lm-1'",
+        }]
+        assert report["warnings"][0]["text"] == "organizations.csv: Missing column(s), using defaults: website, logo"
+        assert report["suppressed"] == {}
+
+    # Metrics tests
+    def test_metrics_charge_nested_phases_separately(self):
+        """Test a phase is charged its own time, without the phases nested in it."""
+        metrics = PipelineMetrics()
+
+        def slow_rows():
+            time.sleep(0.05)
+            yield {"id": "lm-001"}
+
+        with metrics.phase("landmarks.csv", "coerce"):
+            time.sleep(0.02)
+            assert list(metrics.timed("landmarks.csv", "read", slow_rows())) == [{"id": "lm-001"}]
+
+        phases = metrics.files["landmarks.csv"]["phases"]
+        assert phases["read"]["seconds"] >= 0.05
+        assert 0.02 <= phases["coerce"]["seconds"] < 0.05
+
+    @pytest.mark.parametrize("options", [{}, {"stream": True}, {"jobs": 2}])
+    def test_metrics_files(self, options):
+        """Test --metrics-json/--metrics-prometheus record every phase of every converted file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            converter = CSVToJSONConverter(
+                metrics_path=Path(tmpdir) / "metrics.json",
+                prometheus_path=Path(tmpdir) / "csv_to_json.prom",
+                trace_memory=True,
+                **options,
+            )
+            converter.csv_dir = Path(tmpdir) / "csv"
+            converter.output_dir = Path(tmpdir) / "data"
+            converter.cache_dir = Path(tmpdir) / "cache"
+            converter.csv_dir.mkdir()
+            csv_path = self.create_csv_file(converter, "landmarks.csv", [
+                {"id": "lm-001", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]"},
+                {"id": "lm-002", "name": "Model", "type": "model", "year": "2020", "coordinates": "[2500, 3100]"},
+            ])
+            self.create_csv_file(converter, "organizations.csv", [
+                {"id": "org-1", "name": "Org", "description": "D", "landmarkIds": "lm-001", "color": "#000000"},
+            ])
+
+            assert converter.run() == 0
+            report = json.loads(converter.metrics_path.read_text(encoding="utf-8"))
+            prometheus = converter.prometheus_path.read_text(encoding="utf-8")
+            landmarks = report["files"]["landmarks.csv"]
+            assert landmarks["bytesIn"] == csv_path.stat().st_size
+            assert landmarks["bytesOut"] == (converter.output_dir / "landmarks.json").stat().st_size
+
+        assert not tracemalloc.is_tracing()
+        assert sorted(report["files"]) == ["landmarks.csv", "organizations.csv"]
+        assert landmarks["rows"] == 2
+        assert list(landmarks["phases"]) == ["read", "coerce", "write", "validate"]
+        assert all(phase["cpuSeconds"] >= 0 and phase["peakMemoryBytes"] >= 0 for phase in landmarks["phases"].values())
+        assert landmarks["seconds"] == pytest.approx(sum(phase["seconds"] for phase in landmarks["phases"].values()))
+        assert report["run"]["peakMemoryBytes"] > 0
+        assert "# TYPE csv_to_json_phase_seconds gauge" in prometheus
+        assert 'csv_to_json_file_rows{file="landmarks.csv"} 2\n' in prometheus
+        assert 'csv_to_json_phase_peak_memory_bytes{file="organizations.csv",phase="coerce"}' in prometheus
+
+    # Watch mode tests
+    def test_watch_rebuilds_changed_files(self, monkeypatch, capsys):
+        """Test --watch rebuilds only edited files, after they stop changing, until interrupted."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            converter = CSVToJSONConverter()
+            converter.csv_dir = Path(tmpdir) / "csv"
+            converter.output_dir = Path(tmpdir) / "data"
+            converter.cache_dir = Path(tmpdir) / "cache"
+            converter.csv_dir.mkdir()
+            converter.output_dir.mkdir()
+            landmark = {"id": "lm-001", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]"}
+            self.create_csv_file(converter, "landmarks.csv", [landmark])
+            self.create_csv_file(converter, "organizations.csv", [
+                {"id": "org-1", "name": "Org", "description": "D", "landmarkIds": "lm-001", "color": "#000000"},
+            ])
+
+            # Each sleep is one poll or debounce tick: edit the file over two
+            # ticks (the rebuild waits for the second), then stop
+            edits = [
+                lambda: self.create_csv_file(converter, "landmarks.csv", [dict(landmark, name="Edit")]),
+                lambda: self.create_csv_file(converter, "landmarks.csv", [dict(landmark, name="Edited paper")]),
+                lambda: None,
+            ]
+            sleeps = []
+
+            def fake_sleep(seconds):
+                sleeps.append(seconds)
+                if not edits:
+                    raise KeyboardInterrupt
+                edits.pop(0)()
+
+            monkeypatch.setattr(csv_to_json.time, "sleep", fake_sleep)
+            assert converter.watch(debounce=0.2) == 0
+            landmarks = json.loads((converter.output_dir / "landmarks.json").read_text(encoding="utf-8"))
+
+        output = capsys.readouterr().out
+        assert landmarks[0]["name"] == "Edited paper"
+        assert sleeps == [csv_to_json.WATCH_POLL_SECONDS, 0.2, 0.2, csv_to_json.WATCH_POLL_SECONDS]
+        assert output.count("Changed: landmarks.csv") == 1
+        assert "✓ Skipped organizations.csv (unchanged)" in output
+        assert output.rstrip().endswith("Stopped watching")
+
+    def test_watch_drops_deleted_files(self, monkeypatch, capsys):
+        """Test deleting a CSV while watching removes its output and in-memory records."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            converter = CSVToJSONConverter()
+            converter.csv_dir = Path(tmpdir) / "csv"
+            converter.output_dir = Path(tmpdir) / "data"
+            converter.cache_dir = Path(tmpdir) / "cache"
+            converter.csv_dir.mkdir()
+            converter.output_dir.mkdir()
+            self.create_csv_file(converter, "landmarks.csv", [
+                {"id": "lm-001", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]"},
+            ])
+            self.create_csv_file(converter, "organizations.csv", [
+                {"id": "org-1", "name": "Org", "description": "D", "landmarkIds": "lm-001", "color": "#000000"},
+            ])
+            edits = [lambda: (converter.csv_dir / "landmarks.csv").unlink(), lambda: None]
+
+            def fake_sleep(seconds):
+                if not edits:
+                    raise KeyboardInterrupt
+                edits.pop(0)()
+
+            monkeypatch.setattr(csv_to_json.time, "sleep", fake_sleep)
+            assert converter.watch(debounce=0.2) == 0
+            outputs = sorted(path.name for path in converter.output_dir.iterdir())
+            manifest = json.loads(converter.build_manifest_path.read_text(encoding="utf-8"))
+
+        output = capsys.readouterr().out
+        assert "Changed: landmarks.csv" in output
+        assert "✓ Removed landmarks.json (landmarks.csv was deleted)" in output
+        assert outputs == ["organizations.json"]
+        assert sorted(manifest["files"]) == ["organizations.csv"]
+        assert "landmarks" not in converter.converted_records
+        # The reference check no longer sees the deleted landmarks
+        assert converter.warnings == ["organizations.csv: Row 2: landmarkIds references unknown landmark 'lm-001'"]
+
+    @pytest.fixture
+    def sheet_server(self):
+        """Local HTTP/1.1 stand-in for sheet export URLs (ETag, Last-Modified, redirects, chunked bodies)."""
+        exports: Dict[str, Any] = {}
+        requests: List[Any] = []
+        connections: List[Any] = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                connections.append(self.client_address)
+
+            def do_GET(self):
+                requests.append((self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+                if self.path == "/organizations-link":
+                    return self.reply(302, b"", {"Location": "/organizations"})
+                if self.path not in exports:
+                    return self.reply(404, b"Not Found")
+                body, validators, content_type = exports[self.path]
+                if (
+                    self.headers.get("If-None-Match", object()) == validators.get("ETag")
+                    or self.headers.get("If-Modified-Since", object()) == validators.get("Last-Modified")
+                ):
+                    return self.reply(304, None, validators)
+                self.reply(200, body, dict(validators, **{"Content-Type": content_type}), chunked=self.path == "/organizations")
+
+            def reply(self, status, body, headers={}, chunked=False):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if chunked:
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for i in range(0, len(body), 7):
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(body[i:i + 7]), body[i:i + 7]))
+                    self.wfile.write(b"0\r\n\r\n")
+                    return
+                if body is not None:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body or b"")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            yield SimpleNamespace(
+                url=f"http://127.0.0.1:{server.server_port}",
+                exports=exports,
+                requests=requests,
+                connections=connections,
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    @staticmethod
+    def csv_bytes(data: List[Dict[str, Any]]) -> bytes:
+        """Helper to render rows as a CSV export body."""
+        buffer = io.StringIO(newline="")
+        writer = DictWriter(buffer, fieldnames=list(data[0].keys()))
+        writer.writeheader()
+        writer.writerows(data)
+        return buffer.getvalue().encode("utf-8")
+
+    def fetching_converter(self, tmpdir: str, sources: Dict[str, str]) -> CSVToJSONConverter:
+        """Helper to create a --fetch-sheets converter over temporary directories."""
+        converter = CSVToJSONConverter(fetch_sheets=True)
+        converter.csv_dir = Path(tmpdir) / "csv"
+        converter.output_dir = Path(tmpdir) / "data"
+        converter.cache_dir = Path(tmpdir) / "cache"
+        converter.csv_dir.mkdir(exist_ok=True)
+        converter.output_dir.mkdir(exist_ok=True)
+        (converter.csv_dir / csv_to_json.SHEET_SOURCES_FILENAME).write_text(json.dumps(sources), encoding="utf-8")
+        return converter
+
+    def test_fetch_sheets_conditional_requests(self, sheet_server, capsys):
+        """Test --fetch-sheets downloads exports, then only sends conditional requests until they change."""
+        landmark = {"id": "lm-001", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]"}
+        organizations = self.csv_bytes([
+            {"id": "org-1", "name": "Org", "description": "D", "landmarkIds": "lm-001", "color": "#000000"},
+        ])
+        modified = "Wed, 14 Oct 2026 10:00:00 GMT"
+        sheet_server.exports["/landmarks"] = (self.csv_bytes([landmark]), {"ETag": '"v1"'}, "text/csv")
+        sheet_server.exports["/organizations"] = (organizations, {"Last-Modified": modified}, "text/csv; charset=utf-8")
+        sources = {
+            "landmarks.csv": f"{sheet_server.url}/landmarks",
+            "organizations.csv": f"{sheet_server.url}/organizations-link",
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            assert self.fetching_converter(tmpdir, sources).run() == 0
+            first_requests = sorted(sheet_server.requests)
+            first_connections = len(sheet_server.connections)
+            del sheet_server.requests[:]
+            capsys.readouterr()
+
+            assert self.fetching_converter(tmpdir, sources).run() == 0
+            second_requests = sorted(sheet_server.requests)
+            second_output = capsys.readouterr().out
+            del sheet_server.requests[:]
+
+            # The sheet changes upstream; organizations.csv is edited locally
+            sheet_server.exports["/landmarks"] = (self.csv_bytes([dict(landmark, name="Edited")]), {"ETag": '"v2"'}, "text/csv")
+            converter = self.fetching_converter(tmpdir, sources)
+            with open(converter.csv_dir / "organizations.csv", "ab") as f:
+                f.write(b"\n")
+            assert converter.run() == 0
+            third_requests = sorted(sheet_server.requests)
+            third_output = capsys.readouterr().out
+            landmarks = json.loads((converter.output_dir / "landmarks.json").read_text(encoding="utf-8"))
+            local_organizations = (converter.csv_dir / "organizations.csv").read_bytes()
+
+        assert first_requests == [
+            ("/landmarks", None, None),
+            ("/organizations", None, None),
+            ("/organizations-link", None, None),
+        ]
+        # The redirect is followed on a pooled connection
+        assert first_connections <= 2
+        # Conditional headers are kept when following the redirect
+        assert second_requests == [
+            ("/landmarks", '"v1"', None),
+            ("/organizations", None, modified),
+            ("/organizations-link", None, modified),
+        ]
+        assert "✓ Not modified: landmarks.csv" in second_output
+        assert "✓ Skipped landmarks.csv (unchanged)" in second_output
+        assert "✓ Skipped organizations.csv (unchanged)" in second_output
+        assert third_requests == [
+            ("/landmarks", '"v1"', None),
+            ("/organizations", None, None),
+            ("/organizations-link", None, None),
+        ]
+        assert "✓ Converted landmarks.csv (1 records)" in third_output
+        assert "✓ Fetched organizations.csv (" in third_output
+        assert landmarks[0]["name"] == "Edited"
+        assert local_organizations == organizations
+
+    def test_sheet_fetcher_reuses_connections(self, sheet_server):
+        """Test exports, redirects, 304s and error answers share one keep-alive connection."""
+        landmark = {"id": "lm-001", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]"}
+        sheet_server.exports["/landmarks"] = (self.csv_bytes([landmark]), {"ETag": '"v1"'}, "text/csv")
+        sheet_server.exports["/organizations"] = (b"id,name\norg-1,Org\n", {}, "text/csv")
+        sources = {
+            "landmarks.csv": f"{sheet_server.url}/landmarks",
+            "missing.csv": f"{sheet_server.url}/missing",
+            "organizations.csv": f"{sheet_server.url}/organizations-link",
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fetcher = csv_to_json.SheetFetcher(Path(tmpdir), Path(tmpdir) / "cache", connections=1)
+            first = fetcher.fetch(sources)
+            second = fetcher.fetch({"landmarks.csv": sources["landmarks.csv"]})
+
+        assert [result["status"] for result in first.values()] == ["fetched", "failed", "fetched"]
+        assert second["landmarks.csv"]["status"] == "not-modified"
+        assert len(sheet_server.requests) == 5
+        # One connection per fetch: the pool is closed when a fetch ends
+        assert fetcher.pool.opened == 2
+        assert len(sheet_server.connections) == 2
+
+    @pytest.mark.parametrize("path,error", [
+        ("/missing", "HTTP 404 Not Found"),
+        ("/private", "Got an HTML page instead of CSV"),
+    ])
+    def test_fetch_sheets_failure_keeps_local_copy(self, sheet_server, path, error):
+        """Test a failed sheet download is an error and leaves the local CSV in place."""
+        sheet_server.exports["/private"] = (b"<html><body>Sign in</body></html>", {}, "text/html; charset=utf-8")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            converter = self.fetching_converter(tmpdir, {"landmarks.csv": f"{sheet_server.url}{path}"})
+            csv_path = self.create_csv_file(converter, "landmarks.csv", [
+                {"id": "lm-001", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]"},
+            ])
+            before = csv_path.read_bytes()
+
+            assert converter.run() == 1
+            after = csv_path.read_bytes()
+            leftovers = sorted(p.name for p in converter.csv_dir.iterdir())
+
+        assert after == before
+        assert leftovers == ["landmarks.csv", csv_to_json.SHEET_SOURCES_FILENAME]
+        assert any(str(e).startswith(f"landmarks.csv: Could not fetch sheet export: {error}") for e in converter.errors)
+
+    def test_hashed_filenames_manifest(self):
+        """Test --hashed-filenames publishes hashed copies, keeps N versions and cleans up when off."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            def build(name, **kwargs):
+                converter = CSVToJSONConverter(keep_versions=2, **kwargs)
+                converter.csv_dir = Path(tmpdir) / "csv"
+                converter.output_dir = Path(tmpdir) / "data"
+                converter.cache_dir = Path(tmpdir) / "cache"
+                converter.csv_dir.mkdir(exist_ok=True)
+                converter.output_dir.mkdir(exist_ok=True)
+                self.create_csv_file(converter, "landmarks.csv", [
+                    {"id": "lm-001", "name": name, "type": "paper", "year": "2017", "coordinates": "[1200, 800]"},
+                ])
+                self.create_csv_file(converter, "organizations.csv", [
+                    {"id": "org-1", "name": "Org", "description": "D", "landmarkIds": "lm-001", "color": "#000000"},
+                ])
+                assert converter.run() == 0
+                return converter.output_dir
+
+            for name in ("First", "Second", "Third"):
+                output_dir = build(name, hashed_filenames=True)
+            manifest = json.loads((output_dir / "manifest.json").read_text(encoding="utf-8"))
+            landmark_versions = sorted(p.name for p in output_dir.glob("landmarks.*.json"))
+            organization_versions = sorted(p.name for p in output_dir.glob("organizations.*.json"))
+            current = manifest["files"]["landmarks.json"].rsplit("/", 1)[1]
+            current_landmarks = (output_dir / current).read_bytes()
+            canonical_landmarks = (output_dir / "landmarks.json").read_bytes()
+
+            output_dir = build("Third")
+            leftovers = sorted(p.name for p in output_dir.iterdir())
+
+        assert manifest["version"] == AssetManifestWriter.VERSION
+        assert set(manifest["files"]) == {"landmarks.json", "organizations.json"}
+        assert current in landmark_versions and len(landmark_versions) == 2
+        assert current_landmarks == canonical_landmarks
+        assert organization_versions == [manifest["files"]["organizations.json"].rsplit("/", 1)[1]]
+        assert leftovers == ["landmarks.json", "organizations.json"]
+
+    # Batched polygon coercion tests
+    @pytest.mark.parametrize("polygon", [
+        [[100.5 + i, 0.5 + 2 * i] for i in range(20)],
+        [[-10 if i == 3 else 1200, 5000 if i in (3, 9) else 800] for i in range(20)],
+        [[1200, 800]] * 5 + [[5000, 800], [45.0, 10]] + [[12.5, 20]] * 13,
+        [[1200, 800]] * 19 + [{"lat": 1200, "lng": 800}],
+        [[1200, 800]] * 19 + [[True, 800]],
+        [{"lat": 300 + i, "lng": 5000 if i == 4 else 800.5} for i in range(20)],
+        [{"lat": 1200, "lng": 800}] * 6 + [{"lat": 45.5, "lng": 10}] * 14,
+        [{"lat": 1200, "lng": 800}] * 19 + [{"lat": 1200}],
+        [{"lat": 1200, "lng": 800}] * 19 + [[1200, 800]],
+        [{"lat": 1200, "lng": "800"}] * 20,
+        [[0, 500], [500, 0], [0.0, 500]] + [[1200, 800]] * 17,
+    ])
+    def test_polygon_batch_matches_per_vertex(self, converter, monkeypatch, polygon):
+        """Test NumPy batch coercion gives the per-vertex records, warnings and errors."""
+        pytest.importorskip("numpy")
+        value = json.dumps(polygon)
+
+        def coerce():
+            converter.warnings = []
+            try:
+                return [record.to_dict() for record in converter._coerce_polygon_column(value, "Capability 'c'", "p")], converter.warnings
+            except ValueError as e:
+                return str(e), converter.warnings
+
+        batched = coerce()
+        monkeypatch.setattr(csv_to_json, "numpy", None)
+        assert batched == coerce()
+
+    @pytest.mark.parametrize("numpy_enabled", [True, False])
+    def test_polygon_zero_vertices_match_across_sizes(self, converter, monkeypatch, numpy_enabled):
+        """Test a vertex with a 0 coordinate coerces alike below and at the batch threshold."""
+        if numpy_enabled:
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(csv_to_json, "numpy", None)
+        zeros = [[0, 500], [500, 0], [0.0, 500], [0, 800.4]]
+        results = []
+        for size in (csv_to_json.POLYGON_BATCH_MIN_VERTICES - 1, csv_to_json.POLYGON_BATCH_MIN_VERTICES):
+            polygon = zeros + [[1200, 800]] * (size - len(zeros))
+            records = converter._coerce_polygon_column(json.dumps(polygon), "Capability 'c'", "p")
+            results.append([record.to_dict() for record in records[:len(zeros)]])
+
+        assert results[0] == results[1] == [
+            {"lat": 0, "lng": 500}, {"lat": 500, "lng": 0}, {"lat": 0, "lng": 500}, {"lat": 0, "lng": 800},
+        ]
+
+    # Columnar table tests
+    @pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+    def test_columnar_table_round_trip(self, converter, monkeypatch, fmt):
+        """Test columnar tables are typed, flattened and reloaded instead of the CSV."""
+        pyarrow = pytest.importorskip("pyarrow")
+        converter.cache_dir = converter.csv_dir.parent / "cache"
+        converter.columnar = fmt
+        rows = [
+            {"id": "lm-001", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]",
+             "externalLinks": '[{"type": "arxiv", "url": "https://arxiv.org", "label": "arXiv"}]', "tags": "a,b"},
+            {"id": "lm-002", "name": "Model", "type": "model", "year": "2020", "coordinates": "[2500, 3100]"},
+        ]
+        csv_path = self.create_csv_file(converter, "landmarks.csv", rows)
+
+        records = list(converter._iter_records("landmarks", csv_path))
+        warnings = list(converter.warnings)
+        table_path = converter.columnar_dir / f"landmarks.{fmt}"
+        if fmt == "parquet":
+            schema = pyarrow.parquet.read_schema(table_path)
+        else:
+            schema = pyarrow.ipc.open_file(pyarrow.memory_map(str(table_path))).schema
+        assert schema.field("coordinates.lat").type == pyarrow.int64()
+        assert schema.field("year").type == pyarrow.int64()
+        assert schema.field("tags").type == pyarrow.list_(pyarrow.string())
+
+        def fail(*args):
+            raise AssertionError("CSV was read despite an unchanged columnar table")
+
+        monkeypatch.setattr(converter, "_read_records", fail)
+        converter.warnings = []
+        cached = list(converter._iter_records("landmarks", csv_path))
+        assert [dict(record) for record in cached] == [dict(record) for record in records]
+        assert converter._dumps(cached) == converter._dumps(records)
+        assert converter.warnings == warnings
+        monkeypatch.undo()
+
+        # A changed CSV is read again and rewrites the table
+        rows[1]["name"] = "Renamed"
+        self.create_csv_file(converter, "landmarks.csv", rows)
+        assert list(converter._iter_records("landmarks", csv_path))[1]["name"] == "Renamed"
+        assert converter.columnar_dir.joinpath(f"landmarks.{fmt}").exists()
+
+    @pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+    def test_columnar_table_written_per_batch(self, converter, monkeypatch, fmt):
+        """Test columnar batches are written as they fill, to a configurable directory."""
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(csv_to_json.ColumnarStore, "BATCH_ROWS", 2)
+        converter.columnar = fmt
+        converter._columnar_dir = converter.output_dir.parent / "analytics"
+        rows = [
+            {"id": f"lm-{i}", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]"}
+            for i in range(5)
+        ]
+        csv_path = self.create_csv_file(converter, "landmarks.csv", rows)
+        table_path = converter.output_dir.parent / "analytics" / f"landmarks.{fmt}"
+        tmp_path = csv_to_json.temporary_path(table_path)
+
+        records = converter._iter_records("landmarks", csv_path)
+        sizes = []
+        for _ in range(5):
+            next(records)
+            sizes.append(tmp_path.stat().st_size if tmp_path.exists() else 0)
+        assert list(records) == []
+
+        # Batches reach the file while records are still being produced
+        assert sizes[0] == 0 and 0 < sizes[1] < sizes[3]
+        assert table_path.exists() and not tmp_path.exists()
+        assert json.loads(table_path.with_name(f"landmarks.{fmt}.json").read_text(encoding="utf-8"))["warnings"] == []
+        assert [record["id"] for record in converter._iter_records("landmarks", csv_path)] == [row["id"] for row in rows]
+
+        with pytest.raises(ValueError, match="columnar_dir"):
+            CSVToJSONConverter(columnar_dir=table_path.parent)
+
+    def test_columnar_table_tracks_settings(self, converter):
+        """Test a columnar table written under other output settings is not replayed."""
+        pytest.importorskip("pyarrow")
+        converter.cache_dir = converter.csv_dir.parent / "cache"
+        converter.columnar = "arrow"
+        converter.max_diagnostics = 1
+        rows = [
+            {"id": f"lm-00{i}", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[9000, 800]"}
+            for i in range(3)
+        ]
+        csv_path = self.create_csv_file(converter, "landmarks.csv", rows)
+
+        list(converter._iter_records("landmarks", csv_path))
+        assert len(converter.warnings) == 1
+        fingerprint = converter._columnar_fingerprint(csv_path)
+
+        converter.warnings = []
+        converter.max_diagnostics = 0
+        list(converter._iter_records("landmarks", csv_path))
+        assert len(converter.warnings) == 3
+
+        converter.max_diagnostics = 1
+        assert converter._columnar_fingerprint(csv_path) == fingerprint
+        for name, value in (("output_profile", "compact"), ("spatial_tile_size", 256), ("map_width", 8192)):
+            changed = copy.copy(converter)
+            setattr(changed, name, value)
+            assert changed._columnar_fingerprint(csv_path) != fingerprint, name
+
+    def test_columnar_requires_pyarrow(self, monkeypatch):
+        """Test asking for columnar tables without pyarrow is a configuration error."""
+        monkeypatch.setattr(csv_to_json, "pyarrow", None)
+        with pytest.raises(ValueError, match="pyarrow"):
+            CSVToJSONConverter(columnar="arrow")
+
+
+    # Output profile tests
+    def test_compact_profile_writes_minified_and_gzip(self, converter):
+        """Test the compact profile writes minified JSON and a gzip copy in both paths."""
+        data = [{"id": "org-001", "name": "Org", "description": "D", "website": "", "landmarkIds": "lm-001,lm-002", "color": "#000000", "logo": ""}]
+        csv_path = self.create_csv_file(converter, "organizations.csv", data)
+        output_path = converter.output_dir / "organizations.json"
+        converter.output_profile = "compact"
+
+        assert converter._convert_file(csv_path) is True
+        compact_bytes = output_path.read_bytes()
+        assert compact_bytes == json.dumps(json.loads(compact_bytes), separators=(",", ":")).encode()
+        assert gzip.decompress((converter.output_dir / "organizations.json.gz").read_bytes()) == compact_bytes
+        assert converter.output_sizes["organizations"]["json"] == len(compact_bytes)
+
+        converter.stream = True
+        assert converter._convert_file(csv_path) is True
+        assert output_path.read_bytes() == compact_bytes
+
+    def test_pretty_profile_removes_stale_compressed_copies(self, converter):
+        """Test switching back to the pretty profile deletes old .gz/.br files."""
+        data = [{"id": "org-001", "name": "Org", "description": "D", "website": "", "landmarkIds": "", "color": "#000000", "logo": ""}]
+        csv_path = self.create_csv_file(converter, "organizations.csv", data)
+        (converter.output_dir / "organizations.json.gz").write_bytes(b"stale")
+        (converter.output_dir / "organizations.json.br").write_bytes(b"stale")
+
+        assert converter._convert_file(csv_path) is True
+
+        assert sorted(p.name for p in converter.output_dir.iterdir()) == ["organizations.json"]
+        assert "gzip" not in converter.output_sizes["organizations"]
+
+    # Landmark sharding tests
+    def landmark_row(self, landmark_id: str, capability_id: str, lat: int, lng: int, zoom: str = "0") -> Dict[str, Any]:
+        """Helper to build a raw landmark row."""
+        return {
+            "id": landmark_id, "name": landmark_id, "type": "paper", "year": "2023",
+            "organization": "Org", "authors": "", "description": "D", "abstract": "",
+            "externalLinks": "[]", "coordinates": f"[{lat}, {lng}]", "capabilityId": capability_id,
+            "relatedLandmarks": "", "tags": "", "icon": "", "metadata": "{}", "zoomThreshold": zoom,
+        }
+
+    def test_shard_landmarks_by_capability(self, converter):
+        """Test landmarks are split per capability with counts, URLs and bounds."""
+        rows = [
+            self.landmark_row("lm-001", "cap-a", 800, 1200),
+            self.landmark_row("lm-002", "cap-b", 900, 2000),
+            self.landmark_row("lm-003", "cap-a", 1000, 1100),
+        ]
+        csv_path = self.create_csv_file(converter, "landmarks.csv", rows)
+        converter.shard_landmarks = "capability"
+
+        assert converter._convert_file(csv_path) is True
+
+        shard_dir = converter.output_dir / "landmarks"
+        index = json.loads((shard_dir / "index.json").read_text(encoding="utf-8"))
+        assert index["shardBy"] == "capabilityId"
+        assert index["total"] == 3
+        assert index["shards"][0] == {
+            "key": "cap-a",
+            "url": "/data/landmarks/cap-a.json",
+            "count": 2,
+            "bounds": {"north": 1000, "south": 800, "east": 1200, "west": 1100},
+        }
+        shard = json.loads((shard_dir / "cap-a.json").read_text(encoding="utf-8"))
+        assert [record["id"] for record in shard] == ["lm-001", "lm-003"]
+
+    def test_shard_landmarks_by_zoom_streaming_removes_stale(self, converter):
+        """Test zoom-band shards replace old shards and are removed when sharding is off."""
+        rows = [
+            self.landmark_row("lm-001", "cap-a", 800, 1200, zoom="-1"),
+            self.landmark_row("lm-002", "cap-a", 900, 2000, zoom="1"),
+        ]
+        csv_path = self.create_csv_file(converter, "landmarks.csv", rows)
+        shard_dir = converter.output_dir / "landmarks"
+        shard_dir.mkdir()
+        (shard_dir / "old-capability.json").write_text("[]", encoding="utf-8")
+        converter.shard_landmarks = "zoom"
+        converter.stream = True
+
+        assert converter._convert_file(csv_path) is True
+        assert sorted(p.name for p in shard_dir.iterdir()) == ["index.json", "zoom-1.json", "zoom-neg1.json"]
+
+        converter.shard_landmarks = None
+        assert converter._convert_file(csv_path) is True
+        assert not shard_dir.exists()
+
+    def test_shard_names_are_unique(self, converter, monkeypatch):
+        """Test keys that sanitize alike get separate shards, with a bounded number of open files."""
+        monkeypatch.setattr(csv_to_json.LandmarkShardWriter, "MAX_OPEN_SHARDS", 2)
+        keys = ["a b", "a_b", "a/b", "index", "cap-a"]
+        rows = [self.landmark_row(f"lm-{i}", keys[i % len(keys)], 800 + i, 1200) for i in range(12)]
+        csv_path = self.create_csv_file(converter, "landmarks.csv", rows)
+        converter.shard_landmarks = "capability"
+        open_files = []
+        add = csv_to_json.LandmarkShardWriter.add
+
+        def counting_add(writer, record):
+            add(writer, record)
+            open_files.append(sum(shard["file"] is not None for shard in writer._shards.values()))
+
+        monkeypatch.setattr(csv_to_json.LandmarkShardWriter, "add", counting_add)
+        assert converter._convert_file(csv_path) is True
+
+        shard_dir = converter.output_dir / "landmarks"
+        index = json.loads((shard_dir / "index.json").read_text(encoding="utf-8"))
+        urls = [shard["url"] for shard in index["shards"]]
+        assert len(set(urls)) == len(keys)
+        assert "/data/landmarks/cap-a.json" in urls
+        for shard in index["shards"]:
+            records = json.loads((shard_dir / shard["url"].rsplit("/", 1)[1]).read_text(encoding="utf-8"))
+            assert {record["capabilityId"] for record in records} == {shard["key"]}
+            assert len(records) == shard["count"]
+        assert index["total"] == 12
+        assert max(open_files) == 2
+        assert not any(path.name.endswith(".tmp") for path in shard_dir.iterdir())
+
+    # Spatial index tests
+    def test_spatial_index_grid(self, converter):
+        """Test landmarks are bucketed into tiles per zoom band by array position."""
+        rows = [
+            self.landmark_row("lm-001", "cap-a", 800, 1200, zoom="-1"),
+            self.landmark_row("lm-002", "cap-a", 900, 1300, zoom="-1"),
+            self.landmark_row("lm-003", "cap-b", 2900, 5000, zoom="1"),
+        ]
+        csv_path = self.create_csv_file(converter, "landmarks.csv", rows)
+        converter.spatial_tile_size = 1024
+
+        assert converter._convert_file(csv_path) is True
+
+        index = json.loads((converter.output_dir / "landmarks.spatial.json").read_text(encoding="utf-8"))
+        assert (index["rows"], index["cols"], index["count"]) == (3, 4, 3)
+        # Out-of-bounds coordinates are clamped to the edge tile
+        assert index["bands"] == {"-1": {"0/1": [0, 1]}, "1": {"2/3": [2]}}
+
+        converter.spatial_tile_size = 0
+        assert converter._convert_file(csv_path) is True
+        assert not (converter.output_dir / "landmarks.spatial.json").exists()
+
+    # Capability geometry tests
+    def test_simplify_polygon(self):
+        """Test Douglas-Peucker keeps corners and drops near-collinear vertices."""
+        ring = [(0, 0), (50, 0.4), (100, 0), (100, 100), (50, 100.6), (0, 100)]
+
+        assert CapabilityGeometryWriter.simplify(ring, 1.0) == [(0, 0), (100, 0), (100, 100), (0, 100)]
+        assert CapabilityGeometryWriter.simplify(ring, 0.1) == ring
+        assert CapabilityGeometryWriter.simplify([(0, 0), (1, 0), (2, 0), (3, 0)], 5) == [(0, 0), (1, 0), (2, 0), (3, 0)]
+
+    def test_area_centroid(self):
+        """Test shoelace area and centroid, independent of winding order."""
+        square = [(0, 0), (0, 10), (10, 10), (10, 0)]
+
+        assert CapabilityGeometryWriter.area_centroid(square) == (100.0, 5.0, 5.0)
+        assert CapabilityGeometryWriter.area_centroid(square[::-1]) == (100.0, 5.0, 5.0)
+
+    def test_capability_geometry_output(self, converter):
+        """Test the geometry stage writes bounds, centroid, area and per-zoom vertex sets."""
+        edge = ", ".join(f"[{1000 + i}, 1000]" for i in range(0, 1001, 100))
+        data = [{
+            "id": "cap-001",
+            "polygonCoordinates": f"[{edge}, [2000, 2000], [1000, 2000]]",
+            "zoomThreshold": "0",
+        }]
+        csv_path = self.create_csv_file(converter, "capabilities.csv", data)
+        converter.simplify_tolerance = 1.0
+
+        assert converter._convert_file(csv_path) is True
+
+        geometry = json.loads((converter.output_dir / "capabilities.geometry.json").read_text(encoding="utf-8"))
+        assert geometry["zoomLevels"] == [-1, 0, 1, 2]
+        cap = geometry["capabilities"]["cap-001"]
+        assert cap["bounds"] == {"north": 2000, "south": 1000, "east": 2000, "west": 1000}
+        assert cap["centroid"] == {"lat": 1500.0, "lng": 1500.0}
+        assert cap["area"] == 1000000.0
+        assert cap["vertexCount"] == 13
+        assert len(cap["simplified"]["2"]) == 4
+
+    # Search index tests
+    def test_search_tokenize(self):
+        """Test tokens are lowercase alphanumeric runs of at least two characters."""
+        assert SearchIndexBuilder.tokenize("GPT-4: Scaling a Model_v2") == ["gpt", "scaling", "model", "v2"]
+
+    def test_search_index_build(self):
+        """Test terms, postings, prefixes and trigrams are aligned by term index."""
+        builder = SearchIndexBuilder()
+        builder.add("landmarks", {"id": "lm-001", "name": "Attention", "tags": ["attention", "nlp"]})
+        builder.add("organizations", {"id": "org-001", "name": "Lab", "description": "Attention research"})
+        index = builder.build()
+
+        assert index["docs"] == [["landmark", "lm-001", "Attention"], ["organization", "org-001", "Lab"]]
+        assert index["terms"] == ["attention", "lab", "nlp", "research"]
+        # (doc, field) pairs: name=0, tags=1, description=2
+        assert index["postings"][0] == [0, 0, 0, 1, 1, 2]
+        assert index["prefixes"]["att"] == [0]
+        assert index["prefixes"]["la"] == [1]
+        assert "attention" not in index["prefixes"]
+        assert index["ngrams"]["ent"] == [0]
+
+    def test_search_index_stage(self, converter):
+        """Test the cross-file stage writes the index from all entity types and removes it when disabled."""
+        for entity_type, record in (
+            ("capabilities", {"id": "cap-001", "name": "Reasoning"}),
+            ("landmarks", {"id": "lm-001", "name": "Chain of Thought"}),
+            ("organizations", {"id": "org-001", "name": "Lab"}),
+        ):
+            (converter.output_dir / f"{entity_type}.json").write_text(json.dumps([record]), encoding="utf-8")
+        converter.search_index = True
+
+        converter._run_cross_file_stages(["landmarks"])
+
+        index = json.loads((converter.output_dir / "search-index.json").read_text(encoding="utf-8"))
+        assert [doc[1] for doc in index["docs"]] == ["cap-001", "lm-001", "org-001"]
+        assert "thought" in index["terms"]
+
+        converter.search_index = False
+        converter._run_cross_file_stages([])
+        assert not (converter.output_dir / "search-index.json").exists()
+
+    # JSON backend tests
+    def test_json_backend_normalizes_native_output(self):
+        """Test native encoder output is rewritten to stdlib escapes and float formatting."""
+        from csv_pipeline.json_backends import _FastJSONBackend
+
+        class NativeLike(_FastJSONBackend):
+            """Unescaped UTF-8 and decimal small floats, like orjson."""
+
+            def _encode(self, obj, compact):
+                options = {"separators": (",", ":")} if compact else {"indent": 2}
+                text = json.dumps(obj, ensure_ascii=False, **options)
+                return text.replace("1e-05", "0.00001").encode("utf-8")
+
+            def _decode(self, text):
+                return json.loads(text)
+
+        data = {"name": "Caf\u00e9 \U0001f600", "text": "0.00001 2e-05", "values": [1e-05, 10.00001, 1e16]}
+        for compact in (False, True):
+            assert NativeLike().dumps(data, compact) == JSONBackend().dumps(data, compact)
+
+    @pytest.mark.parametrize("text,expected", [
+        (b'{"fillColor": "#1e4a2b", "strokeColor": "#a0e3f0"}', False),
+        (b'["release 2e5", "v1.0e"]', True),
+        (b'{"value": 1e-5}', True),
+        (b"[1,-2.5e-7]", True),
+        (b"-1e-5", True),
+        (b'{"opacity": 0.00001}', True),
+        (b'{"opacity": 0.35, "id": "cap-0e"}', False),
+    ])
+    def test_json_backend_float_precheck(self, text, expected):
+        """Test the float rewrite runs for numbers with exponents but not for hex colours."""
+        from csv_pipeline.json_backends import _FastJSONBackend
+
+        assert _FastJSONBackend._may_have_mismatching_floats(text) is expected
+
+    def test_orjson_backend_matches_stdlib(self, converter):
+        """Test outputs are byte-identical with orjson and stdlib json."""
+        pytest.importorskip("orjson")
+        data = [{"id": "cap-001", "name": "Caf\u00e9", "polygonCoordinates": [1000, 2000], "fillOpacity": 0.35}]
+
+        for profile in ("pretty", "compact"):
+            converter.output_profile = profile
+            outputs = []
+            for backend in ("json", "orjson"):
+                converter.json_backend = get_json_backend(backend)
+                converter._write_output(converter.output_dir / "out.json", data)
+                outputs.append((converter.output_dir / "out.json").read_bytes())
+            assert outputs[0] == outputs[1]
+
+        # NaN is not valid JSON for orjson; it is parsed and written like stdlib
+        backend = get_json_backend("orjson")
+        assert backend.dumps(backend.loads("[NaN]")) == "[\n  NaN\n]"
+
+    def test_json_backend_state_is_per_converter(self):
+        """Test each converter resolves its own backend, so parsing NaN in one leaves the others alone."""
+        pytest.importorskip("orjson")
+        first = CSVToJSONConverter(json_backend="orjson")
+        second = CSVToJSONConverter(json_backend="orjson")
+        assert first.json_backend is not second.json_backend
+        assert not hasattr(csv_to_json, "_json_backend")
+
+        assert first._parse_json_column('{"opacity": NaN}')["opacity"] != 0
+        assert first.json_backend.non_finite is True
+        assert second.json_backend.non_finite is False
+
+    @pytest.mark.parametrize("value", [2 ** 63, -(2 ** 63) - 1, 123456789012345678901234567890, int(1e30)])
+    def test_orjson_backend_big_integers(self, value):
+        """Test integers beyond 64 bits are read and written exactly like stdlib json."""
+        pytest.importorskip("orjson")
+        backend, reference = get_json_backend("orjson"), JSONBackend()
+        document = {"metadata": {"tokens": value}, "year": value}
+        text = reference.dumps(document)
+
+        assert backend.loads(text) == reference.loads(text)
+        assert backend.dumps(backend.loads(text)) == text
+        for compact in (False, True):
+            assert backend.dumps(document, compact) == reference.dumps(document, compact)
+
+    def test_failed_dump_keeps_previous_output(self, converter, monkeypatch):
+        """Test a serialization error leaves the previous JSON output in place."""
+        self.create_csv_file(converter, "landmarks.csv", [
+            {"id": "lm-001", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]"},
+        ])
+        output_path = converter.output_dir / "landmarks.json"
+        output_path.write_text("[\"previous\"]", encoding="utf-8")
+
+        def failing_dumps(data):
+            raise TypeError("Integer exceeds 64-bit range")
+
+        monkeypatch.setattr(converter, "_dumps", failing_dumps)
+        assert converter._convert_file(converter.csv_dir / "landmarks.csv") is False
+        assert output_path.read_text(encoding="utf-8") == "[\"previous\"]"
+        assert sorted(p.name for p in converter.output_dir.iterdir()) == ["landmarks.json"]
+
+    def test_unknown_json_backend(self):
+        """Test unknown backends are rejected."""
+        with pytest.raises(ValueError, match="Unknown JSON backend"):
+            CSVToJSONConverter(json_backend="simdjson")
+
+    # Reference integrity tests
+    def test_reference_checker_reports_unknown_ids(self):
+        """Test broken references and duplicate ids are reported with file and row."""
+        checker = ReferenceChecker({
+            "capabilities": [{"id": "cap-a", "relatedLandmarks": ["lm-1"], "parentCapabilityId": "cap-x"}],
+            "landmarks": [
+                {"id": "lm-1", "capabilityId": "cap-a", "relatedLandmarks": ["lm-2"]},
+                {"id": "lm-1", "capabilityId": "cap-b", "relatedLandmarks": []},
+            ],
+            "organizations": [{"id": "org-1", "landmarkIds": ["lm-1", "lm-9"]}],
+        })
+
+        assert checker.check() == [
+            "landmarks.csv: Row 3: Duplicate id 'lm-1' (first defined in Row 2)",
+            "capabilities.csv: Row 2: parentCapabilityId references unknown capability 'cap-x'",
+            "landmarks.csv: Row 3: capabilityId references unknown capability 'cap-b'",
+            "landmarks.csv: Row 2: relatedLandmarks references unknown landmark 'lm-2'",
+            "organizations.csv: Row 2: landmarkIds references unknown landmark 'lm-9'",
+        ]
+        assert checker.references == 7
+
+    def test_reference_checker_detects_parent_cycles(self):
+        """Test each parentCapabilityId cycle is reported once."""
+        capabilities = [
+            {"id": "a", "parentCapabilityId": "b"},
+            {"id": "b", "parentCapabilityId": "c"},
+            {"id": "c", "parentCapabilityId": "a"},
+            {"id": "d", "parentCapabilityId": "a"},
+            {"id": "e", "parentCapabilityId": "e"},
+        ]
+
+        assert ReferenceChecker({"capabilities": capabilities}).check() == [
+            "capabilities.csv: Row 2: parentCapabilityId cycle a -> b -> c -> a",
+            "capabilities.csv: Row 6: parentCapabilityId cycle e -> e",
+        ]
+
+    def test_reference_checker_deep_hierarchy(self):
+        """Test long parent chains are walked iteratively."""
+        capabilities = [{"id": "cap-0", "parentCapabilityId": None}] + [
+            {"id": f"cap-{i}", "parentCapabilityId": f"cap-{i - 1}"} for i in range(1, 100000)
+        ]
+
+        assert ReferenceChecker({"capabilities": capabilities}).check() == []
+
+    def test_strict_references_fail_the_build(self, converter):
+        """Test broken references are warnings by default and errors when strict."""
+        (converter.output_dir / "landmarks.json").write_text("[]", encoding="utf-8")
+        converter.converted_records["organizations"] = [{"id": "org-1", "landmarkIds": ["lm-1"]}]
+
+        converter._run_cross_file_stages(["organizations"])
+        assert converter.warnings == ["organizations.csv: Row 2: landmarkIds references unknown landmark 'lm-1'"]
+        assert converter.errors == []
+
+        converter.warnings = []
+        converter.strict_references = True
+        converter._run_cross_file_stages(["organizations"])
+        assert converter.errors == ["organizations.csv: Row 2: landmarkIds references unknown landmark 'lm-1'"]
+
+    def test_reference_check_skips_unreadable_outputs(self, converter, capsys):
+        """Test a corrupt output skips the reference check with a warning instead of crashing."""
+        (converter.output_dir / "landmarks.json").write_text('[{"id": "lm-1"', encoding="utf-8")
+        converter.converted_records["organizations"] = [{"id": "org-1", "landmarkIds": ["lm-1"]}]
+
+        converter._run_cross_file_stages(["organizations"])
+
+        assert converter.errors == []
+        assert len(converter.warnings) == 1
+        assert converter.warnings[0].startswith("Skipped the reference check: ")
+        assert "Skipped the reference check" in capsys.readouterr().out
+
+    def test_stream_reference_check_reads_no_outputs(self, converter, monkeypatch):
+        """Test streamed builds check references from the collected ids without reading outputs back."""
+        converter.stream = True
+        self.create_csv_file(converter, "landmarks.csv", [
+            {"id": "lm-001", "name": "Paper", "type": "paper", "year": "2017", "coordinates": "[1200, 800]",
+             "relatedLandmarks": "lm-002"},
+        ])
+        self.create_csv_file(converter, "tours.csv", [self.tour_row("tour-a", [
+            {"title": "Start", "landmarkIds": ["lm-001", "lm-003"], "mapCenter": [1200, 800], "mapZoom": 3},
+        ])])
+        loaded: List[str] = []
+        monkeypatch.setattr(converter, "_load_records", lambda entity_type: loaded.append(entity_type) or [])
+
+        assert converter.run() == 0
+        first = list(converter.warnings)
+
+        # Only tours.csv changes; landmarks.json is skipped and checked from its cached ids
+        self.create_csv_file(converter, "tours.csv", [self.tour_row("tour-a", [
+            {"title": "Start", "landmarkIds": ["lm-004"], "mapCenter": [1200, 800], "mapZoom": 3},
+        ])])
+        converter.errors, converter.warnings = [], []
+        assert converter.run() == 0
+
+        assert loaded == []
+        assert "landmarks.csv: Row 2: relatedLandmarks references unknown landmark 'lm-002'" in first
+        assert "tours.csv: Row 2: stages[0].landmarkIds references unknown landmark 'lm-003'" in first
+        assert converter.warnings == [
+            "landmarks.csv: Row 2: relatedLandmarks references unknown landmark 'lm-002'",
+            "tours.csv: Row 2: stages[0].landmarkIds references unknown landmark 'lm-004'",
+        ]
+
+    def test_no_check_references(self, converter, monkeypatch):
+        """Test turning the reference check off skips reading the outputs."""
+        converter.check_references = False
+        converter.converted_records["organizations"] = [{"id": "org-1", "landmarkIds": ["lm-1"]}]
+
+        def load_records(entity_type):
+            raise AssertionError(f"read {entity_type}.json")
+
+        monkeypatch.setattr(converter, "_load_records", load_records)
+        converter._run_cross_file_stages(["organizations"])
+
+        assert converter.warnings == []
+        with pytest.raises(ValueError, match="strict_references"):
+            CSVToJSONConverter(strict_references=True, check_references=False)
+
+    # Tour tests
+    def tour_row(self, tour_id: str, stages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Helper to build a raw tours.csv row."""
+        return {
+            "id": tour_id,
+            "title": f"Tour {tour_id}",
+            "description": "A guided tour",
+            "difficulty": "beginner",
+            "estimatedDuration": "10",
+            "tags": '["gpt", "evolution"]',
+            "stages": json.dumps(stages),
+        }
+
+    def test_coerce_tour(self, converter):
+        """Test tours coerce their stages JSON column, including mapCenter."""
+        row = self.tour_row("tour-a", [
+            {"title": "Start", "landmarkIds": ["lm-001"], "mapCenter": [800, 1200], "mapZoom": 3},
+        ])
+
+        tour = converter._coerce_tour(row)
+
+        assert tour["estimatedDuration"] == 10
+        assert tour["tags"] == ["gpt", "evolution"]
+        assert tour["stages"] == [{
+            "index": 0,
+            "title": "Start",
+            "description": "",
+            "narration": "",
+            "landmarkIds": ["lm-001"],
+            "mapCenter": {"lat": 800, "lng": 1200},
+            "mapZoom": 3,
+        }]
+
+    def test_coerce_tour_invalid_map_center(self, converter):
+        """Test a stage without a usable mapCenter fails coercion."""
+        row = self.tour_row("tour-a", [{"title": "Start", "landmarkIds": []}])
+
+        with pytest.raises(ValueError, match="tour 'tour-a' stage 0 mapCenter"):
+            converter._coerce_tour(row)
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_tours_output_keeps_hand_edited_layout(self, converter, stream):
+        """Test tours.json keeps non-ASCII text and one-line scalar arrays in both conversion paths."""
+        converter.stream = stream
+        row = self.tour_row("tour-a", [
+            {"title": "Start", "narration": "Reward model\u2014scores", "landmarkIds": ["lm-001", "lm-002"], "mapCenter": [800, 1200]},
+        ])
+        self.create_csv_file(converter, "tours.csv", [row])
+
+        assert converter._convert_file(converter.csv_dir / "tours.csv")
+
+        text = (converter.output_dir / "tours.json").read_text(encoding="utf-8")
+        assert '    "tags": ["gpt", "evolution"],\n' in text
+        assert '        "narration": "Reward model—scores",\n' in text
+        assert '        "landmarkIds": ["lm-001", "lm-002"],\n' in text
+        assert '        "mapCenter": {\n          "lat": 800,\n          "lng": 1200\n        },\n' in text
+        assert json.loads(text)[0]["stages"][0]["landmarkIds"] == ["lm-001", "lm-002"]
+
+    def test_reference_checker_tour_stages(self):
+        """Test stage landmarkIds are resolved with their stage path."""
+        checker = ReferenceChecker({
+            "landmarks": [{"id": "lm-001"}],
+            "tours": [{"id": "tour-a", "stages": [{"landmarkIds": ["lm-001"]}, {"landmarkIds": ["lm-404"]}]}],
+        })
+
+        assert checker.check() == [
+            "tours.csv: Row 2: stages[1].landmarkIds references unknown landmark 'lm-404'",
+        ]
+
+    def test_tour_bundle_build(self):
+        """Test bundles keep referenced landmarks once, with tour and stage bounds."""
+        landmarks = {
+            "lm-1": {"id": "lm-1", "coordinates": {"lat": 800, "lng": 1200}},
+            "lm-2": {"id": "lm-2", "coordinates": {"lat": 1100, "lng": 900}},
+            "lm-3": {"id": "lm-3", "coordinates": {"lat": 2000, "lng": 3000}},
+        }
+        tour = {"id": "tour-a", "stages": [
+            {"index": 0, "landmarkIds": ["lm-2", "lm-1"]},
+            {"index": 1, "landmarkIds": ["lm-1", "lm-404"]},
+        ]}
+
+        bundle = TourBundleWriter.build(tour, landmarks)
+
+        assert [landmark["id"] for landmark in bundle["landmarks"]] == ["lm-2", "lm-1"]
+        assert bundle["bounds"] == {"north": 1100, "south": 800, "east": 1200, "west": 900}
+        assert bundle["stages"][1] == {"index": 1, "bounds": {"north": 800, "south": 800, "east": 1200, "west": 1200}}
+
+    def test_tour_bundles_stage(self, converter):
+        """Test the bundle stage publishes an index, drops stale bundles and removes them when disabled."""
+        converter.converted_records["landmarks"] = [{"id": "lm-1", "coordinates": {"lat": 800, "lng": 1200}}]
+        converter.converted_records["tours"] = [{"id": "tour-a", "stages": [{"index": 0, "landmarkIds": ["lm-1"]}]}]
+        bundle_dir = converter.output_dir / "tours"
+        bundle_dir.mkdir()
+        (bundle_dir / "index.json").write_text("{}", encoding="utf-8")
+        (bundle_dir / "old-tour.json").write_text("{}", encoding="utf-8")
+        converter.tour_bundles = True
+
+        converter._run_cross_file_stages(["tours"])
+
+        index = json.loads((bundle_dir / "index.json").read_text(encoding="utf-8"))
+        assert index == {"tours": [{
+            "id": "tour-a",
+            "url": "/data/tours/tour-a.json",
+            "count": 1,
+            "bounds": {"north": 800, "south": 800, "east": 1200, "west": 1200},
+        }]}
+        assert sorted(path.name for path in bundle_dir.iterdir()) == ["index.json", "tour-a.json"]
+
+        converter.tour_bundles = False
+        converter._run_cross_file_stages([])
+        assert not bundle_dir.exists()
+
+    # Record model tests
+    def test_record_models_cover_required_fields(self):
+        """Test every entity type has a model carrying its required fields."""
+        for entity_type, required in REQUIRED_FIELDS.items():
+            assert set(required) <= set(RECORD_MODELS[entity_type].FIELDS)
+
+    def test_record_model_behaves_like_dict(self, converter):
+        """Test coerced models read, compare and serialize like the dicts they replace."""
+        row = self.tour_row("tour-a", [{"title": "Start", "landmarkIds": [], "mapCenter": [800, 1200]}])
+        tour = converter._coerce_tour(row)
+        as_dict = json.loads(json.dumps(tour.to_dict(), default=lambda obj: obj.to_dict()))
+
+        assert tour == as_dict
+        assert list(tour) == list(as_dict)
+        assert tour.get("missing") is None
+        assert tour["stages"][0]["mapCenter"] == CoordinateRecord(lat=800, lng=1200)
+        for profile in ("pretty", "compact"):
+            converter.output_profile = profile
+            assert converter._dumps(tour) == converter._dumps(as_dict)
+
+    def test_record_models_are_slotted(self):
+        """Test models do not carry a per-instance __dict__."""
+        if sys.version_info < (3, 10):
+            pytest.skip("slotted dataclasses need Python 3.10+")
+        assert not hasattr(CoordinateRecord(lat=0, lng=0), "__dict__")
+
+    # Coercion plan tests
+    def test_coercion_plan_flags_header_columns(self, converter):
+        """Test unknown and missing columns are reported once per file and defaults fill the gaps."""
+        rows = [{"id": f"org-{i}", "name": "Org", "notes": "x", "color": "#FF0000"} for i in range(3)]
+        csv_path = self.create_csv_file(converter, "organizations.csv", rows)
+
+        assert converter._convert_file(csv_path) is True
+
+        assert converter.warnings == [
+            "organizations.csv: Ignoring unknown column(s): notes",
+            "organizations.csv: Missing column(s), using defaults: description, website, landmarkIds, logo",
+        ]
+        record = converter.converted_records["organizations"][0]
+        assert record == {
+            "id": "org-0",
+            "name": "Org",
+            "description": "",
+            "website": None,
+            "landmarkIds": [],
+            "color": "#FF0000",
+            "logo": None,
+        }
+        assert len(converter._coercion_plans) == 1
+
+    def test_register_entity(self, converter, monkeypatch):
+        """Test a new entity type is coerced and validated from its registration alone."""
+        for registry in ("ENTITY_SPECS", "RECORD_MODELS", "REQUIRED_FIELDS"):
+            monkeypatch.setattr(csv_to_json, registry, dict(getattr(csv_to_json, registry)))
+        register_entity("points", "point", CoordinateRecord, [
+            Column("lat", "number", "0"),
+            Column("lng", "number", "0"),
+        ], required=["lat", "lng"])
+
+        record = converter._coerce_record("points", {"lat": " 1200.4 ", "extra": "ignored"})
+
+        assert record == {"lat": 1200, "lng": 0}
+        assert converter._validate_records("points", [record]) is None
+        with pytest.raises(ValueError, match="Point coercion failed: Cannot parse 'north' as number"):
+            converter._coerce_record("points", {"lat": "north", "lng": "1"})
+
+    def test_register_entity_rejects_mismatched_columns(self):
+        """Test registrations must cover the model fields with known kinds."""
+        with pytest.raises(ValueError, match="must match the fields"):
+            register_entity("teams", "team", CoordinateRecord, [Column("lat", "number")], required=[])
+        with pytest.raises(ValueError, match="unknown column kind 'float'"):
+            register_entity("teams", "team", CoordinateRecord, [Column("lat", "float"), Column("lng")], required=[])
+
+    # Row cache tests
+    def test_row_cache_reuses_coerced_rows(self, converter, monkeypatch):
+        """Test cached rows skip coercion and replay their warnings."""
+        rows = [{"id": "cap-001", "polygonCoordinates": "[[5000, 500]]", "zoomThreshold": "0"}]
+        converter.cache_dir = converter.output_dir.parent / "cache"
+        converter.row_cache_mb = 256
+        converter._open_row_cache()
+        first = converter._coerce_types("capabilities", rows)
+        converter._close_row_cache()
+        assert len(converter.warnings) == 1
+
+        def fail(record):
+            raise AssertionError("row should come from the cache")
+
+        monkeypatch.setattr(converter, "_coerce_capability", fail)
+        converter.warnings = []
+        converter._open_row_cache()
+        assert converter._coerce_types("capabilities", rows) == first
+        assert converter._row_cache.hits == 1
+        converter._close_row_cache()
+        assert len(converter.warnings) == 1
+
+    def test_row_cache_eviction_and_clear(self, converter):
+        """Test least recently used rows are evicted over the size bound."""
+        cache = RowCache(converter.output_dir.parent / "rows.sqlite3", max_bytes=60)
+        for i in range(3):
+            cache.put(f"key-{i}", {"id": f"record-{i}", "name": "x" * 10}, [])
+        cache.flush()
+
+        assert cache.get("key-0") is None
+        assert cache.get("key-2") == ({"id": "record-2", "name": "x" * 10}, [])
+
+        cache.clear()
+        assert cache.get("key-2") is None
+        cache.close()
+
+    def test_row_cache_shared_by_processes(self, converter):
+        """Test a cache writing a long file does not hold the lock other workers need."""
+        path = converter.output_dir.parent / "rows.sqlite3"
+        writer, other = RowCache(path, max_bytes=1 << 20), RowCache(path, max_bytes=1 << 20)
+        for i in range(RowCache.COMMIT_ROWS):
+            writer.put(f"key-{i}", {"id": f"record-{i}"}, [])
+
+        # Rows are committed in batches: between them, a worker that does not
+        # wait for the lock at all can write, and sees the committed rows
+        other._conn.execute("PRAGMA busy_timeout = 0")
+        other.put("other", {"id": "other"}, [])
+        other.flush()
+        assert other.get("key-0") == ({"id": "record-0"}, [])
+        writer.close()
+        other.close()
+
 
 class TestCSVToJSONConverterIntegration:
     """Integration tests for CSV to JSON converter."""
@@ -432,6 +1904,125 @@ class TestCSVToJSONConverterIntegration:
 
             assert result is False
 
+    def test_parallel_run_matches_serial(self, capsys):
+        """Test --jobs produces the same report, errors and warnings as a serial run."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_dir = Path(tmpdir) / "csv"
+            csv_dir.mkdir()
+            (csv_dir / "capabilities.csv").write_text("id,zoomThreshold\ncap-001,x\n", encoding="utf-8")
+            (csv_dir / "empty.csv").write_text("id\n", encoding="utf-8")
+            (csv_dir / "organizations.csv").write_text(
+                "id,name,description,website,landmarkIds,color,logo\norg-001,Org,D,,lm-001,#000000,\n",
+                encoding="utf-8",
+            )
+
+            outcomes = []
+            for jobs in (1, 3):
+                converter = CSVToJSONConverter(jobs=jobs)
+                converter.csv_dir = csv_dir
+                converter.output_dir = Path(tmpdir) / f"data-{jobs}"
+                converter.cache_dir = Path(tmpdir) / f"cache-{jobs}"
+                exit_code = converter.run()
+                output = capsys.readouterr().out.replace(str(converter.output_dir), "<out>")
+                outcomes.append((exit_code, output, converter.errors, converter.warnings))
+
+            assert outcomes[0] == outcomes[1]
+            assert outcomes[0][0] == 1
+
+    def test_incremental_rebuild(self, capsys):
+        """Test unchanged CSVs are skipped and changed ones are rebuilt."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_dir = Path(tmpdir) / "csv"
+            csv_dir.mkdir()
+            header = "id,name,description,website,landmarkIds,color,logo\n"
+            (csv_dir / "organizations.csv").write_text(header + "org-001,Org,D,,,#000000,\n", encoding="utf-8")
+
+            def run(**kwargs: Any) -> str:
+                converter = CSVToJSONConverter(**kwargs)
+                converter.csv_dir = csv_dir
+                converter.output_dir = Path(tmpdir) / "data"
+                converter.cache_dir = Path(tmpdir) / "cache"
+                assert converter.run() == 0
+                return capsys.readouterr().out
+
+            assert "Converted organizations.csv" in run()
+            output_path = Path(tmpdir) / "data" / "organizations.json"
+            mtime = output_path.stat().st_mtime_ns
+
+            out = run()
+            assert "Skipped organizations.csv (unchanged)" in out
+            assert "organizations.json skipped (unchanged)" in out
+            assert "Phase 2" not in out
+            assert output_path.stat().st_mtime_ns == mtime
+
+            assert "Converted organizations.csv" in run(force=True)
+
+            output_path.write_text("[]", encoding="utf-8")
+            assert "Converted organizations.csv" in run()
+
+            (csv_dir / "organizations.csv").write_text(header + "org-002,Org,D,,,#000000,\n", encoding="utf-8")
+            assert "Converted organizations.csv" in run()
+            assert json.loads(output_path.read_text(encoding="utf-8"))[0]["id"] == "org-002"
+
+
+
+class TestBenchmarkPipeline:
+    """Smoke tests for scripts/benchmark-pipeline.py."""
+
+    @pytest.fixture
+    def benchmark(self, monkeypatch):
+        """Load the benchmark script against the converter under test, with a tiny "1k" size."""
+        spec = importlib.util.spec_from_file_location(
+            "benchmark_pipeline", Path(__file__).parent.parent / "benchmark-pipeline.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        monkeypatch.setattr(module, "load_converter_module", lambda: csv_to_json)
+        monkeypatch.setitem(module.SIZES, "1k", 40)
+        return module
+
+    def test_benchmark_runs_and_compares_baseline(self, benchmark, capsys):
+        """Test a benchmark run on a tiny dataset saves a baseline and a later run compares against it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            baseline_path = Path(tmpdir) / "baseline.json"
+            options = ["--vertices", "20", "--repeat", "1", "--data-dir", str(Path(tmpdir) / "data"),
+                       "--baseline", str(baseline_path)]
+
+            assert benchmark.main(options + ["--save-baseline"]) == 0
+            run = json.loads(baseline_path.read_text(encoding="utf-8"))
+            assert run["settings"]["size"] == "1k"
+            assert set(run["results"]) == {"capabilities", "landmarks", "organizations"}
+            for phases in run["results"].values():
+                assert set(phases) == {"read", "coerce", "serialize", "validate"}
+                assert all(metrics["peak_mb"] is not None for metrics in phases.values())
+            out = capsys.readouterr().out
+            assert "Generated 1k dataset" in out
+            assert "did not validate" not in out
+            assert "coercion warning" not in out
+
+            assert benchmark.main(options + ["--no-memory", "--threshold", "1000"]) == 0
+            out = capsys.readouterr().out
+            assert "Generated" not in out
+            assert "No regressions" in out
+
+            assert benchmark.main(options + ["--no-memory", "--row-cache", "--csv-reader", "mmap"]) == 0
+            assert "recorded with other settings" in capsys.readouterr().out
+
+    def test_benchmark_reference_baseline(self, benchmark):
+        """Test the committed reference baseline covers every entity type and phase."""
+        run = json.loads((benchmark.BASELINE_DIR / "baseline-1k.json").read_text(encoding="utf-8"))
+
+        assert run["settings"]["size"] == "1k"
+        assert {entity: set(phases) for entity, phases in run["results"].items()} == {
+            entity: set(benchmark.PHASES) for entity in benchmark.ENTITY_TYPES
+        }
+
+    @pytest.mark.parametrize("option", ["--json-backend", "--csv-reader"])
+    def test_benchmark_rejects_unknown_choices(self, benchmark, option):
+        """Test the backend and reader options only accept the converter's choices."""
+        with pytest.raises(SystemExit):
+            benchmark.parse_args(csv_to_json, [option, "nope"])
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+CSV Reader Benchmark
+
+Compares the csv.DictReader path of scripts/csv-to-json.py with the
+memory-mapped reader (--csv-reader mmap) on a synthetic landmarks export
+built by repeating the rows of csv/landmarks.csv.
+
+The mmap reader slices only the used fields out of each row once at least
+half of the columns are unused; landmarks.csv has 16 columns, so
+``--extra-columns 16`` or more shows the projection (e.g. 40 for an export
+with many scratch columns).
+
+Usage:
+    python scripts/benchmark-csv-reader.py [--size-mb MB] [--extra-columns N]
+                                           [--repeat N]
+"""
+
+import argparse
+import csv
+import importlib.util
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+
+
+def load_converter_module() -> Any:
+    """Import scripts/csv-to-json.py (its file name is not a module name)."""
+    spec = importlib.util.spec_from_file_location("csv_to_json", SCRIPT_DIR / "csv-to-json.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["csv_to_json"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_export(source: Path, target: Path, size_mb: int, extra_columns: int) -> int:
+    """
+    Write a landmarks export of about ``size_mb`` MB with unique ids.
+
+    Args:
+        source: CSV whose rows are repeated
+        target: Output path
+        size_mb: Approximate output size
+        extra_columns: Unused columns appended to every row
+
+    Returns:
+        Number of data rows written
+    """
+    with open(source, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row]
+
+    extra_header = [f"notes{i}" for i in range(extra_columns)]
+    extra_cells = ["scratch value not used by the pipeline"] * extra_columns
+    count = 0
+    with open(target, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header + extra_header)
+        while f.tell() < size_mb * 1024 * 1024:
+            for row in rows:
+                writer.writerow([f"{row[0]}-{count}"] + row[1:] + extra_cells)
+                count += 1
+    return count
+
+
+def measure(read_rows: Callable[[], List[Dict[str, Any]]], repeat: int) -> Tuple[float, float, int]:
+    """
+    Time reading every row and measure the memory the rows hold.
+
+    Returns:
+        Best wall time, peak traced MB while holding all rows, row count
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = sum(1 for _ in read_rows())
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    rows = list(read_rows())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return best, peak / (1024 * 1024), count
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the csv-to-json CSV readers.")
+    parser.add_argument("--size-mb", type=int, default=100, help="Size of the synthetic export (default: 100)")
+    parser.add_argument(
+        "--extra-columns",
+        type=int,
+        default=0,
+        help="Unused columns added to every row, e.g. sheet scratch columns; 16 or more lets "
+        "the mmap reader slice out only the used fields (default: 0)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per reader; the best is reported (default: 3)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Main entry point."""
+    args = parse_args(argv)
+    module = load_converter_module()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = Path(tmpdir) / "landmarks.csv"
+        rows = write_export(SCRIPT_DIR.parent / "csv" / "landmarks.csv", csv_path, args.size_mb, args.extra_columns)
+        print(f"Synthetic export: {csv_path.stat().st_size / (1024 * 1024):.0f} MB, {rows} rows, "
+              f"{args.extra_columns} unused column(s)")
+        print()
+
+        results = {}
+        for reader in module.CSV_READERS:
+            converter = module.CSVToJSONConverter(csv_reader=reader)
+            results[reader] = measure(lambda: converter._iter_csv(csv_path), args.repeat)
+
+        with module.MappedCSVReader(csv_path, module.CSVToJSONConverter._csv_columns("landmarks")) as mapped:
+            started = time.perf_counter()
+            ranges = mapped.row_ranges(5000)
+            split_seconds = time.perf_counter() - started
+            kept, total = len(mapped.columns), len(mapped.header)
+            projected = mapped.projected
+
+    baseline = results["csv"][0]
+    print(f"{'reader':<8} {'time':>8} {'rows/s':>10} {'held MB':>9} {'speedup':>8}")
+    for reader, (seconds, held_mb, count) in results.items():
+        print(f"{reader:<8} {seconds:>7.2f}s {count / seconds:>10,.0f} {held_mb:>9.1f} {baseline / seconds:>7.2f}x")
+    print()
+    print(f"Split into {len(ranges)} ranges of 5,000 rows in {split_seconds:.2f}s")
+    if projected:
+        print(f"mmap sliced {kept} of {total} fields out of each row")
+    else:
+        print(f"mmap parsed whole rows ({kept} of {total} columns used; slicing needs at most half)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+
+Generates a seeded synthetic dataset (capabilities.csv, landmarks.csv and
+organizations.csv with many-vertex polygons and JSON-heavy cells) and
+measures each phase of scripts/csv-to-json.py per file: reading the CSV,
+coercing rows, serializing JSON and validating records. Each phase reports
+its best wall time and the peak memory it traced.
+
+Results can be saved as a baseline and later runs compared against it; the
+script exits with 1 when a phase got slower or used more memory than the
+baseline by more than the threshold. Baselines default to
+scripts/benchmarks/baseline-<size>.json, which is committed; the 1k one is
+the reference run. Timings depend on the machine, so record a local
+baseline (--baseline PATH --save-baseline) before comparing on another one.
+
+Usage:
+    python scripts/benchmark-pipeline.py [--size {1k,100k,1m}] [--seed N]
+                                         [--vertices N] [--repeat N]
+                                         [--data-dir DIR] [--no-memory]
+                                         [--json-backend {auto,json,orjson,msgspec}]
+                                         [--csv-reader {csv,mmap}]
+                                         [--row-cache]
+                                         [--baseline PATH] [--save-baseline]
+                                         [--threshold FRACTION]
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import math
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+BASELINE_DIR = SCRIPT_DIR / "benchmarks"
+
+# Landmark rows per dataset size; capabilities and organizations scale with it
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+CAPABILITIES_PER_LANDMARK = 0.1
+ORGANIZATIONS_PER_LANDMARK = 0.01
+
+ENTITY_TYPES = ("capabilities", "landmarks", "organizations")
+PHASES = ("read", "coerce", "serialize", "validate")
+
+# Baseline phases below these are too noisy to compare
+MIN_COMPARABLE = {"seconds": 0.01, "peak_mb": 1.0}
+
+WORDS = (
+    "attention transformer alignment scaling retrieval reasoning benchmark model "
+    "training inference tokenizer embedding decoder encoder sparse dense mixture "
+    "experts context window instruction tuning preference feedback evaluation safety "
+    "multimodal vision language agent planning memory distillation quantization"
+).split()
+
+
+def load_converter_module() -> Any:
+    """Import scripts/csv-to-json.py (its file name is not a module name)."""
+    spec = importlib.util.spec_from_file_location("csv_to_json", SCRIPT_DIR / "csv-to-json.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["csv_to_json"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class DatasetGenerator:
+    """Writes realistic, internally consistent CSV exports from a seed."""
+
+    def __init__(self, landmarks: int, vertices: int, seed: int, map_height: int = 3072, map_width: int = 4096):
+        """
+        Args:
+            landmarks: Number of landmark rows
+            vertices: Vertices per capability polygon
+            seed: Random seed; equal arguments write identical files
+            map_height: Map height in pixels
+            map_width: Map width in pixels
+        """
+        self.counts = {
+            "capabilities": max(10, int(landmarks * CAPABILITIES_PER_LANDMARK)),
+            "landmarks": landmarks,
+            "organizations": max(5, int(landmarks * ORGANIZATIONS_PER_LANDMARK)),
+        }
+        self.vertices = vertices
+        self.map_height = map_height
+        self.map_width = map_width
+        self.rng = random.Random(seed)
+
+    def write(self, directory: Path, columns: Dict[str, List[str]]) -> Dict[str, int]:
+        """
+        Write one CSV file per entity type.
+
+        Args:
+            directory: Output directory
+            columns: CSV header per entity type
+
+        Returns:
+            Row count per entity type
+        """
+        factories = {"capabilities": self._capability, "landmarks": self._landmark, "organizations": self._organization}
+        for entity_type in ENTITY_TYPES:
+            header = columns[entity_type]
+            factory = factories[entity_type]
+            with open(directory / f"{entity_type}.csv", "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                for i in range(self.counts[entity_type]):
+                    row = factory(i)
+                    writer.writerow([row.get(name, "") for name in header])
+        return dict(self.counts)
+
+    def _sentence(self, words: int) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    def _ids(self, entity_type: str, prefix: str, count: int) -> str:
+        return ",".join(f"{prefix}-{self.rng.randrange(self.counts[entity_type])}" for _ in range(count))
+
+    def _capability(self, i: int) -> Dict[str, Any]:
+        rng = self.rng
+        # A jittered ring around a center, in map pixels; the margin keeps
+        # vertices out of the corner the geographic-coordinate check rejects
+        lat0 = rng.uniform(400, self.map_height - 400)
+        lng0 = rng.uniform(400, self.map_width - 400)
+        radius = rng.uniform(100, 250)
+        ring = []
+        for k in range(self.vertices):
+            angle = 2 * math.pi * k / self.vertices
+            r = radius * rng.uniform(0.8, 1.2)
+            ring.append((round(lat0 + r * math.cos(angle)), round(lng0 + r * math.sin(angle))))
+        # Sheet exports mostly use {"lat", "lng"} objects, some [lat, lng] pairs
+        if rng.random() < 0.75:
+            polygon = json.dumps([{"lat": lat, "lng": lng} for lat, lng in ring], separators=(",", ":"))
+        else:
+            polygon = json.dumps([[lat, lng] for lat, lng in ring])
+
+        return {
+            "id": f"cap-{i}",
+            "name": self._sentence(3)[:-1],
+            "description": self._sentence(40),
+            "shortDescription": self._sentence(6),
+            "level": rng.choice(("continent", "archipelago", "island", "strait")),
+            "polygonCoordinates": polygon,
+            "visualStyleHints": json.dumps({
+                "fillColor": f"#{rng.randrange(1 << 24):06x}",
+                "fillOpacity": round(rng.uniform(0.2, 0.6), 2),
+                "strokeColor": f"#{rng.randrange(1 << 24):06x}",
+                "strokeWeight": rng.choice((1, 2, 3)),
+                "pattern": rng.choice(("solid", "dots", "stripes")),
+            }, separators=(",", ":")),
+            "relatedLandmarks": self._ids("landmarks", "lm", rng.randint(2, 8)),
+            # Parents always come first, so the hierarchy has no cycles
+            "parentCapabilityId": f"cap-{rng.randrange(i)}" if i and rng.random() < 0.6 else "",
+            "zoomThreshold": rng.choice((-1, 0, 1)),
+        }
+
+    def _landmark(self, i: int) -> Dict[str, Any]:
+        rng = self.rng
+        landmark_type = rng.choice(("paper", "paper", "model", "tool", "benchmark"))
+        metadata = ""
+        if landmark_type == "model":
+            metadata = json.dumps({
+                "parameters": f"{rng.choice((1, 7, 13, 70, 175))}B",
+                "architecture": "Transformer",
+                "trainingMethod": self._sentence(4)[:-1],
+                "capabilities": rng.sample(WORDS, 4),
+                "releaseDate": f"{rng.randint(2017, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "license": rng.choice(("MIT", "Apache-2.0", "Proprietary")),
+            })
+        links = rng.sample(("arxiv", "github", "paper", "website"), rng.randint(1, 3))
+        return {
+            "id": f"lm-{i}",
+            "name": self._sentence(5)[:-1],
+            "type": landmark_type,
+            "year": rng.randint(2013, 2025),
+            "organization": f"Organization {rng.randrange(self.counts['organizations'])}",
+            "authors": ",".join(f"{rng.choice('ABCDEFGHJKLMNPRST')}. {rng.choice(WORDS).capitalize()}" for _ in range(rng.randint(1, 6))),
+            "description": self._sentence(18),
+            "abstract": self._sentence(45),
+            "externalLinks": json.dumps([
+                {"type": link, "url": f"https://example.org/{link}/{i}", "label": link.capitalize()} for link in links
+            ]),
+            "coordinates": json.dumps([rng.randint(100, self.map_height - 100), rng.randint(100, self.map_width - 100)]),
+            "capabilityId": f"cap-{rng.randrange(self.counts['capabilities'])}",
+            "relatedLandmarks": self._ids("landmarks", "lm", rng.randint(0, 5)),
+            "tags": ",".join(rng.sample(WORDS, rng.randint(2, 6))),
+            "icon": rng.choice(("", "📄", "🤖", "📊")),
+            "metadata": metadata,
+            "zoomThreshold": rng.choice((0, 0, 1, 2)),
+        }
+
+    def _organization(self, i: int) -> Dict[str, Any]:
+        rng = self.rng
+        return {
+            "id": f"org-{i}",
+            "name": f"Organization {i}",
+            "description": self._sentence(15),
+            "website": f"https://org{i}.example.org",
+            "landmarkIds": self._ids("landmarks", "lm", rng.randint(5, 20)),
+            "color": f"#{rng.randrange(1 << 24):06X}",
+            "logo": f"https://org{i}.example.org/favicon.ico" if rng.random() < 0.5 else "",
+        }
+
+
+def prepare_dataset(module: Any, directory: Path, args: argparse.Namespace) -> Dict[str, int]:
+    """
+    Generate the dataset into ``directory``, reusing it if it was generated with the same arguments.
+
+    Returns:
+        Row count per entity type
+    """
+    stamp_path = directory / "dataset.json"
+    stamp = {"size": args.size, "seed": args.seed, "vertices": args.vertices}
+    if stamp_path.exists():
+        saved = json.loads(stamp_path.read_text(encoding="utf-8"))
+        if saved.get("dataset") == stamp and all((directory / f"{e}.csv").exists() for e in ENTITY_TYPES):
+            return saved["rows"]
+
+    directory.mkdir(parents=True, exist_ok=True)
+    columns = {e: [column.name for column in module.ENTITY_SPECS[e].columns] for e in ENTITY_TYPES}
+    started = time.perf_counter()
+    rows = DatasetGenerator(SIZES[args.size], args.vertices, args.seed).write(directory, columns)
+    print(f"Generated {args.size} dataset in {time.perf_counter() - started:.1f}s: {directory}")
+    stamp_path.write_text(json.dumps({"dataset": stamp, "rows": rows}, indent=2), encoding="utf-8")
+    return rows
+
+
+def measure(func: Callable[[], Any], repeat: int, memory: bool) -> Tuple[Dict[str, float], Any]:
+    """
+    Time a phase and measure the memory it allocates.
+
+    The timed runs are untraced (tracing slows allocation-heavy code); one
+    extra traced run measures the peak above the memory held before it.
+
+    Returns:
+        ({"seconds": best wall time, "peak_mb": peak traced MB or None}, last result)
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        result = None
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+
+    peak_mb = None
+    if memory:
+        result = None
+        tracemalloc.start()
+        held = tracemalloc.get_traced_memory()[0]
+        result = func()
+        peak_mb = (tracemalloc.get_traced_memory()[1] - held) / (1024 * 1024)
+        tracemalloc.stop()
+    return {"seconds": best, "peak_mb": peak_mb}, result
+
+
+def benchmark(module: Any, directory: Path, rows: Dict[str, int], args: argparse.Namespace) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Measure every phase of every entity type.
+
+    Returns:
+        Metrics per entity type and phase
+    """
+    converter = module.CSVToJSONConverter(
+        json_backend=args.json_backend,
+        csv_reader=args.csv_reader,
+        row_cache_mb=1 << 20 if args.row_cache else 0,
+    )
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        converter.cache_dir = Path(cache_dir)
+        with converter.row_cache() as row_cache:
+            for entity_type in ENTITY_TYPES:
+                results[entity_type] = benchmark_entity(
+                    converter, row_cache, directory / f"{entity_type}.csv", rows[entity_type], args
+                )
+    return results
+
+
+def benchmark_entity(
+    converter: Any,
+    row_cache: Any,
+    csv_path: Path,
+    count: int,
+    args: argparse.Namespace,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure every phase of one entity type.
+
+    With ``--row-cache`` the coerce phase runs against a warm row cache,
+    filled by one untimed run, as in a rebuild of an edited file.
+
+    Returns:
+        Metrics per phase
+    """
+    entity_type = csv_path.stem
+    print(f"\n{entity_type} ({count:,} rows, {csv_path.stat().st_size / (1024 * 1024):.1f} MB)")
+    print(f"  {'phase':<10} {'time':>9} {'rows/s':>11} {'peak MB':>9}")
+    phases: Dict[str, Dict[str, float]] = {}
+
+    def coerce() -> List[Any]:
+        converter.warnings = []
+        return converter.coerce_rows(entity_type, raw_rows)
+
+    phases["read"], raw_rows = measure(lambda: converter.read_rows(csv_path), args.repeat, args.memory)
+    if row_cache is not None:
+        coerce()
+        row_cache.flush()
+    phases["coerce"], records = measure(coerce, args.repeat, args.memory)
+    del raw_rows
+    phases["serialize"], _ = measure(lambda: converter.serialize(records, entity_type), args.repeat, args.memory)
+    phases["validate"], error = measure(lambda: converter.validate(entity_type, records), args.repeat, args.memory)
+    del records
+    if error is not None:
+        print(f"  ⚠️  Generated data did not validate: {error}")
+    if converter.warnings:
+        print(f"  ⚠️  {len(converter.warnings)} coercion warning(s), e.g. {converter.warnings[0]}")
+
+    for phase in PHASES:
+        metrics = phases[phase]
+        metrics["rows_per_second"] = count / metrics["seconds"] if metrics["seconds"] else 0.0
+        peak = "-" if metrics["peak_mb"] is None else f"{metrics['peak_mb']:.1f}"
+        print(f"  {phase:<10} {metrics['seconds']:>8.3f}s {metrics['rows_per_second']:>11,.0f} {peak:>9}")
+    return phases
+
+
+def settings(module: Any, args: argparse.Namespace) -> Dict[str, Any]:
+    """Benchmark settings that must match for results to be comparable."""
+    return {
+        "size": args.size,
+        "seed": args.seed,
+        "vertices": args.vertices,
+        "jsonBackend": module.get_json_backend(args.json_backend).name,
+        "csvReader": args.csv_reader,
+        "rowCache": args.row_cache,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    List phases that regressed against a baseline.
+
+    A phase regresses when its time or peak memory exceeds the baseline by
+    more than ``threshold`` (a fraction); phases below ``MIN_COMPARABLE``
+    in the baseline are skipped as noise.
+    """
+    regressions = []
+    print(f"\nCompared with baseline (threshold {threshold:.0%}):")
+    for entity_type, phases in results.items():
+        for phase, metrics in phases.items():
+            base = baseline["results"].get(entity_type, {}).get(phase)
+            if base is None:
+                continue
+            changes = []
+            for metric, label in (("seconds", "time"), ("peak_mb", "memory")):
+                current, previous = metrics.get(metric), base.get(metric)
+                if current is None or previous is None or previous < MIN_COMPARABLE[metric]:
+                    continue
+                change = current / previous - 1
+                changes.append(f"{label} {change:+.1%}")
+                if change > threshold:
+                    regressions.append(f"{entity_type} {phase}: {label} {change:+.1%}")
+            if changes:
+                print(f"  {entity_type:<14} {phase:<10} {', '.join(changes)}")
+    return regressions
+
+
+def parse_args(module: Any, argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments; ``module`` is the converter, which lists the backend and reader choices."""
+    parser = argparse.ArgumentParser(description="Benchmark the csv-to-json pipeline phases on synthetic data.")
+    parser.add_argument("--size", choices=SIZES, default="1k", help="landmark rows: 1k, 100k or 1m (default: 1k)")
+    parser.add_argument("--seed", type=int, default=1, help="generator seed (default: 1)")
+    parser.add_argument("--vertices", type=int, default=64, help="vertices per capability polygon (default: 64)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per phase; the best is reported (default: 3)")
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="keep the generated CSVs here and reuse them on later runs (default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="skip the traced run that measures peak memory (faster on large datasets)",
+    )
+    parser.add_argument(
+        "--json-backend",
+        choices=module.JSON_BACKENDS,
+        default="auto",
+        help="converter JSON backend (default: auto)",
+    )
+    parser.add_argument("--csv-reader", choices=module.CSV_READERS, default="csv", help="converter CSV reader (default: csv)")
+    parser.add_argument(
+        "--row-cache",
+        action="store_true",
+        help="time coercion against a warm row cache, as when rebuilding an edited file",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="baseline results file (default: scripts/benchmarks/baseline-<size>.json)",
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="store this run's results as the baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown or memory growth over the baseline, as a fraction (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+    if args.threshold < 0:
+        parser.error("--threshold must not be negative")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Main entry point."""
+    module = load_converter_module()
+    args = parse_args(module, argv)
+    baseline_path = args.baseline or BASELINE_DIR / f"baseline-{args.size}.json"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        directory = args.data_dir or Path(tmpdir)
+        rows = prepare_dataset(module, directory, args)
+        results = benchmark(module, directory, rows, args)
+
+    run = {
+        "converterVersion": module.CONVERTER_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings(module, args),
+        "results": results,
+    }
+
+    exit_code = 0
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        if baseline.get("settings") != run["settings"]:
+            print(f"\n⚠️  Baseline {baseline_path} was recorded with other settings: {baseline.get('settings')}")
+        else:
+            print(f"\nBaseline: {baseline_path} (Python {baseline.get('python')} on {baseline.get('platform', 'unknown')})")
+            regressions = compare(results, baseline, args.threshold)
+            if regressions:
+                print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+                for regression in regressions:
+                    print(f"  - {regression}")
+                exit_code = 1
+            else:
+                print(f"\n✅ No regressions over {args.threshold:.0%}")
+    elif not args.save_baseline:
+        print(f"\nNo baseline at {baseline_path}; store one with --save-baseline")
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(run, indent=2), encoding="utf-8")
+        print(f"\n✓ Saved baseline: {baseline_path}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,35 +3,1050 @@
 CSV-to-JSON Data Pipeline Script
 
 Converts Google Sheets CSV exports to validated JSON files for the LLM Map Explorer.
-Supports conversion of capabilities, landmarks, and organizations data.
+Supports conversion of capabilities, landmarks, organizations, and tours data.
 
 Usage:
-    python scripts/csv-to-json.py
+    python scripts/csv-to-json.py [--isolated-validation] [--stream] [--jobs N]
+                                  [--chunk-size ROWS] [--force]
+                                  [--row-cache-size MB] [--clear-cache]
+                                  [--profile {pretty,compact}]
+                                  [--shard-landmarks {capability,zoom}]
+                                  [--spatial-index [TILE_PX]]
+                                  [--geometry] [--simplify-tolerance PX]
+                                  [--search-index] [--strict-references]
+                                  [--no-check-references] [--tour-bundles]
+                                  [--json-backend {auto,json,orjson,msgspec}]
+                                  [--csv-reader {csv,mmap}]
+                                  [--columnar {arrow,parquet}] [--columnar-dir DIR]
+                                  [--max-diagnostics N] [--diagnostics-json PATH]
+                                  [--metrics-json PATH] [--metrics-prometheus PATH]
+                                  [--trace-memory] [--cprofile PATH]
+                                  [--hashed-filenames] [--keep-versions N]
+                                  [--fetch-sheets]
+                                  [--watch] [--debounce-ms MS]
 """
 
+import argparse
+import cProfile
+import copy
 import csv
+import gzip
+import io
 import json
+import mmap
 import os
+import re
 import sys
 import subprocess
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from collections.abc import Mapping
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from dataclasses import dataclass
+from itertools import islice, repeat, starmap
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Sequence
+from typing import List, Dict, Any, Callable, ContextManager, Generator, Iterable, Iterator, Optional, Sequence, TextIO, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: .json.br copies are skipped without it
+    brotli = None
+
+try:
+    import numpy
+except ImportError:  # optional: batched polygon coordinate coercion
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:  # optional: columnar tables (--columnar) need it
+    pyarrow = None
+
+# Building blocks in scripts/csv_pipeline/; tests and benchmarks also import
+# them from this module. The script directory is on sys.path when the script
+# runs, but not when it is loaded by file path (see load_converter_module in
+# the benchmarks)
+_SCRIPT_DIR = str(Path(__file__).resolve().parent)
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+
+from csv_pipeline.caches import COLUMNAR_FORMATS, ColumnarStore, ReferenceCollector, RowCache
+from csv_pipeline.files import atomic_path, atomic_write, file_sha256, remove_output, temporary_path
+from csv_pipeline.json_backends import JSON_BACKENDS, JSONBackend, format_hand_edited_json, get_json_backend
+from csv_pipeline.records import (
+    REFERENCE_FIELDS,
+    CapabilityRecord,
+    CoordinateRecord,
+    Diagnostic,
+    LandmarkRecord,
+    OrganizationRecord,
+    RecordModel,
+    TourRecord,
+    TourStageRecord,
+)
+from csv_pipeline.sheets import SheetFetcher
+from csv_pipeline.writers import (
+    SEARCH_ENTITIES,
+    SHARD_FIELDS,
+    AssetManifestWriter,
+    CapabilityGeometryWriter,
+    LandmarkShardWriter,
+    SearchIndexBuilder,
+    SpatialIndexWriter,
+    TourBundleWriter,
+)
+
+
+# Bump CONVERTER_VERSION when coercion or output formatting changes, and
+# SCHEMA_VERSION when the JSON shape changes; either forces a full rebuild.
+CONVERTER_VERSION = "1.2.0"
+SCHEMA_VERSION = "1.0"
+
+# Output profiles: "pretty" is indented for diffs, "compact" is minified and
+# written alongside precompressed .json.gz/.json.br copies for static hosting
+OUTPUT_PROFILES = ("pretty", "compact")
+
+# CSV readers selectable with --csv-reader ("mmap" splits files into byte
+# ranges at row boundaries and keeps only the columns an entity type uses)
+CSV_READERS = ("csv", "mmap")
+
+# Polygons with at least this many vertices are coerced as one NumPy batch
+# (smaller ones are cheaper vertex by vertex)
+POLYGON_BATCH_MIN_VERTICES = 16
+
+# --watch polls csv/ this often and rebuilds once files have stopped changing
+# for the debounce period (sheet exports can write several files in a burst)
+WATCH_POLL_SECONDS = 0.05
+WATCH_DEBOUNCE_SECONDS = 0.05
+
+# --fetch-sheets downloads the exports listed in csv/sheets.json (see
+# csv_pipeline.sheets)
+SHEET_SOURCES_FILENAME = "sheets.json"
+
+# Pipeline phases timed per file by --metrics-json/--metrics-prometheus
+METRIC_PHASES = ("read", "coerce", "write", "validate")
+
+# Column coercion kinds: converter method and whether it also takes the row's
+# message context (e.g. "landmark 'gpt-3'") and the column name
+COLUMN_KINDS: Dict[str, Tuple[str, bool]] = {
+    "string": ("_strip_string", False),
+    "optional": ("_optional_string", False),
+    "number": ("_parse_number", False),
+    "json": ("_parse_json_column", False),
+    "array": ("_parse_array_column", False),
+    "coordinates": ("_coerce_coordinate_column", True),
+    "polygon": ("_coerce_polygon_column", True),
+    "stages": ("_coerce_stages_column", True),
+}
+
+# Per entity type, filled by register_entity: coercion spec, record model and
+# fields every record must carry (checked in Phase 2)
+ENTITY_SPECS: Dict[str, "EntitySpec"] = {}
+RECORD_MODELS: Dict[str, type] = {}
+REQUIRED_FIELDS: Dict[str, List[str]] = {}
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    How one CSV column is coerced.
+
+    Attributes:
+        name: Header name, also the record field it fills
+        kind: Coercion kind (see ``COLUMN_KINDS``)
+        default: Cell value coerced when the column is absent
+    """
+
+    name: str
+    kind: str = "string"
+    default: Any = ""
+
+
+@dataclass(frozen=True)
+class EntitySpec:
+    """Registered entity type: message label, record model and its columns."""
+
+    label: str
+    model: type
+    columns: Tuple[Column, ...]
+    hand_edited: bool = False
+
+
+def register_entity(
+    entity_type: str,
+    label: str,
+    model: type,
+    columns: Sequence[Column],
+    required: Sequence[str],
+    hand_edited: bool = False,
+) -> None:
+    """
+    Register how rows of ``<entity_type>.csv`` are coerced and validated.
+
+    Args:
+        entity_type: CSV file stem (e.g. "landmarks")
+        label: Singular name used in messages (e.g. "landmark")
+        model: Record model; its fields must match ``columns`` in order
+        columns: One column per model field
+        required: Fields every record must carry
+        hand_edited: Keep the pretty output in the layout of the file that
+            was edited by hand before it was generated (see
+            ``format_hand_edited_json``)
+
+    Raises:
+        ValueError: If the columns do not match the model fields or use an
+            unknown coercion kind
+    """
+    columns = tuple(columns)
+    if tuple(column.name for column in columns) != model.FIELDS:
+        raise ValueError(f"{entity_type}: columns must match the fields of {model.__name__}")
+    for column in columns:
+        if column.kind not in COLUMN_KINDS:
+            raise ValueError(f"{entity_type}: unknown column kind '{column.kind}' for '{column.name}'")
+
+    ENTITY_SPECS[entity_type] = EntitySpec(label, model, columns, hand_edited)
+    RECORD_MODELS[entity_type] = model
+    REQUIRED_FIELDS[entity_type] = list(required)
+
+
+register_entity("capabilities", "capability", CapabilityRecord, [
+    Column("id"),
+    Column("name"),
+    Column("description"),
+    Column("shortDescription"),
+    Column("level"),
+    Column("polygonCoordinates", "polygon", "[]"),
+    Column("visualStyleHints", "json", "{}"),
+    Column("relatedLandmarks", "array", "[]"),
+    Column("parentCapabilityId", "optional"),
+    Column("zoomThreshold", "number", "0"),
+], required=["id", "name", "description", "level", "polygonCoordinates", "visualStyleHints", "zoomThreshold"])
+
+register_entity("landmarks", "landmark", LandmarkRecord, [
+    Column("id"),
+    Column("name"),
+    Column("type"),
+    Column("year", "number", "0"),
+    Column("organization"),
+    Column("authors", "array", "[]"),
+    Column("description"),
+    Column("abstract", "optional"),
+    Column("externalLinks", "json", "[]"),
+    Column("coordinates", "coordinates", "{}"),
+    Column("capabilityId"),
+    Column("relatedLandmarks", "array", "[]"),
+    Column("tags", "array", "[]"),
+    Column("icon", "optional"),
+    Column("metadata", "json", "{}"),
+    Column("zoomThreshold", "number", "1"),
+], required=["id", "name", "type", "year", "organization", "description", "externalLinks", "coordinates", "capabilityId", "tags", "zoomThreshold"])
+
+register_entity("organizations", "organization", OrganizationRecord, [
+    Column("id"),
+    Column("name"),
+    Column("description"),
+    Column("website", "optional"),
+    Column("landmarkIds", "array", "[]"),
+    Column("color"),
+    Column("logo", "optional"),
+], required=["id", "name", "description", "landmarkIds", "color"])
+
+register_entity("tours", "tour", TourRecord, [
+    Column("id"),
+    Column("title"),
+    Column("description"),
+    Column("difficulty"),
+    Column("estimatedDuration", "number", "0"),
+    Column("tags", "array", "[]"),
+    Column("stages", "stages", "[]"),
+], required=["id", "title", "description", "difficulty", "estimatedDuration", "tags", "stages"], hand_edited=True)
+
+
+class CoercionPlan:
+    """
+    Row coercion for one entity type, compiled from a CSV header.
+
+    Each model field is resolved to its coercer once, and columns missing
+    from the header to their default cell, so coercing a row is a single
+    pass over precomputed steps instead of per-row dispatch.
+    """
+
+    __slots__ = ("model", "missing", "unknown", "_label", "_error_prefix", "_steps", "_contextual", "_strip")
+
+    def __init__(self, converter: "CSVToJSONConverter", entity_type: str, header: Iterable[Optional[str]]):
+        spec = ENTITY_SPECS[entity_type]
+        header = [name for name in header if name is not None]
+        present = set(header)
+        known = {column.name for column in spec.columns}
+
+        self.model = spec.model
+        # Expected columns absent from the header, and header columns no field uses
+        self.missing = [column.name for column in spec.columns if column.name not in present]
+        self.unknown = [name for name in header if name not in known]
+        self._label = spec.label
+        self._error_prefix = f"{spec.label.capitalize()} coercion failed"
+        self._steps: List[Tuple[str, bool, Any, Any, bool]] = []
+        for column in spec.columns:
+            method, contextual = COLUMN_KINDS[column.kind]
+            self._steps.append(
+                (column.name, column.name in present, column.default, getattr(converter, method), contextual)
+            )
+        self._contextual = any(step[4] for step in self._steps)
+        self._strip = converter._strip_string
+
+    def coerce(self, record: Dict[str, Any]) -> RecordModel:
+        """
+        Coerce one raw row into a record model.
+
+        Raises:
+            ValueError: If a cell cannot be coerced
+        """
+        get = record.get
+        values = []
+        try:
+            context = f"{self._label} '{self._strip(get('id', ''))}'" if self._contextual else ""
+            for name, present, default, coerce, contextual in self._steps:
+                value = get(name, default) if present else default
+                values.append(coerce(value, context, name) if contextual else coerce(value))
+            return self.model(*values)
+        except Exception as e:
+            raise ValueError(f"{self._error_prefix}: {str(e)}")
+
+
+class MappedCSVReader:
+    """
+    Reads a CSV export through a memory map.
+
+    Row boundaries are found on the raw bytes (a newline ends a row only
+    outside quotes, which assumes well-formed quoting as written by Google
+    Sheets and Excel), so a file can be split into byte ranges that are
+    parsed independently, e.g. on worker processes.
+
+    When at most half of the columns are requested (``projected``), each row
+    is matched on the raw bytes by a regular expression compiled from the
+    header that captures only the requested fields, so only those are
+    sliced out and decoded; the columns after the last requested one are
+    never scanned. Otherwise, and for rows the expression cannot read (stray
+    quotes, carriage returns inside a row, possibly blank rows), blocks are
+    decoded and parsed with the csv module, which is faster when most fields
+    are kept anyway. Rows read like
+    ``csv.DictReader`` rows in text mode: newlines are normalized to
+    ``\\n``, short rows fill missing cells with None and blank rows are
+    skipped.
+    """
+
+    BLOCK_SIZE = 1024 * 1024
+
+    def __init__(self, path: Path, columns: Optional[Iterable[str]] = None):
+        """
+        Map a CSV file and parse its header.
+
+        Args:
+            path: Path to the CSV file
+            columns: Columns to keep (None keeps every column)
+
+        Raises:
+            ValueError: If the file has no header row
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("CSV file has no headers")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self._map)
+        self.data_start = self._row_end(0)
+
+        header = next(csv.reader(io.StringIO(self._decode(0, self.data_start))), None)
+        if not header:
+            self.close()
+            raise ValueError("CSV file has no headers")
+        self.header: List[str] = header
+
+        # Later duplicates win, as in DictReader
+        positions = {name: i for i, name in enumerate(header)}
+        wanted = None if columns is None else set(columns)
+        self.columns = [name for name in positions if wanted is None or name in wanted]
+        self._indices = [positions[name] for name in self.columns]
+        self._width = max(self._indices, default=-1) + 1
+
+        # The first field is captured for the blank-row check and the last
+        # one to tell a complete prefix from a field the pattern rejected
+        captured = sorted(set(self._indices) | {0, max(self._width - 1, 0)})
+        self._row: Optional["re.Pattern[bytes]"] = None
+        if len(captured) * 2 <= len(header):
+            self._row = self._row_pattern(self._width, captured)
+        self._groups = [captured.index(i) + 1 for i in self._indices]
+        self._last_group = len(captured)
+
+    @staticmethod
+    def _row_pattern(width: int, captured: Sequence[int]) -> "re.Pattern[bytes]":
+        """
+        Compile the expression for the first ``width`` fields of a row, capturing those in ``captured``.
+
+        Fields a short row lacks leave their groups unset; the fields after
+        ``width`` are never looked at.
+        """
+        quoted = rb'"[^"]*(?:""[^"]*)*"'
+        plain = rb'[^,"\r\n]*'
+        fields = b""
+        for i in reversed(range(max(width, 1))):
+            field = b"(%s|%s)" % (quoted, plain) if i in captured else b"(?:%s|%s)" % (quoted, plain)
+            fields = field + (b"(?:," + fields + b")?" if fields else b"")
+        return re.compile(fields)
+
+    @property
+    def projected(self) -> bool:
+        """Whether rows are read by slicing the kept fields out of the raw bytes."""
+        return self._row is not None
+
+    def __enter__(self) -> "MappedCSVReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def _count_quotes(self, start: int, end: int) -> int:
+        """Count quote bytes in [start, end) without copying more than a block at a time."""
+        count = 0
+        for pos in range(start, end, self.BLOCK_SIZE):
+            count += self._map[pos:min(pos + self.BLOCK_SIZE, end)].count(b'"')
+        return count
+
+    def _row_end(self, pos: int, quotes: int = 0) -> int:
+        """
+        Offset just past the row that contains ``pos``.
+
+        Args:
+            pos: Offset inside the row
+            quotes: Quote bytes between the row start and ``pos``
+        """
+        while True:
+            newline = self._map.find(b"\n", pos)
+            if newline < 0:
+                return self.size
+            quotes += self._map[pos:newline].count(b'"')
+            if quotes % 2 == 0:
+                return newline + 1
+            pos = newline + 1
+
+    def _boundary(self, start: int, target: int) -> int:
+        """First row boundary at or after ``target``, scanning from the row start ``start``."""
+        if target >= self.size:
+            return self.size
+        if target <= start:
+            return start
+        return self._row_end(target, self._count_quotes(start, target))
+
+    def _decode(self, start: int, end: int) -> str:
+        """Decode a byte range, normalizing newlines like text-mode reads."""
+        text = self._map[start:end].decode("utf-8")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+    def row_ranges(self, rows_per_range: int) -> List[Tuple[int, int]]:
+        """
+        Split the data rows into byte ranges of ``rows_per_range`` rows each.
+
+        Blank rows count towards the split but are skipped when read.
+
+        Args:
+            rows_per_range: Rows per range (the last range may be shorter)
+
+        Returns:
+            (start, end) byte offsets, in file order
+        """
+        ranges: List[Tuple[int, int]] = []
+        start = pos = self.data_start
+        rows = 0
+        while pos < self.size:
+            pos = self._row_end(pos)
+            rows += 1
+            if rows == rows_per_range:
+                ranges.append((start, pos))
+                start, rows = pos, 0
+        if start < self.size:
+            ranges.append((start, self.size))
+        return ranges
+
+    def rows(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Dict[str, Optional[str]]]:
+        """
+        Yield the non-blank rows of a byte range as dicts of the kept columns.
+
+        Args:
+            start: Row boundary to start at (default: first data row)
+            end: Row boundary to stop at (default: end of file)
+
+        Yields:
+            Column name → cell value (None for cells past the end of a short row)
+        """
+        start = self.data_start if start is None else start
+        end = self.size if end is None else end
+        while start < end:
+            stop = min(self._boundary(start, start + self.BLOCK_SIZE), end)
+            block = self._map[start:stop]
+            yield from (self._parse_rows(block) if self._row is None else self._project_rows(block))
+            start = stop
+
+    def _project_rows(self, block: bytes) -> Iterator[Dict[str, Optional[str]]]:
+        """Slice the kept fields out of a block of whole rows, decoding only those."""
+        columns, match, last = self.columns, self._row.match, self._last_group
+        groups = [group - 1 for group in self._groups]
+        pick = itemgetter(*groups) if len(groups) > 1 else lambda captured: [captured[i] for i in groups]
+        unquote, find, count = self._unquote, block.find, block.count
+
+        start, size = 0, len(block)
+        while start < size:
+            # The row ends at the first newline outside quotes (see _row_end)
+            newline, quotes = start - 1, 0
+            while True:
+                pos = newline + 1
+                newline = find(b"\n", pos)
+                if newline < 0:
+                    newline = size
+                    break
+                quotes += count(b'"', pos, newline)
+                if quotes % 2 == 0:
+                    break
+            line_end = newline - 1 if newline > start and block[newline - 1] == 0x0D else newline
+            row_start, start = start, newline + 1
+
+            row = match(block, row_start, line_end)
+            captured = row.groups()
+            end = row.end()
+            if (
+                (end != line_end and (block[end] != 0x2C or row.group(last) is None))
+                or not captured[0]
+                or captured[0].isspace()
+                or find(b"\r", row_start, line_end) >= 0
+            ):
+                # Stray quotes, carriage returns inside the row and possibly blank rows take the csv module's path
+                yield from self._parse_rows(block[row_start:start])
+                continue
+
+            values = pick(captured)
+            if None in values:
+                # Short row: cells past its end are None
+                yield {
+                    name: None if value is None else unquote(value).decode("utf-8")
+                    for name, value in zip(columns, values)
+                }
+                continue
+            values = [value[1:-1].replace(b'""', b'"') if value[:1] == b'"' else value for value in values]
+            yield dict(zip(columns, map(bytes.decode, values)))
+
+    @staticmethod
+    def _unquote(value: bytes) -> bytes:
+        """Strip the quotes of a quoted field and undo doubled quotes."""
+        return value[1:-1].replace(b'""', b'"') if value[:1] == b'"' else value
+
+    def _parse_rows(self, raw: bytes) -> Iterator[Dict[str, Optional[str]]]:
+        """Decode whole rows and parse them with the csv module, skipping blank rows."""
+        columns, indices = self.columns, self._indices
+        text = raw.decode("utf-8")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        for row in csv.reader(io.StringIO(text)):
+            if not row or not row[0] or row[0].isspace():
+                joined = "".join(row)
+                if not joined or joined.isspace():
+                    continue
+            yield {name: row[i] if i < len(row) else None for name, i in zip(columns, indices)}
+
+
+class ReferenceChecker:
+    """
+    Checks cross-entity references (see ``REFERENCE_FIELDS``).
+
+    Builds an id -> row hash index once per entity type, then resolves every
+    reference with a dict lookup and walks the ``parentCapabilityId``
+    hierarchy once, so the check is linear in records plus references.
+    Problems are diagnostics that read ``"<file>.csv: Row N: ..."``, with
+    rows numbered like the rest of the pipeline (header is row 1).
+    """
+
+    def __init__(self, records: Dict[str, List[Dict[str, Any]]], max_problems: int = 0):
+        """
+        Args:
+            records: Coerced records per entity type
+            max_problems: Problems kept per file; further ones are only
+                counted in ``suppressed`` (0 keeps all)
+        """
+        self.records = records
+        self.max_problems = max_problems
+        self.references = 0
+        self.problems: List[Diagnostic] = []
+        self.suppressed: Dict[str, int] = {}
+        self._kept: Dict[str, int] = {}
+        self._rows: Dict[str, Dict[str, int]] = {}
+
+    def _report(self, problem: Diagnostic) -> None:
+        """Keep a problem unless its file is over ``max_problems``."""
+        kept = self._kept.get(problem.file, 0)
+        if self.max_problems and kept >= self.max_problems:
+            self.suppressed[problem.file] = self.suppressed.get(problem.file, 0) + 1
+            return
+        self._kept[problem.file] = kept + 1
+        self.problems.append(problem)
+
+    def check(self) -> List[Diagnostic]:
+        """Index ids, resolve every reference and detect hierarchy cycles."""
+        for entity_type, records in self.records.items():
+            self._rows[entity_type] = self._index(entity_type, records)
+        for entity_type, field, target_type in REFERENCE_FIELDS:
+            self._check_field(entity_type, field, target_type)
+        self._check_cycles()
+        return self.problems
+
+    def _index(self, entity_type: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Map record ids to CSV rows, reporting duplicate ids."""
+        rows: Dict[str, int] = {}
+        for i, record in enumerate(records):
+            record_id = record.get("id")
+            if record_id in rows:
+                self._report(Diagnostic(
+                    "Duplicate id '{}' (first defined in Row {})", record_id, rows[record_id],
+                    file=f"{entity_type}.csv", row=i + 2, field="id",
+                ))
+            else:
+                rows[record_id] = i + 2
+        return rows
+
+    def _check_field(self, entity_type: str, field: str, target_type: str) -> None:
+        """Resolve one reference field of every record of an entity type."""
+        targets = self._rows.get(target_type, {})
+        for i, record in enumerate(self.records.get(entity_type, [])):
+            for path, target_id in self._references(record, field):
+                self.references += 1
+                if target_id not in targets:
+                    self._report(Diagnostic(
+                        "{} references unknown {} '{}'", path, SEARCH_ENTITIES[target_type], target_id,
+                        file=f"{entity_type}.csv", row=i + 2, field=path,
+                    ))
+
+    @classmethod
+    def _references(cls, record: Dict[str, Any], field: str) -> Iterator[Tuple[str, Any]]:
+        """Yield ``(field path, id)`` for every id a record references through ``field``."""
+        if "." in field:
+            outer, inner = field.split(".", 1)
+            for n, item in enumerate(record.get(outer) or []):
+                for path, target_id in cls._references(item, inner):
+                    yield f"{outer}[{n}].{path}", target_id
+            return
+
+        value = record.get(field)
+        for target_id in value if isinstance(value, list) else [value] if value else []:
+            yield field, target_id
+
+    def _check_cycles(self) -> None:
+        """Report each cycle in the parentCapabilityId hierarchy once."""
+        rows = self._rows.get("capabilities", {})
+        parents = {
+            record.get("id"): record.get("parentCapabilityId")
+            for record in self.records.get("capabilities", [])
+        }
+        # 1 = on the current walk, 2 = finished (no cycle reachable)
+        state: Dict[str, int] = {}
+        for start in parents:
+            path = []
+            node = start
+            while node in parents and node not in state:
+                state[node] = 1
+                path.append(node)
+                node = parents[node]
+            if state.get(node) == 1:
+                cycle = path[path.index(node):]
+                self._report(Diagnostic(
+                    "parentCapabilityId cycle {}", " -> ".join(cycle + [node]),
+                    file="capabilities.csv", row=rows[node], field="parentCapabilityId",
+                ))
+            for visited in path:
+                state[visited] = 2
+
+
+class PipelineMetrics:
+    """
+    Wall time, CPU time, rows, bytes and memory of each phase per file.
+
+    Phases nest: rows are read while they are coerced, and streamed records
+    are validated and written inside the coercion loop. Each phase is
+    charged only its own time, without the phases nested in it. With
+    ``trace_memory``, outermost phases also record their tracemalloc peak
+    above the memory allocated when they started, including nested phases.
+    CPU time is this process's; chunked coercion on worker processes only
+    shows up as wall time.
+    """
+
+    PROMETHEUS_PREFIX = "csv_to_json"
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Args:
+            trace_memory: Trace allocations with tracemalloc (slows the
+                pipeline down noticeably)
+        """
+        self.trace_memory = trace_memory
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.run: Dict[str, Any] = {}
+        self._stack: List[List[float]] = []
+        self._started: Optional[Tuple[float, float]] = None
+        self._peak_memory = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether ``start`` was called without a matching ``stop``."""
+        return self._started is not None
+
+    def start(self) -> None:
+        """Start timing the run (and tracing memory)."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._started = (time.perf_counter(), time.process_time())
+
+    def stop(self) -> None:
+        """Record the run's totals and stop tracing memory."""
+        wall, cpu = self._started
+        self._started = None
+        self.run = {
+            "seconds": time.perf_counter() - wall,
+            "cpuSeconds": time.process_time() - cpu,
+        }
+        if self.trace_memory:
+            self._peak_memory = max(self._peak_memory, tracemalloc.get_traced_memory()[1])
+            self.run["peakMemoryBytes"] = self._peak_memory
+            tracemalloc.stop()
+
+    def _file(self, filename: str) -> Dict[str, Any]:
+        entry = self.files.get(filename)
+        if entry is None:
+            entry = self.files[filename] = {"rows": 0, "bytesIn": 0, "bytesOut": 0, "phases": {}}
+        return entry
+
+    @contextmanager
+    def phase(self, filename: str, phase: str) -> Iterator[None]:
+        """Charge the time spent in the block to ``phase`` of ``filename``."""
+        frame = self._enter()
+        try:
+            yield
+        finally:
+            self._exit(frame, filename, phase)
+
+    def timed(self, filename: str, phase: str, items: Iterable[Any]) -> Iterator[Any]:
+        """Yield from ``items``, charging the time spent producing them to ``phase``."""
+        iterator = iter(items)
+        while True:
+            frame = self._enter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit(frame, filename, phase)
+            yield item
+
+    def _enter(self) -> List[float]:
+        """Start a phase: its wall/CPU start, nested wall/CPU time and memory baseline."""
+        memory_before = 0
+        if self.trace_memory and not self._stack:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        frame = [time.perf_counter(), time.process_time(), 0.0, 0.0, memory_before]
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame: List[float], filename: str, phase: str) -> None:
+        """Charge a finished phase its own time, and its total time to the enclosing phase."""
+        wall = time.perf_counter() - frame[0]
+        cpu = time.process_time() - frame[1]
+        self._stack.pop()
+        totals = self._file(filename)["phases"].get(phase)
+        if totals is None:
+            totals = self._file(filename)["phases"][phase] = {"seconds": 0.0, "cpuSeconds": 0.0}
+        totals["seconds"] += wall - frame[2]
+        totals["cpuSeconds"] += cpu - frame[3]
+        if self._stack:
+            parent = self._stack[-1]
+            parent[2] += wall
+            parent[3] += cpu
+        elif self.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            self._peak_memory = max(self._peak_memory, peak)
+            totals["peakMemoryBytes"] = max(totals.get("peakMemoryBytes", 0), peak - frame[4])
+
+    def count(self, filename: str, rows: int, bytes_in: int, bytes_out: int) -> None:
+        """Record the rows converted and the CSV and JSON sizes of a file."""
+        entry = self._file(filename)
+        entry["rows"] += rows
+        entry["bytesIn"] += bytes_in
+        entry["bytesOut"] += bytes_out
+
+    def merge(self, files: Dict[str, Dict[str, Any]]) -> None:
+        """Add the per-file metrics of a worker process."""
+        for filename, other in files.items():
+            self.count(filename, other["rows"], other["bytesIn"], other["bytesOut"])
+            phases = self._file(filename)["phases"]
+            for phase, values in other["phases"].items():
+                totals = phases.setdefault(phase, {"seconds": 0.0, "cpuSeconds": 0.0})
+                totals["seconds"] += values["seconds"]
+                totals["cpuSeconds"] += values["cpuSeconds"]
+                if "peakMemoryBytes" in values:
+                    totals["peakMemoryBytes"] = max(totals.get("peakMemoryBytes", 0), values["peakMemoryBytes"])
+                    self._peak_memory = max(self._peak_memory, values["peakMemoryBytes"])
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-file metrics with totals and rows per second, phases in pipeline order."""
+        def rate(rows: int, seconds: float) -> float:
+            return rows / seconds if seconds > 0 else 0.0
+
+        summary = {}
+        for filename, entry in sorted(self.files.items()):
+            phases = {
+                phase: dict(entry["phases"][phase], rowsPerSecond=rate(entry["rows"], entry["phases"][phase]["seconds"]))
+                for phase in METRIC_PHASES
+                if phase in entry["phases"]
+            }
+            seconds = sum(values["seconds"] for values in phases.values())
+            summary[filename] = {
+                "rows": entry["rows"],
+                "bytesIn": entry["bytesIn"],
+                "bytesOut": entry["bytesOut"],
+                "seconds": seconds,
+                "cpuSeconds": sum(values["cpuSeconds"] for values in phases.values()),
+                "rowsPerSecond": rate(entry["rows"], seconds),
+                "phases": phases,
+            }
+        return summary
+
+    def prometheus(self, timestamp: float, errors: int, warnings: int) -> str:
+        """Format the metrics for the Prometheus node_exporter textfile collector."""
+        lines: List[str] = []
+
+        def gauge(name: str, help_text: str, samples: List[Tuple[Dict[str, str], float]]) -> None:
+            if not samples:
+                return
+            name = f"{self.PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{self._escape_label(value)}"' for key, value in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value!r}" if label_text else f"{name} {value!r}")
+
+        gauge("last_run_timestamp_seconds", "Unix time the last pipeline run finished.", [({}, timestamp)])
+        gauge("run_seconds", "Wall time of the last pipeline run.", [({}, self.run.get("seconds", 0.0))])
+        gauge("run_cpu_seconds", "CPU time of the last pipeline run.", [({}, self.run.get("cpuSeconds", 0.0))])
+        if "peakMemoryBytes" in self.run:
+            gauge("run_peak_memory_bytes", "Peak traced memory of the last pipeline run.",
+                  [({}, self.run["peakMemoryBytes"])])
+        gauge("errors", "Errors reported by the last pipeline run.", [({}, errors)])
+        gauge("warnings", "Warnings reported by the last pipeline run.", [({}, warnings)])
+
+        summary = self.summary()
+        for key, name, help_text in (
+            ("rows", "file_rows", "Records converted per file."),
+            ("bytesIn", "file_input_bytes", "CSV bytes read per file."),
+            ("bytesOut", "file_output_bytes", "JSON bytes written per file."),
+            ("rowsPerSecond", "file_rows_per_second", "Records per second of wall time per file."),
+        ):
+            gauge(name, help_text, [({"file": filename}, entry[key]) for filename, entry in summary.items()])
+        for key, name, help_text in (
+            ("seconds", "phase_seconds", "Wall time per file and phase, without nested phases."),
+            ("cpuSeconds", "phase_cpu_seconds", "CPU time per file and phase, without nested phases."),
+            ("rowsPerSecond", "phase_rows_per_second", "Records per second of wall time per file and phase."),
+            ("peakMemoryBytes", "phase_peak_memory_bytes", "Peak traced memory per file and outermost phase."),
+        ):
+            gauge(name, help_text, [
+                ({"file": filename, "phase": phase}, values[key])
+                for filename, entry in summary.items()
+                for phase, values in entry["phases"].items()
+                if key in values
+            ])
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _escape_label(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
 
 
 class CSVToJSONConverter:
     """Converts CSV files to JSON with type coercion and validation."""
 
-    def __init__(self):
-        """Initialize converter with paths."""
+    def __init__(
+        self,
+        isolated_validation: bool = False,
+        stream: bool = False,
+        jobs: int = 1,
+        chunk_size: int = 0,
+        force: bool = False,
+        row_cache_mb: int = 0,
+        clear_cache: bool = False,
+        output_profile: str = "pretty",
+        shard_landmarks: Optional[str] = None,
+        spatial_tile_size: int = 0,
+        simplify_tolerance: Optional[float] = None,
+        search_index: bool = False,
+        strict_references: bool = False,
+        check_references: bool = True,
+        tour_bundles: bool = False,
+        json_backend: str = "auto",
+        csv_reader: str = "csv",
+        columnar: Optional[str] = None,
+        columnar_dir: Optional[Path] = None,
+        max_diagnostics: int = 100,
+        diagnostics_path: Optional[Path] = None,
+        metrics_path: Optional[Path] = None,
+        prometheus_path: Optional[Path] = None,
+        trace_memory: bool = False,
+        profile_path: Optional[Path] = None,
+        hashed_filenames: bool = False,
+        keep_versions: int = 3,
+        fetch_sheets: bool = False,
+    ):
+        """
+        Initialize converter with paths.
+
+        Args:
+            isolated_validation: Validate each JSON file in a separate Python
+                subprocess instead of checking the coerced records in-process
+            stream: Convert row-at-a-time, writing each record as soon as it is
+                coerced so memory stays flat regardless of input size
+            jobs: Number of worker processes used to convert and validate
+                files concurrently (1 runs everything in this process)
+            chunk_size: When set (and ``jobs`` > 1), split each file into
+                chunks of this many rows and coerce them on ``jobs`` worker
+                processes instead of converting whole files in parallel
+            force: Rebuild every file, ignoring the build manifest
+            row_cache_mb: Size bound of the persistent coerced-row cache used
+                by ``run`` (0, the default, disables it)
+            clear_cache: Empty the coerced-row cache before running
+            output_profile: JSON output profile (see ``OUTPUT_PROFILES``)
+            shard_landmarks: Also split landmarks into per-capability or
+                per-zoom-band shards with an index (see ``SHARD_FIELDS``)
+            spatial_tile_size: Also write a grid spatial index over landmark
+                coordinates with tiles of this many pixels (0 disables it)
+            simplify_tolerance: Also write capability polygon geometry with
+                vertex sets simplified to this many screen pixels per zoom
+                level (None disables it)
+            search_index: Also write a prebuilt search index over all
+                capabilities, landmarks and organizations
+            strict_references: Report broken cross-entity references as
+                errors instead of warnings
+            check_references: Check cross-entity references after converting;
+                turning it off skips re-reading the outputs of a streamed build
+            tour_bundles: Also write a bundle per tour with only the landmarks
+                its stages reference
+            json_backend: JSON backend for parsing cells and writing outputs
+                (see ``JSON_BACKENDS``); outputs are identical with every backend
+            csv_reader: CSV reader (see ``CSV_READERS``); "mmap" reads through
+                a memory map, keeps only the columns an entity type uses and,
+                in chunked mode, lets workers parse their own byte ranges
+            columnar: Also keep each entity table in this columnar format
+                (see ``COLUMNAR_FORMATS``) and read it back instead of the
+                CSV while the CSV is unchanged (None disables it)
+            columnar_dir: Directory the columnar tables are written to, for
+                use outside the pipeline (default: ``columnar/`` in the
+                cache directory)
+            max_diagnostics: Coercion and reference warnings (or reference
+                errors) kept per file; further ones are only counted (0 keeps all)
+            diagnostics_path: Also write errors and warnings with their
+                locations to this JSON file (None disables it)
+            metrics_path: Also write per-phase, per-file timing, throughput
+                and memory metrics to this JSON file (None disables it)
+            prometheus_path: Also write those metrics to this file in the
+                Prometheus textfile format (None disables it)
+            trace_memory: Record tracemalloc peak memory per phase; also
+                prints the per-phase timing in the report
+            profile_path: Profile the run with cProfile and dump the stats
+                to this file (None disables it)
+            hashed_filenames: Also publish content-hashed copies of the
+                top-level outputs and a manifest.json mapping their logical
+                names to them (see ``AssetManifestWriter``)
+            keep_versions: Hashed versions of each output to keep, the
+                current one included
+            fetch_sheets: Download the sheet exports listed in
+                csv/sheets.json into the CSV directory before converting
+                (see ``SheetFetcher``)
+
+        Raises:
+            ValueError: If the JSON backend is unknown or not installed,
+                columnar tables are requested without pyarrow,
+                ``columnar_dir`` is set without ``columnar``,
+                ``keep_versions`` is below 1, or ``strict_references`` is
+                set without ``check_references``
+        """
         self.script_dir = Path(__file__).parent
         self.project_root = self.script_dir.parent
         self.csv_dir = self.project_root / "csv"
         self.output_dir = self.project_root / "public" / "data"
-        self.errors: List[str] = []
-        self.warnings: List[str] = []
+        # URL the front end fetches output_dir from
+        self.public_url_prefix = "/data"
+        self.cache_dir = self.project_root / ".cache" / "csv-to-json"
+        # Plain messages or Diagnostic objects (formatted when reported)
+        self.errors: List[Any] = []
+        self.warnings: List[Any] = []
+        # Diagnostics dropped over max_diagnostics, per file
+        self.suppressed_diagnostics: Dict[str, int] = {}
         # Map dimensions for CRS.Simple projection (see design/MAP-COORDINATES.md)
         self.map_height = 3072
         self.map_width = 4096
+        self.isolated_validation = isolated_validation
+        self.stream = stream
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+        self.force = force
+        self.row_cache_mb = row_cache_mb
+        self.clear_cache = clear_cache
+        self.output_profile = output_profile
+        self.shard_landmarks = shard_landmarks
+        self.spatial_tile_size = spatial_tile_size
+        self.simplify_tolerance = simplify_tolerance
+        self.search_index = search_index
+        if strict_references and not check_references:
+            raise ValueError("strict_references needs the reference check (drop --no-check-references)")
+        self.strict_references = strict_references
+        self.check_references = check_references
+        self.tour_bundles = tour_bundles
+        self.json_backend = get_json_backend(json_backend)
+        self.csv_reader = csv_reader
+        if columnar is not None and pyarrow is None:
+            raise ValueError("Columnar tables need the optional pyarrow package (pip install pyarrow)")
+        if columnar_dir is not None and columnar is None:
+            raise ValueError("columnar_dir needs a columnar format (add --columnar)")
+        self.columnar = columnar
+        self._columnar_dir = columnar_dir
+        self.max_diagnostics = max_diagnostics
+        self.diagnostics_path = diagnostics_path
+        self.metrics_path = metrics_path
+        self.prometheus_path = prometheus_path
+        self.trace_memory = trace_memory
+        self.profile_path = profile_path
+        if keep_versions < 1:
+            raise ValueError("keep_versions must be at least 1 (the current version)")
+        self.hashed_filenames = hashed_filenames
+        self.keep_versions = keep_versions
+        self.fetch_sheets = fetch_sheets
+        # Hashes of CSVs just fetched (or confirmed unchanged), so the build
+        # does not read them again to decide whether they changed
+        self._fetched_csv_hashes: Dict[str, str] = {}
+        # Created by run() when metrics are requested (see PipelineMetrics)
+        self.metrics: Optional[PipelineMetrics] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        # Byte sizes per converted entity type (json, gzip, brotli)
+        self.output_sizes: Dict[str, Dict[str, int]] = {}
+        # Opened by run() so unit-level coercion never touches the cache
+        self._row_cache: Optional[RowCache] = None
+        # Coerced records per entity type, kept for in-process validation
+        self.converted_records: Dict[str, List[Dict[str, Any]]] = {}
+        # Validation outcome per streamed entity type (None means valid)
+        self.stream_validation: Dict[str, Optional[str]] = {}
+        # Compiled coercion plans per (entity type, CSV header)
+        self._coercion_plans: Dict[Tuple[str, Tuple[Optional[str], ...]], CoercionPlan] = {}
 
     def run(self) -> int:
         """
@@ -48,32 +1063,780 @@ class CSVToJSONConverter:
         if not self._check_directories():
             return 1
 
+        self._open_row_cache()
+        self._start_instrumentation()
+        try:
+            return self._run_phases()
+        finally:
+            # No-op unless _run_phases returned before finishing it
+            self._finish_instrumentation()
+            self._close_row_cache()
+
+    def watch(self, debounce: float = WATCH_DEBOUNCE_SECONDS) -> int:
+        """
+        Build once, then rebuild whenever CSV files change until interrupted.
+
+        The converter stays alive between builds, so the row cache stays
+        open, coercion plans stay compiled and the records of unchanged files
+        stay in memory for the cross-file stages. ``csv_dir`` is polled every
+        ``WATCH_POLL_SECONDS``. A build starts once no file has changed for
+        ``debounce`` seconds. Only files whose content changed are converted
+        again (see the build manifest), and a deleted CSV's outputs and
+        records are dropped. ``force`` and ``fetch_sheets`` apply to the
+        first build only.
+
+        Args:
+            debounce: Seconds without further changes before rebuilding
+
+        Returns:
+            1 if the directories are missing, 0 when stopped with Ctrl+C
+        """
+        print("=" * 60)
+        print("CSV-to-JSON Data Pipeline (watch mode)")
+        print("=" * 60)
+
+        if not self._check_directories():
+            return 1
+
+        self._open_row_cache()
+        try:
+            snapshot = self._csv_snapshot()
+            self._rebuild()
+            self.force = False
+            self.fetch_sheets = False
+            print(f"\nWatching {self.csv_dir} for changes (Ctrl+C to stop)...")
+            sys.stdout.flush()
+            while True:
+                time.sleep(WATCH_POLL_SECONDS)
+                current = self._csv_snapshot()
+                if current == snapshot:
+                    continue
+                while True:
+                    time.sleep(debounce)
+                    latest = self._csv_snapshot()
+                    if latest == current:
+                        break
+                    current = latest
+
+                changed = sorted(name for name in current.keys() | snapshot.keys() if current.get(name) != snapshot.get(name))
+                snapshot = current
+                print(f"\nChanged: {', '.join(changed)}")
+                started = time.perf_counter()
+                self._rebuild()
+                print(f"Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms; watching for changes...")
+                sys.stdout.flush()
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+            return 0
+        finally:
+            self._close_row_cache()
+
+    # Single phases of a file's conversion, for benchmarks and other tooling
+    # that time or reuse them without running a build
+
+    @contextmanager
+    def row_cache(self) -> Iterator[Optional[RowCache]]:
+        """
+        Keep the coerced-row cache open for ``coerce_rows`` (``run`` and ``watch`` open it themselves).
+
+        Yields:
+            The open cache, or None when ``row_cache_mb`` is 0
+        """
+        self._open_row_cache()
+        try:
+            yield self._row_cache
+        finally:
+            self._close_row_cache()
+
+    def read_rows(self, csv_path: Path) -> List[Dict[str, Any]]:
+        """Read the non-empty rows of a CSV file with the configured reader."""
+        return self._read_csv(csv_path)
+
+    def coerce_rows(self, entity_type: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Type-coerce raw rows of an entity type; coercion warnings are added to ``warnings``."""
+        return self._coerce_types(entity_type, rows)
+
+    def serialize(self, records: Any, entity_type: Optional[str] = None) -> str:
+        """Serialize records as the JSON output of ``entity_type`` is written in the output profile."""
+        return self._dumps(records, entity_type)
+
+    def validate(self, entity_type: str, records: Any) -> Optional[str]:
+        """Validate coerced records; returns the first problem found, or None if they are valid."""
+        return self._validate_records(entity_type, records)
+
+    def _csv_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Modification time and size of each CSV file, by name."""
+        snapshot = {}
+        for csv_file in self.csv_dir.glob("*.csv"):
+            try:
+                stat = csv_file.stat()
+            except FileNotFoundError:
+                continue
+            snapshot[csv_file.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _rebuild(self) -> int:
+        """
+        Run one build of a long-lived converter (see ``watch``).
+
+        Errors, warnings and sizes start empty for each build. Coerced
+        records of earlier builds are kept; they match the JSON outputs
+        because a failed conversion leaves the previous output in place.
+
+        Returns:
+            0 if successful, 1 if errors occurred
+        """
+        self.errors = []
+        self.warnings = []
+        self.suppressed_diagnostics = {}
+        self.output_sizes = {}
+        self._start_instrumentation()
+        try:
+            return self._run_phases()
+        finally:
+            self._finish_instrumentation()
+            if self._row_cache is not None:
+                self._row_cache.flush()
+
+    def _run_phases(self) -> int:
+        """
+        Convert, validate and report.
+
+        Returns:
+            0 if successful, 1 if errors occurred
+        """
+        if self.fetch_sheets:
+            self._fetch_sheets()
+
         print("\nPhase 1: Converting CSV files to JSON...\n")
 
+        # Skip files whose CSV content and converter settings are unchanged
+        manifest = self._load_build_manifest()
+        csv_hashes: Dict[str, str] = {}
+        skipped_files: List[str] = []
+        csv_files: List[Path] = []
+        for csv_file in sorted(self.csv_dir.glob("*.csv")):
+            csv_hashes[csv_file.name] = self._fetched_csv_hashes.pop(csv_file.name, None) or file_sha256(csv_file)
+            if not self.force and self._is_unchanged(csv_file, csv_hashes[csv_file.name], manifest):
+                skipped_files.append(csv_file.stem)
+            else:
+                csv_files.append(csv_file)
+
+        removed_files = self._remove_deleted_outputs(manifest, csv_hashes)
+
+        # Convert and validate files on a process pool; results are replayed
+        # below in file order so the report matches a serial run
+        results: Optional[Dict[str, Dict[str, Any]]] = None
+        if self.jobs > 1 and len(csv_files) > 1 and not self.chunk_size:
+            results = self._process_files_parallel(csv_files)
+
         # Convert each CSV file
         converted_files = []
         for csv_file in sorted(self.csv_dir.glob("*.csv")):
-            if self._convert_file(csv_file):
+            if csv_file.stem in skipped_files:
+                print(f"✓ Skipped {csv_file.name} (unchanged)")
+                continue
+            if results is None:
+                converted = self._convert_file(csv_file)
+            else:
+                converted = self._replay_phase(results[csv_file.stem], "convert")
+            if converted:
                 converted_files.append(csv_file.stem)
 
-        if not converted_files:
+        if not converted_files and not skipped_files:
+            if removed_files:
+                self._update_build_manifest(manifest, csv_hashes, [])
+                self._run_cross_file_stages(removed_files)
             print("⚠️  No CSV files found to convert")
             return 1
 
-        print(f"\nPhase 2: Validating {len(converted_files)} JSON file(s)...\n")
-
         # Validate JSON files
         valid_files = []
+        if converted_files:
+            print(f"\nPhase 2: Validating {len(converted_files)} JSON file(s)...\n")
+
         for filename in converted_files:
             json_path = self.output_dir / f"{filename}.json"
-            if self._validate_json_file(json_path):
+            if results is None:
+                valid = self._validate_json_file(json_path, self.converted_records.get(filename))
+            else:
+                valid = self._replay_phase(results[filename], "validate")
+            if valid:
                 valid_files.append(filename)
 
+        self._update_build_manifest(manifest, csv_hashes, valid_files)
+
+        self._run_cross_file_stages(converted_files + removed_files)
+
+        self._publish_hashed_filenames()
+
+        if self.diagnostics_path is not None:
+            self._write_diagnostics_report()
+
+        self._finish_instrumentation()
+
         # Report results
-        self._report_results(converted_files, valid_files)
+        self._report_results(converted_files, valid_files, skipped_files)
 
         return 0 if not self.errors else 1
 
+    def _remove_deleted_outputs(self, manifest: Dict[str, Any], csv_hashes: Dict[str, str]) -> List[str]:
+        """
+        Remove the outputs of CSV files that were built before and are gone now.
+
+        Drops the JSON output, its precompressed copies and derived outputs,
+        the cached reference ids and columnar table, and the records kept in
+        memory (in watch mode), so no stale data is served or checked against.
+        Only files listed in the build manifest are touched.
+
+        Args:
+            manifest: Build manifest from the previous run
+            csv_hashes: SHA-256 of every CSV file in this run, by file name
+
+        Returns:
+            Entity types whose outputs were removed
+        """
+        removed = []
+        for name in sorted(set(manifest["files"]) - set(csv_hashes)):
+            entity_type = Path(name).stem
+            self.converted_records.pop(entity_type, None)
+            self.stream_validation.pop(entity_type, None)
+            remove_output(self.output_dir / f"{entity_type}.json")
+            if entity_type == "landmarks":
+                LandmarkShardWriter.remove(self.output_dir)
+                SpatialIndexWriter.remove(self.output_dir)
+            if entity_type == "capabilities":
+                CapabilityGeometryWriter.remove(self.output_dir)
+            ReferenceCollector.path(self.cache_dir, entity_type).unlink(missing_ok=True)
+            if self.columnar and entity_type in ENTITY_SPECS:
+                store = ColumnarStore(self.columnar_dir, self.columnar, ENTITY_SPECS)
+                store.path(entity_type).unlink(missing_ok=True)
+                store.info_path(entity_type).unlink(missing_ok=True)
+            print(f"✓ Removed {entity_type}.json ({name} was deleted)")
+            removed.append(entity_type)
+        return removed
+
+    def _fetch_sheets(self) -> None:
+        """
+        Download the sheet exports listed in csv/sheets.json (see ``SheetFetcher``).
+
+        A failed download is an error, but the build goes on with the local
+        copy of that CSV if there is one.
+        """
+        sources_path = self.csv_dir / SHEET_SOURCES_FILENAME
+        try:
+            sources = SheetFetcher.load_sources(sources_path)
+        except ValueError as e:
+            self.errors.append(str(e))
+            print(f"❌ {e}")
+            return
+
+        print(f"\nFetching {len(sources)} sheet export(s)...\n")
+        fetcher = SheetFetcher(self.csv_dir, self.cache_dir, user_agent=f"csv-to-json/{CONVERTER_VERSION}")
+        started = time.perf_counter()
+        results = fetcher.fetch(sources)
+        elapsed = time.perf_counter() - started
+
+        downloaded = 0
+        for name, result in results.items():
+            downloaded += result["bytes"]
+            if result["status"] == "failed":
+                self.errors.append(f"{name}: Could not fetch sheet export: {result['error']}")
+                print(f"❌ Failed to fetch {name}: {result['error']}")
+                continue
+            self._fetched_csv_hashes[name] = result["sha256"]
+            if result["status"] == "fetched":
+                print(f"✓ Fetched {name} ({result['bytes'] / 1024:.1f} KB)")
+            elif result["status"] == "unchanged":
+                print(f"✓ Fetched {name} (unchanged)")
+            else:
+                print(f"✓ Not modified: {name}")
+        print(
+            f"\n✓ Checked {len(results)} sheet export(s) in {elapsed * 1000:.0f} ms "
+            f"({downloaded / 1024:.1f} KB downloaded over {fetcher.pool.opened} connection(s))"
+        )
+
+        try:
+            fetcher.save_state()
+        except OSError as e:
+            self.warnings.append(f"Could not write {fetcher.state_path.name}: {e}")
+
+    def _run_cross_file_stages(self, converted_files: List[str]) -> None:
+        """
+        Build outputs that combine several entity types.
+
+        Stages only run when one of their inputs was rebuilt in this run or
+        their output is missing; outputs of disabled stages are removed.
+
+        Args:
+            converted_files: Entity types converted in this run
+        """
+        changed = set(converted_files)
+        search_index_path = self.output_dir / SearchIndexBuilder.FILENAME
+        if not self.search_index:
+            remove_output(search_index_path)
+        if not self.tour_bundles:
+            TourBundleWriter.remove(self.output_dir)
+
+        check_references = self.check_references and bool(changed & set(self._reference_entity_types()))
+        build_search_index = self.search_index and (
+            not search_index_path.exists() or bool(changed & set(SEARCH_ENTITIES))
+        )
+        build_tour_bundles = self.tour_bundles and (
+            not (self.output_dir / TourBundleWriter.DIRNAME / "index.json").exists()
+            or bool(changed & {"tours", "landmarks"})
+        )
+        if not (check_references or build_search_index or build_tour_bundles):
+            return
+
+        print("\nPhase 3: Running cross-file stages...\n")
+        if check_references:
+            self._check_references()
+        if build_search_index:
+            self._build_search_index(search_index_path)
+        if build_tour_bundles:
+            self._build_tour_bundles()
+
+    def _publish_hashed_filenames(self) -> None:
+        """
+        Update the content-hashed outputs and manifest.json, or remove them when turned off.
+
+        The manifest is left as it is while the build has errors, so it
+        never points at outputs that failed validation.
+        """
+        if not self.hashed_filenames:
+            AssetManifestWriter.remove(self.output_dir)
+            return
+        if self.errors:
+            self.warnings.append(f"Not updating {AssetManifestWriter.FILENAME}: the build has errors")
+            return
+        try:
+            summary = AssetManifestWriter(self, self.keep_versions).write()
+            print(f"\n✓ {summary}")
+        except OSError as e:
+            self.errors.append(f"{AssetManifestWriter.FILENAME}: {str(e)}")
+            print(f"\n❌ Failed to publish hashed filenames: {str(e)}")
+
+    @staticmethod
+    def _reference_entity_types() -> List[str]:
+        """Entity types that hold or are the target of cross-entity references."""
+        return list(dict.fromkeys(
+            entity_type
+            for source_type, _, target_type in REFERENCE_FIELDS
+            for entity_type in (source_type, target_type)
+        ))
+
+    def _check_references(self) -> None:
+        """
+        Check that every cross-entity reference points to an existing record.
+
+        The check is skipped with a warning when an output it needs cannot
+        be read back (for example a corrupt JSON file from an earlier build).
+        """
+        try:
+            records = {
+                entity_type: self._reference_records(entity_type) for entity_type in self._reference_entity_types()
+            }
+        except Exception as e:
+            self.warnings.append(f"Skipped the reference check: {str(e)}")
+            print(f"⚠️  Skipped the reference check: {str(e)}")
+            return
+        checker = ReferenceChecker(records, max_problems=self.max_diagnostics)
+        problems = checker.check()
+        if not problems:
+            print(f"✓ Checked {checker.references} reference(s)")
+            return
+
+        if self.strict_references:
+            for problem in problems:
+                problem.severity = "error"
+        (self.errors if self.strict_references else self.warnings).extend(problems)
+        for filename, count in checker.suppressed.items():
+            self._suppress_diagnostics(filename, count)
+        total = len(problems) + sum(checker.suppressed.values())
+        marker = "❌" if self.strict_references else "⚠️ "
+        print(f"{marker} Found {total} reference problem(s) in {checker.references} reference(s)")
+
+    def _reference_records(self, entity_type: str) -> List[Dict[str, Any]]:
+        """
+        Return the ids and reference fields of an entity type for the reference check.
+
+        Uses the records still in memory from this run, then the projection
+        written by ``ReferenceCollector``. Only batch builds fall back to
+        reading the whole output; streamed builds never hold a full output
+        in memory.
+
+        Raises:
+            ValueError: In a streamed build, if the output has no current projection
+        """
+        if entity_type in self.converted_records:
+            return self.converted_records[entity_type]
+        if not (self.output_dir / f"{entity_type}.json").exists():
+            return []
+        records = ReferenceCollector.load(self, entity_type)
+        if records is not None:
+            return records
+        if self.stream:
+            raise ValueError(f"{entity_type}.json has no reference index (rebuild it with --force)")
+        return self._load_records(entity_type)
+
+    def _build_search_index(self, search_index_path: Path) -> None:
+        """Write the prebuilt search index over all searchable entity types."""
+        try:
+            builder = SearchIndexBuilder()
+            for entity_type in SEARCH_ENTITIES:
+                for record in self._load_records(entity_type):
+                    builder.add(entity_type, record)
+            index = builder.build()
+            self._write_output(search_index_path, index)
+            print(f"✓ Wrote search index ({len(index['docs'])} docs, {len(index['terms'])} terms)")
+        except Exception as e:
+            self.errors.append(f"{search_index_path.name}: {str(e)}")
+            print(f"❌ Failed to build {search_index_path.name}: {str(e)}")
+
+    def _build_tour_bundles(self) -> None:
+        """Write the per-tour landmark bundles."""
+        try:
+            summary = TourBundleWriter(self).write(self._load_records("tours"), self._load_records("landmarks"))
+            print(f"✓ {summary}")
+        except Exception as e:
+            self.errors.append(f"{TourBundleWriter.DIRNAME}/: {str(e)}")
+            print(f"❌ Failed to build tour bundles: {str(e)}")
+
+    def _load_records(self, entity_type: str) -> List[Dict[str, Any]]:
+        """
+        Return the records of an entity type for cross-file stages.
+
+        Uses the records coerced in this run when they are still in memory,
+        otherwise reads the current JSON output (empty if there is none).
+
+        Args:
+            entity_type: Type of entity
+
+        Returns:
+            Coerced records
+        """
+        if entity_type in self.converted_records:
+            return self.converted_records[entity_type]
+
+        json_path = self.output_dir / f"{entity_type}.json"
+        if not json_path.exists():
+            return []
+        with open(json_path, "r", encoding="utf-8") as f:
+            return self.json_backend.loads(f.read())
+
+    def _write_output(self, output_path: Path, data: Any) -> None:
+        """Atomically write a derived JSON output in the current profile."""
+        self._replace_file(output_path, self._dumps(data))
+        self._compress_output(output_path)
+
+    @staticmethod
+    def _replace_file(output_path: Path, text: str) -> None:
+        """
+        Write ``text`` over ``output_path`` atomically (see ``atomic_write``).
+
+        Serialize before calling, so a failed dump never truncates the
+        previous output.
+        """
+        with atomic_write(output_path) as f:
+            f.write(text)
+
+    @property
+    def columnar_dir(self) -> Path:
+        """Location of the columnar entity tables (see ``columnar_dir`` in ``__init__``)."""
+        return self._columnar_dir if self._columnar_dir is not None else self.cache_dir / "columnar"
+
+    def _columnar_fingerprint(self, csv_path: Path) -> str:
+        """
+        Identify the CSV content and converter settings a columnar table was written from.
+
+        Covers the build fingerprint, the map size and ``max_diagnostics``
+        (which caps the warnings stored with the table), so a table is never
+        replayed under settings that would have produced different output.
+        """
+        settings = dict(
+            self._build_fingerprint(),
+            mapSize=[self.map_height, self.map_width],
+            maxDiagnostics=self.max_diagnostics,
+        )
+        return f"{json.dumps(settings, sort_keys=True)}:{file_sha256(csv_path)}"
+
+    @property
+    def row_cache_path(self) -> Path:
+        """Location of the persistent coerced-row cache."""
+        return self.cache_dir / "rows.sqlite3"
+
+    def _open_row_cache(self) -> None:
+        """Open the coerced-row cache (clearing it first if requested)."""
+        if self.clear_cache:
+            RowCache(self.row_cache_path, 0).clear()
+            print(f"✓ Cleared row cache: {self.row_cache_path}")
+            self.clear_cache = False
+
+        if self.row_cache_mb > 0:
+            self._row_cache = RowCache(self.row_cache_path, self.row_cache_mb * 1024 * 1024, self.json_backend)
+
+    def _close_row_cache(self) -> None:
+        """Flush and close the coerced-row cache."""
+        if self._row_cache is not None:
+            self._row_cache.close()
+            self._row_cache = None
+
+    @property
+    def build_manifest_path(self) -> Path:
+        """Location of the incremental build manifest."""
+        return self.cache_dir / "build-manifest.json"
+
+    def _build_fingerprint(self) -> Dict[str, Any]:
+        """Versions and settings that affect output; a change forces a rebuild."""
+        return {
+            "converterVersion": CONVERTER_VERSION,
+            "schemaVersion": SCHEMA_VERSION,
+            "outputProfile": self.output_profile,
+            "shardLandmarks": self.shard_landmarks,
+            "spatialTileSize": self.spatial_tile_size,
+            "simplifyTolerance": self.simplify_tolerance,
+        }
+
+    def _load_build_manifest(self) -> Dict[str, Any]:
+        """
+        Load the build manifest from the previous run.
+
+        Returns:
+            Manifest with a "files" mapping of CSV name to build entry
+            (empty if missing or unreadable)
+        """
+        try:
+            with open(self.build_manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if isinstance(manifest, dict) and isinstance(manifest.get("files"), dict):
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {"files": {}}
+
+    def _is_unchanged(self, csv_path: Path, csv_hash: str, manifest: Dict[str, Any]) -> bool:
+        """
+        Check whether a CSV file can be skipped.
+
+        A file is unchanged when its content hash and the build fingerprint
+        match the manifest entry, and its output still exists untouched.
+
+        Args:
+            csv_path: Path to the CSV file
+            csv_hash: SHA-256 of the CSV file content
+            manifest: Build manifest from the previous run
+
+        Returns:
+            True if the file does not need to be rebuilt
+        """
+        entry = manifest["files"].get(csv_path.name)
+        if not isinstance(entry, dict) or entry.get("csvSha256") != csv_hash:
+            return False
+
+        if any(entry.get(key) != value for key, value in self._build_fingerprint().items()):
+            return False
+
+        output_path = self.output_dir / f"{csv_path.stem}.json"
+        expected = [output_path, *self._compressed_paths(output_path)]
+        if csv_path.stem == "landmarks" and self.shard_landmarks:
+            expected.append(self.output_dir / "landmarks" / "index.json")
+        if csv_path.stem == "landmarks" and self.spatial_tile_size:
+            expected.append(self.output_dir / SpatialIndexWriter.FILENAME)
+        if csv_path.stem == "capabilities" and self.simplify_tolerance is not None:
+            expected.append(self.output_dir / CapabilityGeometryWriter.FILENAME)
+        if self.check_references and csv_path.stem in self._reference_entity_types():
+            expected.append(ReferenceCollector.path(self.cache_dir, csv_path.stem))
+        if self.columnar and csv_path.stem in ENTITY_SPECS:
+            store = ColumnarStore(self.columnar_dir, self.columnar, ENTITY_SPECS)
+            expected.extend([store.path(csv_path.stem), store.info_path(csv_path.stem)])
+        if not all(path.exists() for path in expected):
+            return False
+        return entry.get("outputSha256") == file_sha256(output_path)
+
+    def _update_build_manifest(
+        self,
+        manifest: Dict[str, Any],
+        csv_hashes: Dict[str, str],
+        valid_files: List[str],
+    ) -> None:
+        """
+        Record freshly built files and drop entries for failed or removed CSVs.
+
+        Args:
+            manifest: Build manifest from the previous run (updated in place)
+            csv_hashes: SHA-256 of every CSV file in this run, by file name
+            valid_files: Entity types converted and validated in this run
+        """
+        files = manifest["files"]
+        for name in list(files):
+            if name not in csv_hashes:
+                del files[name]
+
+        for name, csv_hash in csv_hashes.items():
+            entity_type = Path(name).stem
+            output_path = self.output_dir / f"{entity_type}.json"
+            if entity_type in valid_files:
+                files[name] = {
+                    "csvSha256": csv_hash,
+                    **self._build_fingerprint(),
+                    "outputSha256": file_sha256(output_path),
+                }
+            elif files.get(name, {}).get("csvSha256") != csv_hash:
+                files.pop(name, None)
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with atomic_write(self.build_manifest_path) as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+        except OSError as e:
+            self.warnings.append(f"Could not write build manifest: {e}")
+
+    def _write_diagnostics_report(self) -> None:
+        """
+        Write errors and warnings as JSON for CI (see ``diagnostics_path``).
+
+        Each entry has ``severity``, ``file``, ``row``, ``entity``, ``field``,
+        ``vertex``, ``message`` and the report line as ``text``; location
+        fields are null where unknown, including for plain-text messages.
+        """
+        def entries(items: List[Any], severity: str) -> List[Dict[str, Any]]:
+            return [
+                dict(item.to_dict(), text=str(item)) if isinstance(item, Diagnostic)
+                else dict(Diagnostic(str(item), severity=severity).to_dict(), text=str(item))
+                for item in items
+            ]
+
+        report = {
+            "converterVersion": CONVERTER_VERSION,
+            "errors": entries(self.errors, "error"),
+            "warnings": entries(self.warnings, "warning"),
+            "suppressed": dict(sorted(self.suppressed_diagnostics.items())),
+        }
+        try:
+            self.diagnostics_path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(self.diagnostics_path) as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            print(f"✓ Wrote diagnostics report: {self.diagnostics_path}")
+        except OSError as e:
+            self.warnings.append(f"Could not write diagnostics report: {e}")
+
+    def _start_instrumentation(self) -> None:
+        """Start collecting metrics and profiling when requested."""
+        if self.metrics_path is not None or self.prometheus_path is not None or self.trace_memory:
+            self.metrics = PipelineMetrics(self.trace_memory)
+            self.metrics.start()
+        if self.profile_path is not None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def _finish_instrumentation(self) -> None:
+        """Stop profiling and metrics collection and write their files."""
+        if self._profiler is not None:
+            self._profiler.disable()
+            try:
+                self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+                self._profiler.dump_stats(str(self.profile_path))
+                print(f"✓ Wrote profile: {self.profile_path} (python -m pstats {self.profile_path})")
+            except OSError as e:
+                self.warnings.append(f"Could not write profile: {e}")
+            self._profiler = None
+
+        if self.metrics is None or not self.metrics.running:
+            return
+        self.metrics.stop()
+        finished = time.time()
+        outputs = []
+        if self.metrics_path is not None:
+            outputs.append((self.metrics_path, "metrics", lambda: json.dumps(self._metrics_report(finished), indent=2)))
+        if self.prometheus_path is not None:
+            outputs.append((
+                self.prometheus_path,
+                "Prometheus metrics",
+                lambda: self.metrics.prometheus(finished, len(self.errors), len(self.warnings)),
+            ))
+        for path, label, render in outputs:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Serialize first and replace atomically so collectors never read a partial file
+                self._replace_file(path, render())
+                print(f"✓ Wrote {label}: {path}")
+            except OSError as e:
+                self.warnings.append(f"Could not write {label}: {e}")
+
+    def _metrics_report(self, finished: float) -> Dict[str, Any]:
+        """The metrics JSON document (see ``metrics_path``)."""
+        return {
+            "converterVersion": CONVERTER_VERSION,
+            "timestamp": finished,
+            "settings": {
+                "jobs": self.jobs,
+                "chunkSize": self.chunk_size,
+                "stream": self.stream,
+                "csvReader": self.csv_reader,
+                "jsonBackend": self.json_backend.name,
+                "outputProfile": self.output_profile,
+                "traceMemory": self.trace_memory,
+            },
+            "run": dict(self.metrics.run, errors=len(self.errors), warnings=len(self.warnings)),
+            "files": self.metrics.summary(),
+        }
+
+    def _process_files_parallel(self, csv_files: List[Path]) -> Dict[str, Dict[str, Any]]:
+        """
+        Convert and validate CSV files concurrently on a process pool.
+
+        Args:
+            csv_files: CSV files to process
+
+        Returns:
+            Per-file results keyed by entity type (see ``_process_file``)
+        """
+        workers = min(self.jobs, len(csv_files))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_process_file, repeat(self._worker_copy()), csv_files)
+            return {csv_file.stem: result for csv_file, result in zip(csv_files, results)}
+
+    def _worker_copy(self) -> "CSVToJSONConverter":
+        """Return a copy with this converter's settings but no accumulated state."""
+        worker = copy.copy(self)
+        worker.errors = []
+        worker.warnings = []
+        worker.suppressed_diagnostics = {}
+        worker.converted_records = {}
+        worker.stream_validation = {}
+        worker.output_sizes = {}
+        worker._row_cache = None
+        worker._coercion_plans = {}
+        worker.metrics = None if self.metrics is None else PipelineMetrics(self.trace_memory)
+        worker._profiler = None
+        return worker
+
+    def _replay_phase(self, result: Dict[str, Any], phase: str) -> bool:
+        """
+        Merge one phase of a worker result into this converter.
+
+        Output, errors and warnings are replayed in the order a serial run
+        would have produced them.
+
+        Args:
+            result: Worker result from ``_process_file``
+            phase: "convert" or "validate"
+
+        Returns:
+            Whether the phase succeeded for that file
+        """
+        sys.stdout.write(result[f"{phase}_output"])
+        self.errors.extend(result[f"{phase}_errors"])
+        self.warnings.extend(result[f"{phase}_warnings"])
+        if phase == "convert":
+            self.output_sizes.update(result["output_sizes"])
+            for filename, count in result["suppressed_diagnostics"].items():
+                self._suppress_diagnostics(filename, count)
+            if self.metrics is not None and result["metrics"] is not None:
+                self.metrics.merge(result["metrics"])
+        return result[f"{phase}_ok"]
+
     def _check_directories(self) -> bool:
         """
         Check that required directories exist.
@@ -105,21 +1868,33 @@ class CSVToJSONConverter:
         Returns:
             True if conversion succeeded, False otherwise
         """
+        if self.stream:
+            return self._convert_file_streaming(csv_path)
+
         try:
             # Read CSV
-            data = self._read_csv(csv_path)
+            entity_type = csv_path.stem
+            with self._phase(csv_path.name, "read"):
+                self._check_columns(csv_path, entity_type)
+            with self._phase(csv_path.name, "coerce"):
+                data = list(self._iter_records(entity_type, csv_path))
             if not data:
                 self.warnings.append(f"{csv_path.name}: No data rows found")
                 return False
 
-            # Coerce types
-            entity_type = csv_path.stem
-            data = self._coerce_types(entity_type, data)
-
             # Write JSON
             output_path = self.output_dir / f"{entity_type}.json"
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            with self._phase(csv_path.name, "write"):
+                self._replace_file(output_path, self._dumps(data, entity_type))
+                self._write_compressed_copies(entity_type, output_path)
+                self.converted_records[entity_type] = data
+
+                writers = self._open_output_writers(entity_type)
+                for writer in writers:
+                    for record in data:
+                        writer.add(record)
+                self._finish_output_writers(writers)
+            self._count_file_metrics(csv_path, output_path, len(data))
 
             print(f"✓ Converted {csv_path.name} ({len(data)} records)")
             return True
@@ -129,6 +1904,213 @@ class CSVToJSONConverter:
             print(f"❌ Failed to convert {csv_path.name}: {str(e)}")
             return False
 
+    def _convert_file_streaming(self, csv_path: Path) -> bool:
+        """
+        Convert a single CSV file to JSON one row at a time.
+
+        Each row is coerced and validated as it is read and written straight
+        to a temporary file, which replaces the output only on success. The
+        output is byte-identical to the batch path.
+
+        Args:
+            csv_path: Path to the CSV file
+
+        Returns:
+            True if conversion succeeded, False otherwise
+        """
+        entity_type = csv_path.stem
+        output_path = self.output_dir / f"{entity_type}.json"
+        required_fields = REQUIRED_FIELDS.get(entity_type)
+        validation_error: Optional[str] = (
+            None if required_fields is not None else f"Unknown entity type: {entity_type}"
+        )
+
+        writers: List[Any] = []
+        try:
+            count = 0
+            with self._phase(csv_path.name, "read"):
+                self._check_columns(csv_path, entity_type)
+            writers = self._open_output_writers(entity_type)
+            with atomic_path(output_path) as tmp_path:
+                with open(tmp_path, "w", encoding="utf-8") as out, self._phase(csv_path.name, "coerce"):
+                    for i, record in enumerate(self._iter_records(entity_type, csv_path)):
+                        if validation_error is None:
+                            with self._phase(csv_path.name, "validate"):
+                                validation_error = self._validate_record(required_fields, i, record)
+
+                        with self._phase(csv_path.name, "write"):
+                            self._write_array_element(out, record, count, entity_type)
+                            for writer in writers:
+                                writer.add(record)
+                        count += 1
+
+                    out.write(("\n]" if self.output_profile == "pretty" else "]") if count else "[]")
+                if not count:
+                    # Keep the previous output
+                    tmp_path.unlink()
+
+            if not count:
+                for writer in writers:
+                    writer.abort()
+                self.warnings.append(f"{csv_path.name}: No data rows found")
+                return False
+
+            with self._phase(csv_path.name, "write"):
+                self._write_compressed_copies(entity_type, output_path)
+            self.stream_validation[entity_type] = validation_error
+
+            print(f"✓ Converted {csv_path.name} ({count} records)")
+            with self._phase(csv_path.name, "write"):
+                self._finish_output_writers(writers)
+            self._count_file_metrics(csv_path, output_path, count)
+            return True
+
+        except Exception as e:
+            for writer in writers:
+                writer.abort()
+            self.errors.append(f"{csv_path.name}: {str(e)}")
+            print(f"❌ Failed to convert {csv_path.name}: {str(e)}")
+            return False
+
+    def _phase(self, filename: str, phase: str) -> ContextManager[None]:
+        """Time a phase of a file when metrics are collected (see ``PipelineMetrics``)."""
+        return nullcontext() if self.metrics is None else self.metrics.phase(filename, phase)
+
+    def _count_file_metrics(self, csv_path: Path, output_path: Path, rows: int) -> None:
+        """Record the rows and CSV/JSON sizes of a converted file when metrics are collected."""
+        if self.metrics is not None:
+            self.metrics.count(csv_path.name, rows, csv_path.stat().st_size, output_path.stat().st_size)
+
+    def _dumps(self, data: Any, entity_type: Optional[str] = None) -> str:
+        """Serialize a JSON output in the output profile."""
+        if self._hand_edited(entity_type):
+            return format_hand_edited_json(data)
+        return self.json_backend.dumps(data, compact=self.output_profile == "compact")
+
+    def _write_array_element(self, out: TextIO, record: Any, index: int, entity_type: Optional[str] = None) -> None:
+        """Write one element of a JSON array formatted like a whole-document dump."""
+        if self.output_profile == "compact":
+            out.write("[" if index == 0 else ",")
+            out.write(self.json_backend.dumps(record, compact=True))
+            return
+
+        out.write("[\n  " if index == 0 else ",\n  ")
+        if self._hand_edited(entity_type):
+            out.write(format_hand_edited_json(record, 2))
+        else:
+            out.write(self.json_backend.dumps(record).replace("\n", "\n  "))
+
+    def _hand_edited(self, entity_type: Optional[str]) -> bool:
+        """Whether the pretty output of ``entity_type`` keeps its hand-edited layout."""
+        spec = ENTITY_SPECS.get(entity_type) if entity_type else None
+        return spec is not None and spec.hand_edited and self.output_profile == "pretty"
+
+    def _compressed_paths(self, output_path: Path) -> List[Path]:
+        """Precompressed copies expected next to ``output_path`` for the profile."""
+        if self.output_profile != "compact":
+            return []
+        paths = [output_path.with_name(f"{output_path.name}.gz")]
+        if brotli is not None:
+            paths.append(output_path.with_name(f"{output_path.name}.br"))
+        return paths
+
+    def _write_compressed_copies(self, entity_type: str, output_path: Path) -> None:
+        """
+        Write .json.gz/.json.br copies of an output file and record its sizes.
+
+        In the pretty profile, stale precompressed copies are removed instead
+        so a static host never serves them in place of the fresh JSON.
+
+        Args:
+            entity_type: Type of entity
+            output_path: Freshly written JSON file
+        """
+        if self.output_profile == "compact" and brotli is None:
+            self.warnings.append(f"{output_path.name}: brotli is not installed, skipped .br copy")
+        self.output_sizes[entity_type] = self._compress_output(output_path)
+
+    def _compress_output(self, output_path: Path) -> Dict[str, int]:
+        """
+        Write (or, in the pretty profile, remove) precompressed copies of a file.
+
+        Args:
+            output_path: Freshly written JSON file
+
+        Returns:
+            Byte sizes of the JSON file and of each compressed copy
+        """
+        sizes = {"json": output_path.stat().st_size}
+        gz_path = output_path.with_name(f"{output_path.name}.gz")
+        br_path = output_path.with_name(f"{output_path.name}.br")
+
+        stale = [gz_path, br_path] if self.output_profile != "compact" else [] if brotli else [br_path]
+        for path in stale:
+            if path.exists():
+                path.unlink()
+        if self.output_profile != "compact":
+            return sizes
+
+        compressor = brotli.Compressor(quality=11) if brotli is not None else None
+        with open(output_path, "rb") as src, atomic_write(gz_path, "wb") as gz_raw, \
+                (atomic_write(br_path, "wb") if compressor is not None else nullcontext()) as br_out:
+            # mtime=0 keeps the gzip bytes reproducible across rebuilds
+            with gzip.GzipFile(filename="", mode="wb", fileobj=gz_raw, compresslevel=9, mtime=0) as gz:
+                for block in iter(lambda: src.read(1 << 20), b""):
+                    gz.write(block)
+                    if br_out is not None:
+                        br_out.write(compressor.process(block))
+                if br_out is not None:
+                    br_out.write(compressor.finish())
+
+        sizes["gzip"] = gz_path.stat().st_size
+        if compressor is not None:
+            sizes["brotli"] = br_path.stat().st_size
+
+        return sizes
+
+    def _open_output_writers(self, entity_type: str) -> List[Any]:
+        """
+        Start the derived outputs enabled for an entity type.
+
+        Each writer receives every coerced record through ``add`` and is
+        published with ``finish`` (or discarded with ``abort``). Outputs
+        that are turned off are removed so stale files are never served.
+
+        Args:
+            entity_type: Type of entity being converted
+
+        Returns:
+            Writers for the enabled derived outputs
+        """
+        writers: List[Any] = []
+        if self.check_references and entity_type in self._reference_entity_types():
+            writers.append(ReferenceCollector(self, entity_type))
+        if entity_type == "capabilities":
+            if self.simplify_tolerance is not None:
+                writers.append(CapabilityGeometryWriter(self, self.simplify_tolerance))
+            else:
+                CapabilityGeometryWriter.remove(self.output_dir)
+
+        if entity_type != "landmarks":
+            return writers
+
+        if self.shard_landmarks:
+            writers.append(LandmarkShardWriter(self, self.shard_landmarks))
+        else:
+            LandmarkShardWriter.remove(self.output_dir)
+
+        if self.spatial_tile_size:
+            writers.append(SpatialIndexWriter(self, self.spatial_tile_size))
+        else:
+            SpatialIndexWriter.remove(self.output_dir)
+
+        return writers
+
+    def _finish_output_writers(self, writers: List[Any]) -> None:
+        """Publish derived outputs and print their summary lines."""
+        for writer in writers:
+            print(f"✓ {writer.finish()}")
+
     def _read_csv(self, csv_path: Path) -> List[Dict[str, Any]]:
         """
         Read CSV file and return list of dictionaries.
@@ -139,7 +2121,23 @@ class CSVToJSONConverter:
         Returns:
             List of dictionaries representing rows
         """
-        data: List[Dict[str, Any]] = []
+        return list(self._iter_csv(csv_path))
+
+    def _iter_csv(self, csv_path: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Yield non-empty rows of a CSV file one at a time.
+
+        Args:
+            csv_path: Path to the CSV file
+
+        Yields:
+            Dictionaries representing rows
+        """
+        if self.csv_reader == "mmap":
+            with MappedCSVReader(csv_path, self._csv_columns(csv_path.stem)) as reader:
+                yield from reader.rows()
+            return
+
         with open(csv_path, "r", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             if reader.fieldnames is None:
@@ -148,126 +2146,456 @@ class CSVToJSONConverter:
             for row in reader:
                 # Skip empty rows
                 if any(v.strip() for v in row.values() if v):
-                    data.append(row)
+                    yield row
+
+    def _check_columns(self, csv_path: Path, entity_type: str) -> None:
+        """
+        Compile the coercion plan for a CSV header and warn about its columns.
 
-        return data
+        Header columns no field uses are ignored, and fields without a column
+        are filled from their default, so both only produce warnings.
+
+        Args:
+            csv_path: Path to the CSV file
+            entity_type: Type of entity
+        """
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            header = next(csv.reader(f), None)
+        if header is None:
+            return
+
+        plan = self._coercion_plan(entity_type, header)
+        if plan is None:
+            return
+        if plan.unknown:
+            self.warnings.append(f"{csv_path.name}: Ignoring unknown column(s): {', '.join(plan.unknown)}")
+        if plan.missing:
+            self.warnings.append(f"{csv_path.name}: Missing column(s), using defaults: {', '.join(plan.missing)}")
+
+    @staticmethod
+    def _csv_columns(entity_type: str) -> Optional[List[str]]:
+        """Columns the coercion of an entity type reads (None for unregistered types)."""
+        spec = ENTITY_SPECS.get(entity_type)
+        return None if spec is None else [column.name for column in spec.columns]
+
+    def _coercion_plan(self, entity_type: str, header: Iterable[Optional[str]]) -> Optional[CoercionPlan]:
+        """
+        Return the compiled coercion plan for a header (None for unregistered entity types).
+
+        Args:
+            entity_type: Type of entity
+            header: CSV column names (a row dict's keys work too)
+        """
+        if entity_type not in ENTITY_SPECS:
+            return None
+        key = (entity_type, tuple(header))
+        plan = self._coercion_plans.get(key)
+        if plan is None:
+            plan = self._coercion_plans[key] = CoercionPlan(self, entity_type, key[1])
+        return plan
 
     def _coerce_types(self, entity_type: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Type coerce data based on entity type.
 
         Args:
-            entity_type: Type of entity (capabilities, landmarks, organizations)
+            entity_type: Type of entity (capabilities, landmarks, organizations, tours)
             data: List of raw data dictionaries
 
         Returns:
             List of type-coerced dictionaries
         """
-        coerced: List[Dict[str, Any]] = []
-        for i, record in enumerate(data):
+        return list(self._iter_coerced(entity_type, data))
+
+    def _iter_records(self, entity_type: str, csv_path: Path) -> Iterator[Mapping]:
+        """
+        Yield the type-coerced records of a CSV file in order.
+
+        With ``columnar`` set, records come from the entity's columnar table
+        while it was written from the same CSV content (replaying the
+        coercion warnings of that run); otherwise the CSV is read and the
+        table rewritten batch by batch, published once every record was
+        produced. Coercion warnings
+        are tagged with the file and capped at ``max_diagnostics``.
+
+        Args:
+            entity_type: Type of entity
+            csv_path: Path to the CSV file
+
+        Yields:
+            Type-coerced records
+        """
+        writer: Optional[ColumnarStore.Writer] = None
+        if self.columnar and entity_type in ENTITY_SPECS:
+            store = ColumnarStore(self.columnar_dir, self.columnar, ENTITY_SPECS)
+            fingerprint = self._columnar_fingerprint(csv_path)
+            with self._phase(csv_path.name, "read"):
+                cached = store.load(entity_type, fingerprint)
+            if cached is not None:
+                records, warnings, suppressed = cached
+                self.warnings.extend(warnings)
+                self._suppress_diagnostics(csv_path.name, suppressed)
+                yield from records
+                return
+            writer = store.writer(entity_type, fingerprint)
+
+        warnings_before = seen = len(self.warnings)
+        suppressed_before = self.suppressed_diagnostics.get(csv_path.name, 0)
+        count = 0
+        try:
+            for record in self._read_records(entity_type, csv_path):
+                if len(self.warnings) != seen:
+                    seen = self._collect_diagnostics(csv_path.name, warnings_before, seen)
+                if writer is not None:
+                    try:
+                        writer.add(record)
+                    except (OSError, ValueError, TypeError, OverflowError) as e:
+                        self.warnings.append(f"{csv_path.name}: Not writing columnar table: {e}")
+                        writer.abort()
+                        writer = None
+                count += 1
+                yield record
+
+            if writer is not None and count:
+                suppressed = self.suppressed_diagnostics.get(csv_path.name, 0) - suppressed_before
+                try:
+                    writer.finish(self.warnings[warnings_before:], suppressed)
+                except (OSError, ValueError) as e:
+                    self.warnings.append(f"{csv_path.name}: Could not write columnar table: {e}")
+                writer = None
+        finally:
+            # The CSV failed or the consumer stopped early
+            if writer is not None:
+                writer.abort()
+
+    def _collect_diagnostics(self, filename: str, start: int, seen: int) -> int:
+        """
+        Tag new warnings with their file and drop those over ``max_diagnostics``.
+
+        Args:
+            filename: CSV file the warnings are about
+            start: Index of the file's first warning
+            seen: Index of the first warning not collected yet
+
+        Returns:
+            Number of warnings after collecting
+        """
+        self._locate_diagnostics(seen, file=filename)
+        keep = start + self.max_diagnostics
+        if self.max_diagnostics and len(self.warnings) > keep:
+            self._suppress_diagnostics(filename, len(self.warnings) - keep)
+            del self.warnings[keep:]
+        return len(self.warnings)
+
+    def _locate_diagnostics(self, start: int, **location: Any) -> None:
+        """Fill in location fields (file, row) that warnings since ``start`` do not have yet."""
+        for diagnostic in self.warnings[start:]:
+            if isinstance(diagnostic, Diagnostic):
+                for name, value in location.items():
+                    if getattr(diagnostic, name) is None:
+                        setattr(diagnostic, name, value)
+
+    def _suppress_diagnostics(self, filename: str, count: int) -> None:
+        """Count diagnostics of a file dropped over ``max_diagnostics``."""
+        if count:
+            self.suppressed_diagnostics[filename] = self.suppressed_diagnostics.get(filename, 0) + count
+
+    def _read_records(self, entity_type: str, csv_path: Path) -> Iterator[Mapping]:
+        """
+        Read and type coerce the rows of a CSV file in order.
+
+        With the mmap reader in chunked mode, the file is split into byte
+        ranges of ``chunk_size`` rows that worker processes read and coerce
+        themselves; otherwise rows are read here and go to ``_iter_coerced``.
+
+        Args:
+            entity_type: Type of entity
+            csv_path: Path to the CSV file
+
+        Yields:
+            Type-coerced records
+        """
+        if self.csv_reader == "mmap" and self.chunk_size and self.jobs > 1:
+            with MappedCSVReader(csv_path, self._csv_columns(entity_type)) as reader:
+                ranges = reader.row_ranges(self.chunk_size)
+            if len(ranges) > 1:
+                yield from self._iter_coerced_ranges(entity_type, csv_path, ranges)
+                return
+
+        rows = self._iter_csv(csv_path)
+        if self.metrics is not None:
+            rows = self.metrics.timed(csv_path.name, "read", rows)
+        yield from self._iter_coerced(entity_type, rows)
+
+    def _iter_coerced_ranges(
+        self,
+        entity_type: str,
+        csv_path: Path,
+        ranges: List[Tuple[int, int]],
+    ) -> Iterator[Mapping]:
+        """
+        Read and coerce byte ranges of a CSV file on worker processes, in order.
+
+        Like ``_iter_coerced_chunked``, at most ``2 * jobs`` ranges are in
+        flight and the first failing row is reported with its row number,
+        counted over the records merged before it.
+
+        Args:
+            entity_type: Type of entity
+            csv_path: Path to the CSV file
+            ranges: Row-aligned byte ranges from ``MappedCSVReader.row_ranges``
+
+        Yields:
+            Type-coerced records
+        """
+        worker = self._worker_copy()
+        pending: deque = deque()
+        rows_before = 0
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            for start, end in ranges:
+                pending.append(pool.submit(_coerce_range, worker, entity_type, csv_path, start, end))
+                if len(pending) >= 2 * self.jobs:
+                    rows_before += yield from self._merge_range(pending.popleft().result(), rows_before)
+
+            while pending:
+                rows_before += yield from self._merge_range(pending.popleft().result(), rows_before)
+
+    def _merge_range(
+        self,
+        result: Tuple[List[Dict[str, Any]], List[str], Optional[Tuple[int, str]]],
+        rows_before: int,
+    ) -> Generator[Mapping, None, int]:
+        """Merge a worker's range result and return its record count, raising its row error after its records."""
+        records, warnings, error = result
+        # Workers number rows from their range start
+        for warning in warnings:
+            if isinstance(warning, Diagnostic) and warning.row is not None:
+                warning.row += rows_before
+        self.warnings.extend(warnings)
+        yield from records
+        if error is not None:
+            index, message = error
+            raise ValueError(f"Row {rows_before + index + 2}: {message}")
+        return len(records)
+
+    def _iter_coerced(self, entity_type: str, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield type-coerced records in input order.
+
+        Rows are coerced in chunks on a process pool when ``chunk_size`` is
+        set, ``jobs`` > 1 and the input spans more than one chunk; chunked
+        coercion does not use the row cache.
+
+        Args:
+            entity_type: Type of entity (capabilities, landmarks, organizations, tours)
+            rows: Raw data dictionaries
+
+        Yields:
+            Type-coerced dictionaries
+        """
+        if self.chunk_size and self.jobs > 1:
+            rows = iter(rows)
+            first_chunk = list(islice(rows, self.chunk_size))
+            second_chunk = list(islice(rows, self.chunk_size))
+            if second_chunk:
+                yield from self._iter_coerced_chunked(entity_type, first_chunk, second_chunk, rows)
+                return
+            rows = first_chunk
+
+        plan: Optional[CoercionPlan] = None
+        for i, record in enumerate(rows):
+            if plan is None:
+                # DictReader rows share the header as keys: compile once per file
+                plan = self._coercion_plan(entity_type, record)
+            warnings_before = len(self.warnings)
             try:
-                coerced_record = self._coerce_record(entity_type, record)
-                coerced.append(coerced_record)
+                coerced_record = self._coerce_record_cached(entity_type, record, plan)
             except Exception as e:
                 raise ValueError(f"Row {i + 2}: {str(e)}")
+            if len(self.warnings) != warnings_before:
+                self._locate_diagnostics(warnings_before, row=i + 2)
+            yield coerced_record
+
+    def _coerce_record_cached(
+        self,
+        entity_type: str,
+        record: Dict[str, Any],
+        plan: Optional[CoercionPlan] = None,
+    ) -> Mapping:
+        """
+        Type coerce a single record, reusing the row cache when it is open.
 
-        return coerced
+        Warnings raised when the record was first coerced are replayed on a
+        cache hit, so the report is the same as for a cold build.
 
-    def _coerce_record(self, entity_type: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        Args:
+            entity_type: Type of entity
+            record: Raw record dictionary
+            plan: Compiled plan for the record's header (looked up if None)
+
+        Returns:
+            Type-coerced record
+        """
+        if self._row_cache is None:
+            return plan.coerce(record) if plan is not None else self._coerce_record(entity_type, record)
+
+        fingerprint = f"{CONVERTER_VERSION}:{self.map_height}x{self.map_width}"
+        key = RowCache.key(entity_type, fingerprint, record)
+        cached = self._row_cache.get(key)
+        if cached is not None:
+            coerced_record, warnings = cached
+            self.warnings.extend(warnings)
+            return coerced_record
+
+        warnings_before = len(self.warnings)
+        coerced_record = plan.coerce(record) if plan is not None else self._coerce_record(entity_type, record)
+        self._row_cache.put(key, coerced_record, self.warnings[warnings_before:])
+        return coerced_record
+
+    def _iter_coerced_chunked(
+        self,
+        entity_type: str,
+        first_chunk: List[Dict[str, Any]],
+        second_chunk: List[Dict[str, Any]],
+        rows: Iterator[Dict[str, Any]],
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Coerce row chunks on worker processes and yield records in order.
+
+        At most ``2 * jobs`` chunks are in flight so memory stays bounded
+        when streaming. Coordinate warnings are merged in row order, and the
+        first failing row is reported with its original row number.
+
+        Args:
+            entity_type: Type of entity
+            first_chunk: First ``chunk_size`` rows
+            second_chunk: Next rows (non-empty)
+            rows: Remaining rows
+
+        Yields:
+            Type-coerced dictionaries
+        """
+        def chunks() -> Iterator[List[Dict[str, Any]]]:
+            yield first_chunk
+            yield second_chunk
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    return
+                yield chunk
+
+        worker = self._worker_copy()
+        pending: deque = deque()
+        start = 0
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            for chunk in chunks():
+                pending.append(pool.submit(_coerce_chunk, worker, entity_type, start, chunk))
+                start += len(chunk)
+                if len(pending) >= 2 * self.jobs:
+                    yield from self._merge_chunk(pending.popleft().result())
+
+            while pending:
+                yield from self._merge_chunk(pending.popleft().result())
+
+    def _merge_chunk(self, result: Tuple[List[Dict[str, Any]], List[str], Optional[str]]) -> Iterator[Dict[str, Any]]:
+        """Merge a worker's chunk result, raising its row error after its records."""
+        records, warnings, error = result
+        self.warnings.extend(warnings)
+        yield from records
+        if error is not None:
+            raise ValueError(error)
+
+    def _coerce_record(self, entity_type: str, record: Dict[str, Any]) -> Mapping:
         """
         Type coerce a single record.
 
+        Hot loops compile the plan once per file and call it directly; this
+        looks the plan up by the record's keys.
+
         Args:
             entity_type: Type of entity
             record: Raw record dictionary
 
         Returns:
-            Type-coerced record dictionary
+            Type-coerced record model (the raw record for unregistered entity types)
         """
-        if entity_type == "capabilities":
-            return self._coerce_capability(record)
-        elif entity_type == "landmarks":
-            return self._coerce_landmark(record)
-        elif entity_type == "organizations":
-            return self._coerce_organization(record)
-        else:
-            return record
+        plan = self._coercion_plan(entity_type, record)
+        return record if plan is None else plan.coerce(record)
 
-    def _coerce_capability(self, record: Dict[str, Any]) -> Dict[str, Any]:
+    def _coerce_capability(self, record: Dict[str, Any]) -> CapabilityRecord:
         """Coerce capability record."""
-        try:
-            polygon_coords = self._ensure_list(
-                self._parse_json(record.get("polygonCoordinates", "[]")) or [],
-                "polygonCoordinates"
-            )
-            normalized_polygon = [
-                self._coerce_coordinate(coord, f"capability '{record.get('id', '')}' polygon vertex {idx + 1}")
-                for idx, coord in enumerate(polygon_coords)
-            ]
-            visual_hints = self._parse_json(record.get("visualStyleHints", "{}"))
-
-            return {
-                "id": self._strip_string(record.get("id", "")),
-                "name": self._strip_string(record.get("name", "")),
-                "description": self._strip_string(record.get("description", "")),
-                "shortDescription": self._strip_string(record.get("shortDescription", "")),
-                "level": self._strip_string(record.get("level", "")),
-                "polygonCoordinates": normalized_polygon,
-                "visualStyleHints": visual_hints,
-                "relatedLandmarks": self._parse_array(record.get("relatedLandmarks", "[]")),
-                "parentCapabilityId": self._optional_string(record.get("parentCapabilityId", "")),
-                "zoomThreshold": self._parse_number(record.get("zoomThreshold", "0")),
-            }
-        except Exception as e:
-            raise ValueError(f"Capability coercion failed: {str(e)}")
+        return self._coerce_record("capabilities", record)
 
-    def _coerce_landmark(self, record: Dict[str, Any]) -> Dict[str, Any]:
+    def _coerce_landmark(self, record: Dict[str, Any]) -> LandmarkRecord:
         """Coerce landmark record."""
-        try:
-            external_links = self._parse_json(record.get("externalLinks", "[]"))
-            coordinates = self._coerce_coordinate(
-                self._parse_json(record.get("coordinates", "{}")),
-                f"landmark '{record.get('id', '')}' coordinates"
-            )
-            tags = self._parse_array(record.get("tags", "[]"))
-
-            return {
-                "id": self._strip_string(record.get("id", "")),
-                "name": self._strip_string(record.get("name", "")),
-                "type": self._strip_string(record.get("type", "")),
-                "year": self._parse_number(record.get("year", "0")),
-                "organization": self._strip_string(record.get("organization", "")),
-                "authors": self._parse_array(record.get("authors", "[]")),
-                "description": self._strip_string(record.get("description", "")),
-                "abstract": self._optional_string(record.get("abstract", "")),
-                "externalLinks": external_links,
-                "coordinates": coordinates,
-                "capabilityId": self._strip_string(record.get("capabilityId", "")),
-                "relatedLandmarks": self._parse_array(record.get("relatedLandmarks", "[]")),
-                "tags": tags,
-                "icon": self._optional_string(record.get("icon", "")),
-                "metadata": self._parse_json(record.get("metadata", "{}")),
-                "zoomThreshold": self._parse_number(record.get("zoomThreshold", "1")),
-            }
-        except Exception as e:
-            raise ValueError(f"Landmark coercion failed: {str(e)}")
+        return self._coerce_record("landmarks", record)
 
-    def _coerce_organization(self, record: Dict[str, Any]) -> Dict[str, Any]:
+    def _coerce_organization(self, record: Dict[str, Any]) -> OrganizationRecord:
         """Coerce organization record."""
-        try:
-            landmark_ids = self._parse_array(record.get("landmarkIds", "[]"))
-
-            return {
-                "id": self._strip_string(record.get("id", "")),
-                "name": self._strip_string(record.get("name", "")),
-                "description": self._strip_string(record.get("description", "")),
-                "website": self._optional_string(record.get("website", "")),
-                "landmarkIds": landmark_ids,
-                "color": self._strip_string(record.get("color", "")),
-                "logo": self._optional_string(record.get("logo", "")),
-            }
-        except Exception as e:
-            raise ValueError(f"Organization coercion failed: {str(e)}")
+        return self._coerce_record("organizations", record)
+
+    def _coerce_tour(self, record: Dict[str, Any]) -> TourRecord:
+        """Coerce tour record (stages are a JSON array of stage objects)."""
+        return self._coerce_record("tours", record)
+
+    def _parse_json_column(self, value: Any) -> Any:
+        """Parse a JSON cell with the converter's JSON backend."""
+        return self._parse_json(value, self.json_backend.loads)
+
+    def _parse_array_column(self, value: Any) -> List[str]:
+        """Parse an array cell with the converter's JSON backend."""
+        return self._parse_array(value, self.json_backend.loads)
+
+    def _coerce_coordinate_column(self, value: Any, context: str, column: str) -> CoordinateRecord:
+        """Coerce a coordinate cell (e.g. a landmark's position)."""
+        return self._coerce_coordinate(self._parse_json_column(value), context, column)
+
+    def _coerce_polygon_column(self, value: Any, context: str, column: str) -> List[CoordinateRecord]:
+        """Coerce a JSON array of polygon vertices."""
+        vertices = self._ensure_list(self._parse_json_column(value) or [], column)
+        if numpy is not None and len(vertices) >= POLYGON_BATCH_MIN_VERTICES:
+            # JSON booleans would silently become 0/1 in a numeric array
+            if isinstance(value, str) and "true" not in value and "false" not in value:
+                coordinates = self._coerce_coordinate_batch(vertices, context, column)
+                if coordinates is not None:
+                    return coordinates
+        return [
+            self._coerce_coordinate(vertex, context, column, idx + 1)
+            for idx, vertex in enumerate(vertices)
+        ]
+
+    def _coerce_stages_column(self, value: Any, context: str, column: str) -> List[TourStageRecord]:
+        """Coerce a JSON array of tour stage objects."""
+        stages = self._ensure_list(self._parse_json_column(value) or [], column)
+        return [
+            self._coerce_tour_stage(stage, f"{context} stage {idx}", idx)
+            for idx, stage in enumerate(stages)
+        ]
+
+    def _coerce_tour_stage(self, stage: Any, context: str, position: int) -> TourStageRecord:
+        """
+        Coerce one stage object of a tour.
+
+        ``mapCenter`` is only checked against the map bounds. It is where the
+        camera pans to, not a reference: stages center between their
+        landmarks or on open map space, so there is no landmark or capability
+        position it has to match. ``landmarkIds`` are checked in the
+        reference stage.
+        """
+        if not isinstance(stage, dict):
+            raise ValueError(f"{context}: expected an object, got {type(stage).__name__}")
+
+        return TourStageRecord(
+            index=self._parse_number(stage.get("index", position)),
+            title=self._strip_string(stage.get("title", "")),
+            description=self._strip_string(stage.get("description", "")),
+            narration=self._strip_string(stage.get("narration", "")),
+            landmarkIds=self._parse_array_column(stage.get("landmarkIds", [])),
+            mapCenter=self._coerce_coordinate(stage.get("mapCenter", {}), context, "mapCenter"),
+            mapZoom=self._parse_number(stage.get("mapZoom", "0")),
+        )
 
     @staticmethod
     def _strip_string(value: Any) -> str:
@@ -296,6 +2624,9 @@ class CSVToJSONConverter:
     @staticmethod
     def _parse_float(value: Any) -> float:
         """Parse value as float."""
+        # Parsed JSON numbers; 0 must not read as an empty cell
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
         try:
             stripped = CSVToJSONConverter._strip_string(value)
             if not stripped:
@@ -305,24 +2636,24 @@ class CSVToJSONConverter:
             raise ValueError(f"Cannot parse '{value}' as float")
 
     @staticmethod
-    def _parse_json(value: Any) -> Any:
-        """Parse value as JSON."""
+    def _parse_json(value: Any, loads: Callable[[str], Any] = json.loads) -> Any:
+        """Parse value as JSON (with ``loads``, e.g. a backend's parser)."""
         try:
             if isinstance(value, str):
                 stripped = value.strip()
                 if not stripped:
                     return None
-                return json.loads(stripped)
+                return loads(stripped)
             return value
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON: {str(e)}")
 
     @staticmethod
-    def _parse_array(value: Any) -> List[str]:
+    def _parse_array(value: Any, loads: Callable[[str], Any] = json.loads) -> List[str]:
         """Parse comma-separated string or JSON array as list."""
         try:
             # Try parsing as JSON first
-            parsed = CSVToJSONConverter._parse_json(value)
+            parsed = CSVToJSONConverter._parse_json(value, loads)
             if isinstance(parsed, list):
                 return [str(item).strip() for item in parsed]
 
@@ -350,7 +2681,13 @@ class CSVToJSONConverter:
             return list(value)
         raise ValueError(f"{context}: expected a list, got {type(value).__name__}")
 
-    def _coerce_coordinate(self, value: Any, context: str) -> Dict[str, int]:
+    def _coerce_coordinate(
+        self,
+        value: Any,
+        context: str,
+        field: Optional[str] = None,
+        vertex: Optional[int] = None,
+    ) -> CoordinateRecord:
         """
         Convert various coordinate formats into pixel-based {lat, lng} dictionaries.
 
@@ -360,50 +2697,220 @@ class CSVToJSONConverter:
           - "[1200, 800]" (stringified JSON)
 
         Coordinates must already be expressed in CRS.Simple pixel space
-        where lat ∈ [0, map_height] and lng ∈ [0, map_width].
+        where lat ∈ [0, map_height] and lng ∈ [0, map_width]. The record
+        context, field and vertex index only become message text when the
+        coordinate is rejected or out of bounds.
         """
         if isinstance(value, str):
-            parsed = self._parse_json(value)
-            return self._coerce_coordinate(parsed, context)
+            parsed = self._parse_json_column(value)
+            return self._coerce_coordinate(parsed, context, field, vertex)
 
         lat: Optional[float] = None
         lng: Optional[float] = None
 
         if isinstance(value, dict):
             if "lat" not in value or "lng" not in value:
-                raise ValueError(f"{context}: coordinate object must contain 'lat' and 'lng'")
+                location = Diagnostic.format_location(context, field, vertex)
+                raise ValueError(f"{location}: coordinate object must contain 'lat' and 'lng'")
             lat = self._parse_float(value["lat"])
             lng = self._parse_float(value["lng"])
         elif isinstance(value, Sequence):
             if len(value) != 2:
-                raise ValueError(f"{context}: coordinate array must have exactly 2 values, got {len(value)}")
+                location = Diagnostic.format_location(context, field, vertex)
+                raise ValueError(f"{location}: coordinate array must have exactly 2 values, got {len(value)}")
             lat = self._parse_float(value[0])
             lng = self._parse_float(value[1])
         else:
-            raise ValueError(f"{context}: unsupported coordinate format ({value!r})")
+            location = Diagnostic.format_location(context, field, vertex)
+            raise ValueError(f"{location}: unsupported coordinate format ({value!r})")
 
         # Detect accidental geographic coordinates (latitude ±90, longitude ±180) and fail fast.
         if -90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0:
-            raise ValueError(
-                f"{context}: detected geographic coordinates ({lat}, {lng}). "
-                "Please provide pixel-based coordinates (0 ≤ lat ≤ 3072, 0 ≤ lng ≤ 4096) "
-                "matching the CRS.Simple map projection."
-            )
+            raise self._geographic_coordinate_error(Diagnostic.format_location(context, field, vertex), lat, lng)
 
         lat_int = int(round(lat))
         lng_int = int(round(lng))
 
         if not (0 <= lat_int <= self.map_height) or not (0 <= lng_int <= self.map_width):
+            self.warnings.append(self._out_of_bounds_warning(context, field, vertex, lat_int, lng_int))
+
+        return CoordinateRecord(lat=lat_int, lng=lng_int)
+
+    def _coerce_coordinate_batch(self, vertices: List[Any], context: str, field: str) -> Optional[List[CoordinateRecord]]:
+        """
+        Coerce polygon vertices as one NumPy array, like ``_coerce_coordinate`` per vertex.
+
+        The geographic-coordinate check, rounding and bounds check run as
+        array operations; messages are only built for offending vertices,
+        in the order the per-vertex path reports them.
+
+        Args:
+            vertices: Parsed polygon vertices
+            context: Record context for messages
+            field: Polygon column
+
+        Returns:
+            Coordinate records, or None if the vertices are not all finite
+            numeric {lat, lng} objects or [lat, lng] pairs (the per-vertex
+            path handles those)
+
+        Raises:
+            ValueError: At the first vertex with geographic coordinates
+        """
+        try:
+            if isinstance(vertices[0], dict):
+                vertices = [(vertex["lat"], vertex["lng"]) for vertex in vertices]
+            points = numpy.array(vertices)
+        except (KeyError, ValueError, TypeError):
+            return None
+        if points.ndim != 2 or points.shape[1] != 2 or points.dtype.kind not in "iuf":
+            return None
+        points = points.astype(numpy.float64, copy=False)
+        # Non-finite and huge values keep the per-vertex path's exact errors
+        if not numpy.isfinite(points).all() or numpy.abs(points).max() >= 2.0 ** 62:
+            return None
+
+        lat, lng = points[:, 0], points[:, 1]
+        geographic = numpy.flatnonzero((numpy.abs(lat) <= 90.0) & (numpy.abs(lng) <= 180.0))
+        # numpy.rint rounds half to even, like round()
+        rounded = numpy.rint(points).astype(numpy.int64)
+        lat_int, lng_int = rounded[:, 0], rounded[:, 1]
+        outside = numpy.flatnonzero(
+            (lat_int < 0) | (lat_int > self.map_height) | (lng_int < 0) | (lng_int > self.map_width)
+        )
+
+        stop = int(geographic[0]) if len(geographic) else len(points)
+        for idx in outside[outside < stop].tolist():
             self.warnings.append(
-                f"{context}: coordinate ({lat_int}, {lng_int}) is outside map bounds "
-                f"[0,{self.map_height}]x[0,{self.map_width}]"
+                self._out_of_bounds_warning(context, field, idx + 1, int(lat_int[idx]), int(lng_int[idx]))
             )
+        if stop < len(points):
+            raise self._geographic_coordinate_error(
+                Diagnostic.format_location(context, field, stop + 1), float(lat[stop]), float(lng[stop])
+            )
+
+        return list(starmap(CoordinateRecord, rounded.tolist()))
+
+    @staticmethod
+    def _geographic_coordinate_error(context: str, lat: float, lng: float) -> ValueError:
+        """Error for coordinates that look like latitude/longitude instead of map pixels."""
+        return ValueError(
+            f"{context}: detected geographic coordinates ({lat}, {lng}). "
+            "Please provide pixel-based coordinates (0 ≤ lat ≤ 3072, 0 ≤ lng ≤ 4096) "
+            "matching the CRS.Simple map projection."
+        )
+
+    def _out_of_bounds_warning(
+        self,
+        context: str,
+        field: Optional[str],
+        vertex: Optional[int],
+        lat: int,
+        lng: int,
+    ) -> Diagnostic:
+        """Warning for a coordinate outside the map."""
+        return Diagnostic(
+            "coordinate ({}, {}) is outside map bounds [0,{}]x[0,{}]",
+            lat, lng, self.map_height, self.map_width,
+            entity=context, field=field, vertex=vertex,
+        )
+
+    def _validate_json_file(self, json_path: Path, records: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        Validate a JSON file against the required-field rules.
+
+        Validation runs in-process on the coerced records when they are
+        available; the file is only re-read from disk when they are not.
+        With ``isolated_validation`` enabled the check runs in a separate
+        Python subprocess instead.
+
+        Args:
+            json_path: Path to the JSON file
+            records: Coerced records that were written to ``json_path``
+
+        Returns:
+            True if validation succeeded, False otherwise
+        """
+        with self._phase(f"{json_path.stem}.csv", "validate"):
+            if self.isolated_validation:
+                return self._validate_json_file_isolated(json_path)
+
+            if records is None and json_path.stem in self.stream_validation:
+                return self._report_validation(json_path, self.stream_validation[json_path.stem])
+
+            try:
+                if records is None:
+                    with open(json_path, "r", encoding="utf-8") as f:
+                        records = self.json_backend.loads(f.read())
+
+                return self._report_validation(json_path, self._validate_records(json_path.stem, records))
+
+            except json.JSONDecodeError as e:
+                return self._report_validation(json_path, f"Invalid JSON: {e}")
+            except Exception as e:
+                self.errors.append(f"{json_path.name}: {str(e)}")
+                print(f"❌ Validation error for {json_path.name}: {str(e)}")
+                return False
+
+    def _report_validation(self, json_path: Path, error_msg: Optional[str]) -> bool:
+        """Record and print the outcome of validating ``json_path``."""
+        if error_msg is not None:
+            self.errors.append(f"{json_path.name}: {error_msg}")
+            print(f"❌ Validation failed for {json_path.name}")
+            print(f"   {error_msg}")
+            return False
+
+        print(f"✓ Validated {json_path.name}")
+        return True
+
+    @staticmethod
+    def _validate_records(entity_type: str, data: Any) -> Optional[str]:
+        """
+        Validate coerced records for an entity type.
+
+        Produces the same messages as the subprocess validation code.
+
+        Args:
+            entity_type: Type of entity (capabilities, landmarks, organizations, tours)
+            data: Records as they are written to the JSON file
+
+        Returns:
+            Error message for the first problem found, or None if valid
+        """
+        if not isinstance(data, list):
+            return f"Expected array at root, got {type(data).__name__}"
+
+        required_fields = REQUIRED_FIELDS.get(entity_type)
+        if required_fields is None:
+            return f"Unknown entity type: {entity_type}"
+
+        for i, record in enumerate(data):
+            error_msg = CSVToJSONConverter._validate_record(required_fields, i, record)
+            if error_msg is not None:
+                return error_msg
 
-        return {"lat": lat_int, "lng": lng_int}
+        return None
+
+    @staticmethod
+    def _validate_record(required_fields: List[str], index: int, record: Any) -> Optional[str]:
+        """
+        Check a single record; returns an error message or None.
 
-    def _validate_json_file(self, json_path: Path) -> bool:
+        Record models are checked like dicts, through their fields, so a
+        model of the wrong entity type is caught as well.
         """
-        Validate a JSON file against Zod schemas.
+        if not isinstance(record, (dict, RecordModel)):
+            return f"Row {index + 2}: Expected object, got {type(record).__name__}"
+
+        for field in required_fields:
+            if field not in record:
+                return f"Row {index + 2}: Missing required field '{field}'"
+
+        return None
+
+    def _validate_json_file_isolated(self, json_path: Path) -> bool:
+        """
+        Validate a JSON file in a separate Python subprocess.
 
         Args:
             json_path: Path to the JSON file
@@ -476,14 +2983,9 @@ try:
 
     # Validate structure based on entity type
     entity_type = '{entity_type}'
+    required_fields = {REQUIRED_FIELDS.get(entity_type)!r}
 
-    if entity_type == 'capabilities':
-        required_fields = ['id', 'name', 'description', 'level', 'polygonCoordinates', 'visualStyleHints', 'zoomThreshold']
-    elif entity_type == 'landmarks':
-        required_fields = ['id', 'name', 'type', 'year', 'organization', 'description', 'externalLinks', 'coordinates', 'capabilityId', 'tags', 'zoomThreshold']
-    elif entity_type == 'organizations':
-        required_fields = ['id', 'name', 'description', 'landmarkIds', 'color']
-    else:
+    if required_fields is None:
         print(f"Unknown entity type: {{entity_type}}")
         sys.exit(1)
 
@@ -509,13 +3011,19 @@ except Exception as e:
     sys.exit(1)
 """
 
-    def _report_results(self, converted_files: List[str], valid_files: List[str]) -> None:
+    def _report_results(
+        self,
+        converted_files: List[str],
+        valid_files: List[str],
+        skipped_files: Optional[List[str]] = None,
+    ) -> None:
         """
         Report pipeline results.
 
         Args:
             converted_files: List of successfully converted files
             valid_files: List of successfully validated files
+            skipped_files: List of files skipped because they were unchanged
         """
         print("\n" + "=" * 60)
         print("Pipeline Results")
@@ -529,11 +3037,38 @@ except Exception as e:
         for filename in valid_files:
             print(f"  ✓ {filename}.json")
 
+        if self.output_sizes:
+            print(f"\nOutput sizes ({self.output_profile}):")
+            for filename, sizes in sorted(self.output_sizes.items()):
+                print(f"  {filename}.json: {_format_sizes(sizes)}")
+
+        if self.metrics is not None and self.metrics.files:
+            print("\nTiming (wall time per phase):")
+            for filename, entry in self.metrics.summary().items():
+                phases = [f"{phase} {values['seconds']:.2f}s" for phase, values in entry["phases"].items()]
+                peaks = [values["peakMemoryBytes"] for values in entry["phases"].values() if "peakMemoryBytes" in values]
+                if peaks:
+                    phases.append(f"peak {max(peaks) / (1024 * 1024):.1f} MB")
+                print(
+                    f"  {filename}: {entry['rows']:,} rows in {entry['seconds']:.2f}s "
+                    f"({entry['rowsPerSecond']:,.0f} rows/s; {', '.join(phases)})"
+                )
+
+        if skipped_files:
+            print(f"\nSkipped: {len(skipped_files)}")
+            for filename in skipped_files:
+                print(f"  ✓ {filename}.json skipped (unchanged)")
+
         if self.warnings:
             print(f"\n⚠️  Warnings ({len(self.warnings)}):")
             for warning in self.warnings:
                 print(f"  - {warning}")
 
+        if self.suppressed_diagnostics:
+            print(f"\n⚠️  Not shown (over {self.max_diagnostics} per file, see --max-diagnostics):")
+            for filename, count in sorted(self.suppressed_diagnostics.items()):
+                print(f"  - {filename}: {count} more")
+
         if self.errors:
             print(f"\n❌ Errors ({len(self.errors)}):")
             for error in self.errors:
@@ -544,9 +3079,367 @@ except Exception as e:
         print("=" * 60)
 
 
-def main() -> int:
+def _format_sizes(sizes: Dict[str, int]) -> str:
+    """Format output byte sizes with compression ratios relative to the JSON."""
+    parts = [f"{sizes['json']:,} B"]
+    for label in ("gzip", "brotli"):
+        if label in sizes:
+            ratio = sizes[label] / sizes["json"] if sizes["json"] else 0.0
+            parts.append(f"{label} {sizes[label]:,} B ({ratio:.1%})")
+    return ", ".join(parts)
+
+
+def _process_file(converter: CSVToJSONConverter, csv_path: Path) -> Dict[str, Any]:
+    """
+    Convert and validate one CSV file in a worker process.
+
+    Runs against the worker's own copy of the converter and captures the
+    printed output, errors and warnings of each phase separately.
+
+    Args:
+        converter: Configured converter (pickled into the worker)
+        csv_path: Path to the CSV file
+
+    Returns:
+        Output, errors, warnings and success flag for each phase
+    """
+    result: Dict[str, Any] = {}
+
+    def run_phase(phase: str, func: Any, *args: Any) -> bool:
+        errors_before = len(converter.errors)
+        warnings_before = len(converter.warnings)
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            ok = func(*args)
+        result[f"{phase}_output"] = buffer.getvalue()
+        result[f"{phase}_errors"] = converter.errors[errors_before:]
+        result[f"{phase}_warnings"] = converter.warnings[warnings_before:]
+        result[f"{phase}_ok"] = ok
+        return ok
+
+    entity_type = csv_path.stem
+    converter._open_row_cache()
+    if converter.metrics is not None and converter.trace_memory:
+        tracemalloc.start()
+    try:
+        if run_phase("convert", converter._convert_file, csv_path):
+            json_path = converter.output_dir / f"{entity_type}.json"
+            run_phase("validate", converter._validate_json_file, json_path, converter.converted_records.get(entity_type))
+        else:
+            result.update(validate_output="", validate_errors=[], validate_warnings=[], validate_ok=False)
+    finally:
+        converter._close_row_cache()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    result["output_sizes"] = converter.output_sizes
+    result["suppressed_diagnostics"] = converter.suppressed_diagnostics
+    result["metrics"] = None if converter.metrics is None else converter.metrics.files
+    return result
+
+
+def _coerce_chunk(
+    converter: CSVToJSONConverter,
+    entity_type: str,
+    start: int,
+    rows: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[str], Optional[str]]:
+    """
+    Coerce a chunk of rows in a worker process.
+
+    Args:
+        converter: Converter settings (pickled into the worker)
+        entity_type: Type of entity
+        start: Index of the chunk's first row among the file's data rows
+        rows: Raw data dictionaries
+
+    Returns:
+        Coerced records up to the first failing row, coordinate warnings
+        raised while coercing them, and the row error message (or None)
+    """
+    converter.warnings = []
+    coerced: List[Dict[str, Any]] = []
+    plan = converter._coercion_plan(entity_type, rows[0]) if rows else None
+    for i, record in enumerate(rows):
+        warnings_before = len(converter.warnings)
+        try:
+            coerced.append(plan.coerce(record) if plan is not None else record)
+        except Exception as e:
+            return coerced, converter.warnings, f"Row {start + i + 2}: {str(e)}"
+        if len(converter.warnings) != warnings_before:
+            converter._locate_diagnostics(warnings_before, row=start + i + 2)
+
+    return coerced, converter.warnings, None
+
+
+def _coerce_range(
+    converter: CSVToJSONConverter,
+    entity_type: str,
+    csv_path: Path,
+    start: int,
+    end: int,
+) -> Tuple[List[Dict[str, Any]], List[str], Optional[Tuple[int, str]]]:
+    """
+    Read and coerce a byte range of a CSV file in a worker process.
+
+    Args:
+        converter: Converter settings (pickled into the worker)
+        entity_type: Type of entity
+        csv_path: Path to the CSV file
+        start: Row boundary the range starts at
+        end: Row boundary the range ends at
+
+    Returns:
+        Coerced records up to the first failing row, coordinate warnings
+        raised while coercing them, and the failing row's index within the
+        range with its error message (or None)
+    """
+    converter.warnings = []
+    coerced: List[Dict[str, Any]] = []
+    with MappedCSVReader(csv_path, converter._csv_columns(entity_type)) as reader:
+        plan = converter._coercion_plan(entity_type, reader.header)
+        for i, record in enumerate(reader.rows(start, end)):
+            warnings_before = len(converter.warnings)
+            try:
+                coerced.append(plan.coerce(record) if plan is not None else record)
+            except Exception as e:
+                return coerced, converter.warnings, (i, str(e))
+            if len(converter.warnings) != warnings_before:
+                # Numbered from the range start; _merge_range shifts them
+                converter._locate_diagnostics(warnings_before, row=i + 2)
+
+    return coerced, converter.warnings, None
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Convert CSV exports in csv/ to validated JSON in public/data/."
+    )
+    parser.add_argument(
+        "--isolated-validation",
+        action="store_true",
+        help="validate each JSON file in a separate Python subprocess",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="convert row-at-a-time with bounded memory (for very large exports)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="convert and validate up to N files concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=0,
+        metavar="ROWS",
+        help="with --jobs, coerce each file in chunks of ROWS rows on the worker pool",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild every file, even if its CSV is unchanged since the last run",
+    )
+    parser.add_argument(
+        "--row-cache-size",
+        type=int,
+        default=0,
+        metavar="MB",
+        help="cache coerced rows across builds, up to MB megabytes (default: 0, disabled)",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="empty the coerced-row cache before converting",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=OUTPUT_PROFILES,
+        default="pretty",
+        help="pretty: indented JSON (default); compact: minified JSON plus .json.gz/.json.br copies",
+    )
+    parser.add_argument(
+        "--shard-landmarks",
+        choices=sorted(SHARD_FIELDS),
+        help="also write landmarks/<shard>.json split by capability or zoom band, plus landmarks/index.json",
+    )
+    parser.add_argument(
+        "--spatial-index",
+        type=int,
+        nargs="?",
+        const=256,
+        default=0,
+        metavar="TILE_PX",
+        help="also write landmarks.spatial.json, a grid index of TILE_PX-pixel tiles (default: 256)",
+    )
+    parser.add_argument(
+        "--geometry",
+        action="store_true",
+        help="also write capabilities.geometry.json (bounds, centroid, area, simplified polygons)",
+    )
+    parser.add_argument(
+        "--simplify-tolerance",
+        type=float,
+        default=1.0,
+        metavar="PX",
+        help="with --geometry, maximum simplification error in screen pixels (default: 1.0)",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="also write search-index.json, a prebuilt index for client-side search",
+    )
+    parser.add_argument(
+        "--strict-references",
+        action="store_true",
+        help="fail the build on broken cross-entity references (default: warn)",
+    )
+    parser.add_argument(
+        "--no-check-references",
+        dest="check_references",
+        action="store_false",
+        help="skip the cross-entity reference check (saves re-reading streamed outputs)",
+    )
+    parser.add_argument(
+        "--tour-bundles",
+        action="store_true",
+        help="also write tours/<id>.json bundles with only the landmarks each tour references",
+    )
+    parser.add_argument(
+        "--json-backend",
+        choices=JSON_BACKENDS,
+        default="auto",
+        help="JSON library for parsing and writing (default: auto, the fastest installed; output is identical)",
+    )
+    parser.add_argument(
+        "--csv-reader",
+        choices=CSV_READERS,
+        default="csv",
+        help="CSV reader (default: csv); mmap keeps only used columns and lets --chunk-size workers parse byte ranges",
+    )
+    parser.add_argument(
+        "--max-diagnostics",
+        type=int,
+        default=100,
+        metavar="N",
+        help="keep at most N coercion/reference diagnostics per file and count the rest (default: 100, 0 keeps all)",
+    )
+    parser.add_argument(
+        "--diagnostics-json",
+        type=Path,
+        metavar="PATH",
+        help="also write errors and warnings with file/row/field/vertex locations to PATH as JSON (for CI)",
+    )
+    parser.add_argument(
+        "--columnar",
+        choices=sorted(COLUMNAR_FORMATS),
+        help="also keep typed entity tables in .cache/csv-to-json/columnar/ and reload them for unchanged CSVs (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--columnar-dir",
+        type=Path,
+        metavar="DIR",
+        help="write the --columnar tables to DIR instead of the cache directory (e.g. for pandas, Polars or DuckDB)",
+    )
+    parser.add_argument(
+        "--hashed-filenames",
+        action="store_true",
+        help="also publish <name>.<hash>.json copies of the outputs and a manifest.json for immutable caching",
+    )
+    parser.add_argument(
+        "--keep-versions",
+        type=int,
+        default=3,
+        metavar="N",
+        help="with --hashed-filenames, keep the N most recent versions of each file (default: 3)",
+    )
+    parser.add_argument(
+        "--fetch-sheets",
+        action="store_true",
+        help=f"first download the sheet exports listed in csv/{SHEET_SOURCES_FILENAME} (conditional requests; unchanged sheets are not downloaded)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="stay running and rebuild whenever a CSV file in csv/ changes (Ctrl+C to stop)",
+    )
+    parser.add_argument(
+        "--debounce-ms",
+        type=int,
+        default=int(WATCH_DEBOUNCE_SECONDS * 1000),
+        metavar="MS",
+        help=f"with --watch, rebuild once files have not changed for MS milliseconds (default: {int(WATCH_DEBOUNCE_SECONDS * 1000)})",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=Path,
+        metavar="PATH",
+        help="also write wall/CPU time, rows/s and bytes per file and phase (read, coerce, write, validate) to PATH",
+    )
+    parser.add_argument(
+        "--metrics-prometheus",
+        type=Path,
+        metavar="PATH",
+        help="also write those metrics to PATH in the Prometheus textfile format (e.g. for node_exporter)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="record tracemalloc peak memory per file and phase and print per-phase timing (slower)",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=Path,
+        metavar="PATH",
+        help="profile the run with cProfile and dump the stats to PATH (inspect with python -m pstats)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
     """Main entry point."""
-    converter = CSVToJSONConverter()
+    args = parse_args(argv)
+    try:
+        converter = CSVToJSONConverter(
+            isolated_validation=args.isolated_validation,
+            stream=args.stream,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size,
+            force=args.force,
+            row_cache_mb=args.row_cache_size,
+            clear_cache=args.clear_cache,
+            output_profile=args.profile,
+            shard_landmarks=args.shard_landmarks,
+            spatial_tile_size=args.spatial_index,
+            simplify_tolerance=args.simplify_tolerance if args.geometry else None,
+            search_index=args.search_index,
+            strict_references=args.strict_references,
+            check_references=args.check_references,
+            tour_bundles=args.tour_bundles,
+            json_backend=args.json_backend,
+            csv_reader=args.csv_reader,
+            columnar=args.columnar,
+            columnar_dir=args.columnar_dir,
+            max_diagnostics=args.max_diagnostics,
+            diagnostics_path=args.diagnostics_json,
+            metrics_path=args.metrics_json,
+            prometheus_path=args.metrics_prometheus,
+            trace_memory=args.trace_memory,
+            profile_path=args.cprofile,
+            hashed_filenames=args.hashed_filenames,
+            keep_versions=args.keep_versions,
+            fetch_sheets=args.fetch_sheets,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if args.watch:
+        return converter.watch(debounce=args.debounce_ms / 1000)
     return converter.run()
 
 
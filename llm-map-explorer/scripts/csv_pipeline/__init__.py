@@ -0,0 +1,12 @@
+"""
+Building blocks of scripts/csv-to-json.py.
+
+- ``records``: record models, diagnostics and the reference fields between entity types
+- ``json_backends``: stdlib and optional fast JSON encoders
+- ``files``: atomic file replacement and output file helpers
+- ``caches``: row cache, columnar tables and collected reference fields
+- ``writers``: shards, spatial index, geometry, tour bundles, hashed copies and search index
+- ``sheets``: sheet export downloads (--fetch-sheets)
+
+The script re-exports what it uses, so ``csv_to_json.<name>`` keeps working.
+"""
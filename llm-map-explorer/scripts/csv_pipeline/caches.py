@@ -0,0 +1,422 @@
+"""
+Cache stores under .cache/csv-to-json/: the row cache, columnar entity tables
+and the reference fields collected during conversion.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from csv_pipeline.files import atomic_path, atomic_write, file_sha256, temporary_path
+from csv_pipeline.json_backends import JSONBackend, json_default
+from csv_pipeline.records import REFERENCE_FIELDS, CoordinateRecord, Diagnostic, RecordModel
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # optional: columnar tables (--columnar) need it
+    pyarrow = None
+
+
+# Columnar table formats selectable with --columnar and their file suffixes
+COLUMNAR_FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+
+class RowCache:
+    """
+    Persistent SQLite cache of coerced records keyed by raw-row hash.
+
+    Each entry stores the coerced record and the warnings raised while
+    coercing it. Least recently used entries are evicted once the stored
+    records exceed ``max_bytes``.
+
+    Several processes may share the database (``--jobs`` workers open it
+    each). It uses write-ahead logging so reads never wait for a writer,
+    and new rows are committed every ``COMMIT_ROWS`` rows so no process
+    holds the write lock for a whole file.
+    """
+
+    COMMIT_ROWS = 500
+
+    def __init__(self, path: Path, max_bytes: int, json_backend: Optional[JSONBackend] = None):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Upper bound on the total size of stored records
+            json_backend: Backend that parses cached records (stdlib json
+                if omitted)
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._loads = (json_backend or JSONBackend()).loads
+        self.hits = 0
+        self.misses = 0
+        self._now = time.time_ns()
+        self._used: List[str] = []
+        self._pending = 0
+        self._conn = sqlite3.connect(str(path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            " key TEXT PRIMARY KEY, record TEXT NOT NULL, warnings TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS rows_last_used ON rows (last_used)")
+
+    @staticmethod
+    def key(entity_type: str, fingerprint: str, row: Dict[str, Any]) -> str:
+        """Hash a raw CSV row together with its entity type and converter fingerprint."""
+        payload = json.dumps([entity_type, fingerprint, list(row.items())], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], List[Diagnostic]]]:
+        """Return the cached record and its warnings, or None on a miss."""
+        row = self._conn.execute("SELECT record, warnings FROM rows WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used.append(key)
+        return self._loads(row[0]), Diagnostic.restore(self._loads(row[1]))
+
+    def put(self, key: str, record: Dict[str, Any], warnings: List[Diagnostic]) -> None:
+        """Store a coerced record and the warnings raised while coercing it."""
+        record_json = json.dumps(record, ensure_ascii=False, default=json_default)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO rows (key, record, warnings, size, last_used) VALUES (?, ?, ?, ?, ?)",
+            (key, record_json, json.dumps(warnings, ensure_ascii=False, default=json_default), len(record_json), self._now),
+        )
+        self._pending += 1
+        if self._pending >= self.COMMIT_ROWS:
+            self._conn.commit()
+            self._pending = 0
+
+    def flush(self) -> None:
+        """Record hits, evict least recently used entries over the size bound and commit."""
+        self._conn.executemany(
+            "UPDATE rows SET last_used = ? WHERE key = ?",
+            ((self._now, key) for key in self._used),
+        )
+        self._used = []
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM rows").fetchone()[0]
+        if total > self.max_bytes:
+            evict: List[str] = []
+            for key, size in self._conn.execute("SELECT key, size FROM rows ORDER BY last_used, rowid"):
+                if total <= self.max_bytes:
+                    break
+                evict.append(key)
+                total -= size
+            self._conn.executemany("DELETE FROM rows WHERE key = ?", ((key,) for key in evict))
+
+        self._conn.commit()
+        self._pending = 0
+
+    def clear(self) -> None:
+        """Remove every cached record."""
+        self._conn.execute("DELETE FROM rows")
+        self._conn.commit()
+        self._conn.execute("VACUUM")
+
+    def close(self) -> None:
+        """Flush pending changes and close the database."""
+        self.flush()
+        self._conn.close()
+
+
+class ColumnarStore:
+    """
+    Columnar copies of the coerced entity tables (Arrow IPC or Parquet).
+
+    Each record field becomes a typed column: strings, int64 numbers,
+    list<string> arrays, coordinates flattened to ``<field>.lat`` and
+    ``<field>.lng`` int64 columns, and polygons as list<struct<lat, lng>>.
+    Free-form JSON fields (style hints, links, metadata, tour stages) are
+    stored as JSON text. The schema metadata records the fingerprint of the
+    CSV and converter that produced the table, plus the coercion warnings,
+    so a table doubles as a file-level cache that replaces reading and
+    coercing an unchanged CSV.
+    """
+
+    METADATA_KEY = b"csv-to-json"
+    BATCH_ROWS = 8192
+
+    def __init__(self, directory: Path, fmt: str, specs: Mapping[str, Any]):
+        """
+        Args:
+            directory: Directory holding the tables
+            fmt: Table format (see ``COLUMNAR_FORMATS``)
+            specs: Entity specs by entity type, whose columns become the table columns
+        """
+        self.directory = directory
+        self.format = fmt
+        self.specs = specs
+
+    def path(self, entity_type: str) -> Path:
+        """Location of an entity type's table."""
+        return self.directory / f"{entity_type}{COLUMNAR_FORMATS[self.format]}"
+
+    def schema(self, entity_type: str) -> "pyarrow.Schema":
+        """Arrow schema of an entity type's table."""
+        coordinate = pyarrow.struct([("lat", pyarrow.int64()), ("lng", pyarrow.int64())])
+        types = {
+            "string": pyarrow.string(),
+            "optional": pyarrow.string(),
+            "number": pyarrow.int64(),
+            "array": pyarrow.list_(pyarrow.string()),
+            "polygon": pyarrow.list_(coordinate),
+        }
+        fields = []
+        for column in self.specs[entity_type].columns:
+            if column.kind == "coordinates":
+                fields.append((f"{column.name}.lat", pyarrow.int64()))
+                fields.append((f"{column.name}.lng", pyarrow.int64()))
+            else:
+                fields.append((column.name, types.get(column.kind, pyarrow.string())))
+        return pyarrow.schema(fields)
+
+    def encode(self, entity_type: str, records: Sequence[Mapping], schema: "pyarrow.Schema") -> "pyarrow.RecordBatch":
+        """Turn records into a record batch of ``schema``."""
+        arrays = []
+        for column in self.specs[entity_type].columns:
+            name, kind = column.name, column.kind
+            if kind == "coordinates":
+                arrays.append(pyarrow.array([record[name]["lat"] for record in records], pyarrow.int64()))
+                arrays.append(pyarrow.array([record[name]["lng"] for record in records], pyarrow.int64()))
+                continue
+
+            values = [record[name] for record in records]
+            field_type = schema.field(name).type
+            if kind == "polygon":
+                values = [[{"lat": vertex["lat"], "lng": vertex["lng"]} for vertex in ring] for ring in values]
+            elif field_type == pyarrow.string() and kind not in ("string", "optional"):
+                values = [None if value is None else json.dumps(value, ensure_ascii=False, default=json_default) for value in values]
+            arrays.append(pyarrow.array(values, field_type))
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def decode(self, entity_type: str, table: "pyarrow.Table") -> List[RecordModel]:
+        """Rebuild record models from a table."""
+        spec = self.specs[entity_type]
+        columns = []
+        for column in spec.columns:
+            name, kind = column.name, column.kind
+            if kind == "coordinates":
+                lats = table.column(f"{name}.lat").to_pylist()
+                lngs = table.column(f"{name}.lng").to_pylist()
+                columns.append([CoordinateRecord(lat, lng) for lat, lng in zip(lats, lngs)])
+                continue
+
+            values = table.column(name).to_pylist()
+            if kind == "polygon":
+                values = [[CoordinateRecord(vertex["lat"], vertex["lng"]) for vertex in ring] for ring in values]
+            elif table.schema.field(name).type == pyarrow.string() and kind not in ("string", "optional"):
+                values = [None if value is None else json.loads(value) for value in values]
+            columns.append(values)
+        return [spec.model(*values) for values in zip(*columns)]
+
+    def info_path(self, entity_type: str) -> Path:
+        """Location of the JSON file next to a table holding its fingerprint and coercion warnings."""
+        path = self.path(entity_type)
+        return path.with_name(f"{path.name}.json")
+
+    def load(self, entity_type: str, fingerprint: str) -> Optional[Tuple[Iterator[RecordModel], List[Diagnostic], int]]:
+        """
+        Return the cached records and warnings of a table written for ``fingerprint``.
+
+        The table and its info file must both carry the fingerprint. Records
+        are decoded one batch at a time as they are consumed.
+
+        Returns:
+            (records, coercion warnings, number of warnings dropped over the
+            diagnostics cap), or None if there is no table for this
+            fingerprint or it cannot be read
+        """
+        path = self.path(entity_type)
+        if not path.exists():
+            return None
+        try:
+            with open(self.info_path(entity_type), "r", encoding="utf-8") as f:
+                info = json.load(f)
+            if self.format == "parquet":
+                source = pyarrow.parquet.ParquetFile(path)
+                schema = source.schema_arrow
+            else:
+                source = pyarrow.ipc.open_file(pyarrow.memory_map(str(path)))
+                schema = source.schema
+            if info["fingerprint"] != fingerprint or (schema.metadata or {}).get(self.METADATA_KEY) != fingerprint.encode("utf-8"):
+                return None
+            return self._iter_decoded(entity_type, source), Diagnostic.restore(info["warnings"]), info.get("suppressed", 0)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _iter_decoded(self, entity_type: str, source: Any) -> Iterator[RecordModel]:
+        """Decode the record batches of an open table in order."""
+        if self.format == "parquet":
+            batches = source.iter_batches(batch_size=self.BATCH_ROWS)
+        else:
+            batches = (source.get_batch(i) for i in range(source.num_record_batches))
+        for batch in batches:
+            yield from self.decode(entity_type, batch)
+
+    def writer(self, entity_type: str, fingerprint: str) -> "ColumnarStore.Writer":
+        """Start a table for the records of one conversion."""
+        return self.Writer(self, entity_type, fingerprint)
+
+    class Writer:
+        """
+        Writes records to a table in ``BATCH_ROWS`` batches as they arrive.
+
+        The batches go to the table's temporary path; ``finish`` closes the
+        file, moves it into place and writes the info file, and ``abort``
+        discards it.
+        """
+
+        def __init__(self, store: "ColumnarStore", entity_type: str, fingerprint: str):
+            self.store = store
+            self.entity_type = entity_type
+            self.fingerprint = fingerprint
+            self.path = store.path(entity_type)
+            self.schema = store.schema(entity_type).with_metadata({store.METADATA_KEY: fingerprint.encode("utf-8")})
+            self._pending: List[Mapping] = []
+            self._sink: Any = None
+            self._out: Any = None
+
+        def add(self, record: Mapping) -> None:
+            self._pending.append(record)
+            if len(self._pending) >= self.store.BATCH_ROWS:
+                self._flush()
+
+        def _flush(self) -> None:
+            if not self._pending:
+                return
+            batch = self.store.encode(self.entity_type, self._pending, self.schema)
+            self._pending = []
+            if self._out is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = temporary_path(self.path)
+                if self.store.format == "parquet":
+                    self._out = pyarrow.parquet.ParquetWriter(tmp_path, self.schema)
+                else:
+                    self._sink = pyarrow.OSFile(str(tmp_path), "wb")
+                    self._out = pyarrow.ipc.new_file(self._sink, self.schema)
+            self._out.write_batch(batch)
+
+        def _close(self) -> None:
+            if self._out is not None:
+                self._out.close()
+                self._out = None
+            if self._sink is not None:
+                self._sink.close()
+                self._sink = None
+
+        def finish(self, warnings: List[Diagnostic], suppressed: int = 0) -> Path:
+            """Publish the table with the coercion warnings to replay on a cache hit."""
+            try:
+                self._flush()
+                with atomic_path(self.path):
+                    self._close()
+            except BaseException:
+                self.abort()
+                raise
+            info = {"fingerprint": self.fingerprint, "warnings": warnings, "suppressed": suppressed}
+            with atomic_write(self.store.info_path(self.entity_type)) as f:
+                json.dump(info, f, default=json_default)
+            return self.path
+
+        def abort(self) -> None:
+            """Discard the partially written table, leaving the published one in place."""
+            self._pending = []
+            self._close()
+            temporary_path(self.path).unlink(missing_ok=True)
+
+
+class ReferenceCollector:
+    """
+    Keeps the ids and reference fields of an entity type for the reference check.
+
+    Each record is reduced to its ``id`` and the fields listed for its
+    entity type in ``REFERENCE_FIELDS`` as it arrives. ``finish`` writes
+    this projection to the cache directory together with the SHA-256 of
+    the output it was taken from, so the reference check never has to read
+    an output back into memory, including outputs converted by ``--jobs``
+    workers or skipped as unchanged.
+    """
+
+    DIRNAME = "references"
+
+    def __init__(self, converter: "CSVToJSONConverter", entity_type: str):
+        """
+        Args:
+            converter: Converter whose output the projection belongs to
+            entity_type: Type of entity being converted
+        """
+        self.converter = converter
+        self.entity_type = entity_type
+        self.fields = [field for source_type, field, _ in REFERENCE_FIELDS if source_type == entity_type]
+        self.records: List[Dict[str, Any]] = []
+
+    def add(self, record: Mapping) -> None:
+        """Keep the id and reference fields of a record."""
+        projected = {"id": record.get("id")}
+        for field in self.fields:
+            outer = field.split(".", 1)[0]
+            projected[outer] = self._project(record, field)
+        self.records.append(projected)
+
+    @classmethod
+    def _project(cls, record: Mapping, field: str) -> Any:
+        """Value of ``field`` (a dotted path through lists of objects) reduced to that path."""
+        if "." not in field:
+            return record.get(field)
+        outer, inner = field.split(".", 1)
+        return [
+            {inner.split(".", 1)[0]: cls._project(item, inner)}
+            for item in record.get(outer) or []
+            if isinstance(item, Mapping)
+        ]
+
+    def finish(self) -> str:
+        """
+        Write the projection (a failed write only costs a full read later).
+
+        Returns:
+            Summary line for the console
+        """
+        converter = self.converter
+        output_path = converter.output_dir / f"{self.entity_type}.json"
+        path = self.path(converter.cache_dir, self.entity_type)
+        data = {"outputSha256": file_sha256(output_path), "records": self.records}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            converter._replace_file(path, converter.json_backend.dumps(data, compact=True))
+        except OSError as e:
+            converter.warnings.append(f"Could not write the reference index for {output_path.name}: {e}")
+        return f"Indexed {len(self.records)} record(s) for the reference check"
+
+    def abort(self) -> None:
+        """Drop the collected projection."""
+        self.records = []
+
+    @classmethod
+    def path(cls, cache_dir: Path, entity_type: str) -> Path:
+        """Location of an entity type's projection."""
+        return cache_dir / cls.DIRNAME / f"{entity_type}.json"
+
+    @classmethod
+    def load(cls, converter: "CSVToJSONConverter", entity_type: str) -> Optional[List[Dict[str, Any]]]:
+        """The projection of the current output, or None if it is missing or stale."""
+        output_path = converter.output_dir / f"{entity_type}.json"
+        try:
+            with open(cls.path(converter.cache_dir, entity_type), "r", encoding="utf-8") as f:
+                data = converter.json_backend.loads(f.read())
+            if data.get("outputSha256") == file_sha256(output_path):
+                return data["records"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+        return None
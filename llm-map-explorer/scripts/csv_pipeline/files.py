@@ -0,0 +1,57 @@
+"""
+Atomic file replacement and output file helpers.
+"""
+
+import hashlib
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+
+def temporary_path(path: Path) -> Path:
+    """Hidden sibling of ``path`` that a new version is written to before it is moved into place."""
+    return path.with_name(f".{path.name}.tmp")
+
+
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    """
+    Yield the temporary path for ``path`` and move it over ``path`` on success.
+
+    Readers only ever see the previous file or the complete new one. If the
+    block raises, the temporary file is removed; if the block removes it
+    (or never creates it), ``path`` is left untouched.
+    """
+    tmp_path = temporary_path(path)
+    try:
+        yield tmp_path
+        if tmp_path.exists():
+            os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "w") -> Iterator[IO]:
+    """Open the temporary file for ``path`` (see ``atomic_path``); text modes use UTF-8."""
+    encoding = None if "b" in mode else "utf-8"
+    with atomic_path(path) as tmp_path, open(tmp_path, mode, encoding=encoding) as f:
+        yield f
+
+
+def file_sha256(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def remove_output(output_path: Path) -> None:
+    """Remove a derived output and its precompressed copies."""
+    for path in (output_path, output_path.with_name(f"{output_path.name}.gz"), output_path.with_name(f"{output_path.name}.br")):
+        if path.exists():
+            path.unlink()
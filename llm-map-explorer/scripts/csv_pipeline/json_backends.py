@@ -0,0 +1,263 @@
+"""
+JSON encoding: the stdlib reference backend, faster optional backends that
+must reproduce its output byte for byte, and the hand-edited file layout.
+"""
+
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+from csv_pipeline.records import CoordinateRecord, Diagnostic, RecordModel
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON backend
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional: faster JSON backend
+    msgspec = None
+
+
+# JSON backends selectable with --json-backend ("auto" picks the fastest
+# installed backend that reproduces stdlib json output byte for byte)
+JSON_BACKENDS = ("auto", "json", "orjson", "msgspec")
+
+
+def json_default(obj: Any) -> Any:
+    """``default`` hook that serializes record models like dicts (and diagnostics)."""
+    if isinstance(obj, (RecordModel, Diagnostic)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def format_hand_edited_json(obj: Any, indent: int = 0) -> str:
+    """
+    Serialize ``obj`` in the layout of a hand-edited JSON file.
+
+    Like ``json.dumps(obj, indent=2, ensure_ascii=False)``, except that
+    arrays holding only scalars stay on one line (``["a", "b"]``).
+    """
+    if isinstance(obj, RecordModel):
+        obj = obj.to_dict()
+    if isinstance(obj, dict) and obj:
+        inner = " " * (indent + 2)
+        items = [
+            f"{inner}{json.dumps(key, ensure_ascii=False)}: {format_hand_edited_json(value, indent + 2)}"
+            for key, value in obj.items()
+        ]
+        return "{\n" + ",\n".join(items) + "\n" + " " * indent + "}"
+    if isinstance(obj, (list, tuple)) and obj:
+        if not any(isinstance(value, (dict, list, tuple, RecordModel)) for value in obj):
+            return "[" + ", ".join(json.dumps(value, ensure_ascii=False) for value in obj) + "]"
+        inner = " " * (indent + 2)
+        items = [f"{inner}{format_hand_edited_json(value, indent + 2)}" for value in obj]
+        return "[\n" + ",\n".join(items) + "\n" + " " * indent + "]"
+    return json.dumps(obj, ensure_ascii=False, default=json_default)
+
+
+class JSONBackend:
+    """
+    Stdlib ``json`` encoder/decoder; the reference for all other backends.
+
+    ``dumps`` writes exactly what ``json.dumps`` writes for the output
+    profile (``indent=2`` or compact separators, ASCII-only escapes), so
+    output files are byte-identical whichever backend is active.
+    """
+
+    name = "json"
+
+    def loads(self, text: Union[str, bytes]) -> Any:
+        """Parse a JSON document."""
+        return json.loads(text)
+
+    def dumps(self, obj: Any, compact: bool = False) -> str:
+        """Serialize like ``json.dumps`` with the given profile."""
+        if compact:
+            return json.dumps(obj, separators=(",", ":"), default=json_default)
+        return json.dumps(obj, indent=2, default=json_default)
+
+
+class _FastJSONBackend(JSONBackend, ABC):
+    """
+    Base for native encoders whose raw output differs from stdlib json.
+
+    Native encoders write non-ASCII characters unescaped and format some
+    floats differently (``0.00001`` or ``1e-5`` instead of ``1e-05``);
+    ``dumps`` rewrites both to the stdlib form. Documents the native decoder
+    rejects are re-parsed with stdlib json so results and error messages
+    match. That includes ``NaN``/``Infinity``, which stdlib accepts and
+    native encoders would write as ``null``; once one has been parsed,
+    ``dumps`` hands over to stdlib json for the rest of that backend
+    instance's life (each converter gets its own). Native codecs only handle 64-bit
+    integers: documents with longer digit runs are parsed with stdlib json
+    (native decoders would turn them into floats), and objects the native
+    encoder rejects are written with stdlib json.
+    """
+
+    def __init__(self):
+        self.non_finite = False
+
+    _NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+    # Mismatching floats contain "0.0000" or a digit followed by an exponent;
+    # digits are folded to "0" so fast substring searches find both, and the
+    # regex pass below only runs on documents that may need it
+    _EXPONENT_FOLD = bytes.maketrans(b"123456789E", b"000000000e")
+    # Numbers start after one of these; hex colours ("#1e4a2b") and other
+    # words containing a digit and an "e" do not
+    _NUMBER_PREFIX = frozenset(b"[:, \n")
+    # Integers with this many digits may not fit in 64 bits
+    _LONG_DIGITS = b"0" * 19
+    # Strings are matched (and kept) first so numbers inside them are left alone;
+    # floats below 1e-4 are the ones stdlib writes with an exponent
+    _FLOAT_RE = re.compile(
+        r'"(?:[^"\\]|\\.)*"|(?<![\w.])-?(?:\d+(?:\.\d+)?[eE][-+]?\d+|0\.0000\d+)'
+    )
+
+    @abstractmethod
+    def _encode(self, obj: Any, compact: bool) -> bytes:
+        """Serialize with the native encoder (UTF-8, indented unless ``compact``)."""
+
+    @abstractmethod
+    def _decode(self, text: Union[str, bytes]) -> Any:
+        """Parse with the native decoder."""
+
+    def loads(self, text: Union[str, bytes]) -> Any:
+        data = text.encode("utf-8") if isinstance(text, str) else text
+        if self._LONG_DIGITS not in data.translate(self._EXPONENT_FOLD):
+            try:
+                return self._decode(text)
+            except Exception:
+                pass
+        return json.loads(text, parse_constant=self._parse_constant)
+
+    def _parse_constant(self, name: str) -> float:
+        self.non_finite = True
+        return float(name)
+
+    def dumps(self, obj: Any, compact: bool = False) -> str:
+        if self.non_finite:
+            return super().dumps(obj, compact)
+        try:
+            data = self._encode(obj, compact)
+        except (TypeError, ValueError, OverflowError):
+            # e.g. integers beyond 64 bits (orjson.JSONEncodeError is a TypeError)
+            return super().dumps(obj, compact)
+        text = data.decode("utf-8")
+        if not data.isascii():
+            text = self._NON_ASCII_RE.sub(self._escape_non_ascii, text)
+        if self._may_have_mismatching_floats(data):
+            text = self._FLOAT_RE.sub(self._format_float, text)
+        return text
+
+    @classmethod
+    def _may_have_mismatching_floats(cls, data: bytes) -> bool:
+        """Whether a number in ``data`` may be formatted unlike stdlib json."""
+        folded = data.translate(cls._EXPONENT_FOLD)
+        for needle in (b"0e", b"0.0000"):
+            found = folded.find(needle)
+            while found != -1:
+                start = found
+                while start and folded[start - 1] in b"0.-":
+                    start -= 1
+                if not start or folded[start - 1] in cls._NUMBER_PREFIX:
+                    return True
+                found = folded.find(needle, found + 1)
+        return False
+
+    @staticmethod
+    def _escape_non_ascii(match: "re.Match[str]") -> str:
+        code = ord(match.group())
+        if code > 0xFFFF:
+            code -= 0x10000
+            return "\\u%04x\\u%04x" % (0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF))
+        return "\\u%04x" % code
+
+    @staticmethod
+    def _format_float(match: "re.Match[str]") -> str:
+        token = match.group()
+        return token if token.startswith('"') else repr(float(token))
+
+
+class OrjsonBackend(_FastJSONBackend):
+    """JSON backend using the optional ``orjson`` package."""
+
+    name = "orjson"
+
+    def _encode(self, obj: Any, compact: bool) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (0 if compact else orjson.OPT_INDENT_2)
+        return orjson.dumps(obj, default=json_default, option=option)
+
+    def _decode(self, text: Union[str, bytes]) -> Any:
+        return orjson.loads(text)
+
+
+class MsgspecBackend(_FastJSONBackend):
+    """JSON backend using the optional ``msgspec`` package."""
+
+    name = "msgspec"
+
+    def _encode(self, obj: Any, compact: bool) -> bytes:
+        encoded = msgspec.json.encode(obj, enc_hook=json_default)
+        return encoded if compact else msgspec.json.format(encoded, indent=2)
+
+    def _decode(self, text: Union[str, bytes]) -> Any:
+        return msgspec.json.decode(text)
+
+
+# Covers the cases where native encoders and stdlib json disagree
+_JSON_PROBE = {
+    "text": ["caf\u00e9", "\U0001f600", "\u2028", "tab\t", "\x01", 'quote " \\ 1e5'],
+    "numbers": [0, -1, 2 ** 53, 2 ** 64, -(10 ** 30), 0.1, -2.5, 10.00001, 0.0001, 1e-05, -3.2e-05, 1.5e-07, 1e16, 1.2345678901234568e17, 1e300],
+    "nested": {"empty": {}, "list": [], "flags": [True, False, None]},
+    "records": [CoordinateRecord(lat=1200, lng=800)],
+}
+
+
+def get_json_backend(name: str = "auto") -> JSONBackend:
+    """
+    Return a JSON backend by name.
+
+    Args:
+        name: One of ``JSON_BACKENDS``; "auto" picks orjson, then msgspec,
+            then stdlib json
+
+    Returns:
+        Backend instance
+
+    Raises:
+        ValueError: If the backend is unknown, not installed, or does not
+            reproduce stdlib json output
+    """
+    candidates = {"orjson": (orjson, OrjsonBackend), "msgspec": (msgspec, MsgspecBackend)}
+    if name == "json":
+        return JSONBackend()
+    if name == "auto":
+        for candidate in candidates:
+            try:
+                return get_json_backend(candidate)
+            except ValueError:
+                continue
+        return JSONBackend()
+    if name not in candidates:
+        raise ValueError(f"Unknown JSON backend '{name}' (choose from {', '.join(JSON_BACKENDS)})")
+
+    module, backend_class = candidates[name]
+    if module is None:
+        raise ValueError(f"JSON backend '{name}' is not installed")
+    backend = backend_class()
+    reference = JSONBackend()
+    for compact in (False, True):
+        try:
+            expected = reference.dumps(_JSON_PROBE, compact)
+            matches = (
+                backend.dumps(_JSON_PROBE, compact) == expected
+                and reference.dumps(backend.loads(expected), compact) == expected
+            )
+        except Exception:
+            matches = False
+        if not matches:
+            raise ValueError(f"JSON backend '{name}' does not reproduce stdlib json output")
+    return backend
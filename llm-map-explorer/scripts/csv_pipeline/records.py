@@ -0,0 +1,256 @@
+"""
+Record models and diagnostics shared by the converter and its caches.
+"""
+
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, fields as dataclass_fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Fields holding ids of other records: (entity type, field, referenced entity
+# type); dotted fields reach into a list of objects (tour stages)
+REFERENCE_FIELDS = (
+    ("capabilities", "relatedLandmarks", "landmarks"),
+    ("capabilities", "parentCapabilityId", "capabilities"),
+    ("landmarks", "capabilityId", "capabilities"),
+    ("landmarks", "relatedLandmarks", "landmarks"),
+    ("organizations", "landmarkIds", "landmarks"),
+    ("tours", "stages.landmarkIds", "landmarks"),
+)
+
+
+class RecordModel(Mapping):
+    """
+    Base of the typed, slotted record models built by coercion.
+
+    A model stores its fields in ``__slots__`` (Python 3.10+) instead of a
+    per-record dict, in ``FIELDS`` order, which is also the JSON key order.
+    Models are read-only mappings (``record["id"]``, ``record.get``, ``==``
+    against dicts), so stages work the same on freshly coerced records and
+    on records loaded back from JSON or the row cache.
+    """
+
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the fields in JSON key order."""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+def _record_model(cls: type) -> type:
+    """Make ``cls`` a record model dataclass (slotted on Python 3.10+)."""
+    options = {"slots": True} if sys.version_info >= (3, 10) else {}
+    model = dataclass(eq=False, **options)(cls)
+    model.FIELDS = tuple(field.name for field in dataclass_fields(model))
+    return model
+
+
+@_record_model
+class CoordinateRecord(RecordModel):
+    """Map position in CRS.Simple pixels."""
+
+    lat: int
+    lng: int
+
+
+@_record_model
+class CapabilityRecord(RecordModel):
+    """Coerced row of capabilities.csv."""
+
+    id: str
+    name: str
+    description: str
+    shortDescription: str
+    level: str
+    polygonCoordinates: List[CoordinateRecord]
+    visualStyleHints: Any
+    relatedLandmarks: List[str]
+    parentCapabilityId: Optional[str]
+    zoomThreshold: int
+
+
+@_record_model
+class LandmarkRecord(RecordModel):
+    """Coerced row of landmarks.csv."""
+
+    id: str
+    name: str
+    type: str
+    year: int
+    organization: str
+    authors: List[str]
+    description: str
+    abstract: Optional[str]
+    externalLinks: Any
+    coordinates: CoordinateRecord
+    capabilityId: str
+    relatedLandmarks: List[str]
+    tags: List[str]
+    icon: Optional[str]
+    metadata: Any
+    zoomThreshold: int
+
+
+@_record_model
+class OrganizationRecord(RecordModel):
+    """Coerced row of organizations.csv."""
+
+    id: str
+    name: str
+    description: str
+    website: Optional[str]
+    landmarkIds: List[str]
+    color: str
+    logo: Optional[str]
+
+
+@_record_model
+class TourStageRecord(RecordModel):
+    """One stage of a tour."""
+
+    index: int
+    title: str
+    description: str
+    narration: str
+    landmarkIds: List[str]
+    mapCenter: CoordinateRecord
+    mapZoom: int
+
+
+@_record_model
+class TourRecord(RecordModel):
+    """Coerced row of tours.csv."""
+
+    id: str
+    title: str
+    description: str
+    difficulty: str
+    estimatedDuration: int
+    tags: List[str]
+    stages: List[TourStageRecord]
+
+
+class Diagnostic:
+    """
+    A warning or error with its location, formatted only when reported.
+
+    Hot loops record a message template with its arguments and where the
+    problem is (file, CSV row, record, field, polygon vertex) instead of
+    building the text, which matters when a broken sheet produces a
+    diagnostic per vertex. ``str()`` gives the report line; a diagnostic
+    compares equal to (and supports ``in`` like) that line, so code that
+    treats warnings as strings keeps working.
+    """
+
+    __slots__ = ("message", "args", "severity", "file", "row", "entity", "field", "vertex")
+
+    def __init__(
+        self,
+        message: str,
+        *args: Any,
+        severity: str = "warning",
+        file: Optional[str] = None,
+        row: Optional[int] = None,
+        entity: Optional[str] = None,
+        field: Optional[str] = None,
+        vertex: Optional[int] = None,
+    ):
+        """
+        Args:
+            message: Message, a ``str.format`` template when ``args`` are given
+            args: Template arguments
+            severity: "warning" or "error"
+            file: CSV file name
+            row: CSV row number (header is row 1)
+            entity: Record the problem is in (e.g. "Landmark 'lm-001'")
+            field: Field (or reference path) the problem is in
+            vertex: 1-based polygon vertex index
+        """
+        self.message = message
+        self.args = args
+        self.severity = severity
+        self.file = file
+        self.row = row
+        self.entity = entity
+        self.field = field
+        self.vertex = vertex
+
+    @staticmethod
+    def format_location(entity: Optional[str], field: Optional[str] = None, vertex: Optional[int] = None) -> str:
+        """Describe a place in a record, e.g. "Capability 'cap-001' polygon vertex 3"."""
+        if entity is None:
+            return ""
+        if vertex is not None:
+            return f"{entity} polygon vertex {vertex}"
+        return f"{entity} {field}" if field else entity
+
+    @property
+    def text(self) -> str:
+        """The message without its location."""
+        return self.message.format(*self.args) if self.args else self.message
+
+    def __str__(self) -> str:
+        parts = (
+            self.file,
+            None if self.row is None else f"Row {self.row}",
+            self.format_location(self.entity, self.field, self.vertex),
+            self.text,
+        )
+        return ": ".join(part for part in parts if part)
+
+    def __repr__(self) -> str:
+        return f"Diagnostic({str(self)!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Diagnostic, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __contains__(self, text: str) -> bool:
+        return text in str(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Location fields and formatted message, e.g. for machine-readable reports."""
+        return {
+            "severity": self.severity,
+            "file": self.file,
+            "row": self.row,
+            "entity": self.entity,
+            "field": self.field,
+            "vertex": self.vertex,
+            "message": self.text,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Diagnostic":
+        """Rebuild a diagnostic serialized with ``to_dict``."""
+        return cls(
+            data["message"],
+            severity=data.get("severity", "warning"),
+            file=data.get("file"),
+            row=data.get("row"),
+            entity=data.get("entity"),
+            field=data.get("field"),
+            vertex=data.get("vertex"),
+        )
+
+    @classmethod
+    def restore(cls, items: Iterable[Any]) -> List[Any]:
+        """Turn serialized diagnostics back into objects (plain strings stay strings)."""
+        return [cls.from_dict(item) if isinstance(item, dict) else item for item in items]
@@ -0,0 +1,326 @@
+"""
+Downloads of the sheet CSV exports listed in csv/sheets.json (--fetch-sheets).
+"""
+
+import hashlib
+import http.client
+import json
+import ssl
+import threading
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from csv_pipeline.files import atomic_path, atomic_write, file_sha256
+
+
+# Downloads run at most this many at a time, failing a download that stalls
+# this long
+SHEET_FETCH_CONNECTIONS = 4
+SHEET_FETCH_TIMEOUT_SECONDS = 30
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections shared by download threads.
+
+    ``request`` takes an idle connection to the URL's origin (or opens one),
+    and hands it back once the response body has been read to the end, so
+    the next request to that origin, including a redirect to it, reuses the
+    TCP and TLS session. Proxies from the environment (``https_proxy`` and
+    friends) are honoured, with a CONNECT tunnel for https.
+    """
+
+    def __init__(self, timeout: float):
+        """
+        Args:
+            timeout: Seconds to wait for each network read or write
+        """
+        self.timeout = timeout
+        self.opened = 0
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    @contextmanager
+    def request(self, url: str, headers: Dict[str, str]) -> Iterator[http.client.HTTPResponse]:
+        """
+        Send a GET request and yield the response.
+
+        The connection goes back to the pool only if the block read the
+        whole body (even if it then raised) and the server keeps it open;
+        otherwise it is closed.
+
+        Raises:
+            OSError: On network errors and timeouts
+        """
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80))
+        proxy = self._proxy(parts.scheme, origin[1])
+        # Plain http through a proxy sends the absolute URL
+        target = url if proxy is not None and parts.scheme == "http" else urlunsplit(("", "", parts.path or "/", parts.query, ""))
+
+        while True:
+            connection, reused = self._acquire(origin, proxy)
+            try:
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+                break
+            except ConnectionError:
+                connection.close()
+                if not reused:
+                    raise
+                # The server closed the idle connection; retry on a new one
+            except BaseException:
+                connection.close()
+                raise
+
+        try:
+            yield response
+        finally:
+            if response.will_close or not response.isclosed():
+                connection.close()
+            else:
+                with self._lock:
+                    self._idle[origin].append(connection)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+    def _acquire(
+        self, origin: Tuple[str, str, int], proxy: Optional[Tuple[str, int]]
+    ) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return an idle connection to ``origin`` (and True), or a new one (and False)."""
+        with self._lock:
+            if self._idle[origin]:
+                return self._idle[origin].pop(), True
+            self.opened += 1
+
+        scheme, host, port = origin
+        connect_host, connect_port = proxy or (host, port)
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            connection: http.client.HTTPConnection = http.client.HTTPSConnection(
+                connect_host, connect_port, timeout=self.timeout, context=self._ssl_context
+            )
+            if proxy is not None:
+                connection.set_tunnel(host, port)
+        else:
+            connection = http.client.HTTPConnection(connect_host, connect_port, timeout=self.timeout)
+        return connection, False
+
+    @staticmethod
+    def _proxy(scheme: str, host: str) -> Optional[Tuple[str, int]]:
+        """Proxy host and port for ``scheme`` from the environment, unless ``host`` bypasses it."""
+        proxy = urllib.request.getproxies().get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        return parts.hostname or "", parts.port or 80
+
+
+class SheetFetcher:
+    """
+    Downloads sheet CSV exports into the CSV directory.
+
+    ``csv/sheets.json`` maps CSV file names to export URLs, for example a
+    Google Sheets ``.../export?format=csv&gid=<tab>`` link per file. The
+    exports are requested concurrently by ``connections`` threads sharing a
+    ``ConnectionPool``, so later exports and redirects reuse keep-alive
+    connections. Each response body is streamed in chunks through
+    ``atomic_path`` into the CSV file and hashed on the way; the CSV is
+    replaced only when the download completes with new content. (The
+    download has to land in the CSV directory: the conversion reads it from
+    there, and the conditional requests of the next fetch rely on it.)
+
+    The ETag and Last-Modified of every export are kept in the cache
+    directory and sent back as If-None-Match/If-Modified-Since, so an
+    unchanged sheet costs a 304 without a body. They are only sent while the
+    local CSV is still the downloaded one (same size and mtime); after a
+    local edit the export is downloaded in full.
+    """
+
+    STATE_FILENAME = "sheet-exports.json"
+    CHUNK_SIZE = 64 * 1024
+    MAX_REDIRECTS = 5
+
+    def __init__(
+        self,
+        csv_dir: Path,
+        cache_dir: Path,
+        connections: int = SHEET_FETCH_CONNECTIONS,
+        timeout: float = SHEET_FETCH_TIMEOUT_SECONDS,
+        user_agent: str = "csv-to-json",
+    ):
+        """
+        Args:
+            csv_dir: Directory the CSV files are written to
+            cache_dir: Directory holding the ETag/Last-Modified state
+            connections: Maximum concurrent downloads
+            timeout: Seconds to wait for each network read or write
+            user_agent: User-Agent header sent with every request
+        """
+        self.csv_dir = csv_dir
+        self.state_path = cache_dir / self.STATE_FILENAME
+        self.connections = connections
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.state = self._load_state()
+        self.pool = ConnectionPool(timeout)
+
+    @staticmethod
+    def load_sources(path: Path) -> Dict[str, str]:
+        """
+        Read the CSV file name to export URL mapping.
+
+        Raises:
+            ValueError: If the file is missing, is not a JSON object or
+                maps anything but CSV file names to http(s) URLs
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                sources = json.load(f)
+        except OSError as e:
+            raise ValueError(f"Cannot read sheet sources {path}: {e.strerror}")
+        except ValueError as e:
+            raise ValueError(f"{path.name}: Invalid JSON: {e}")
+
+        if not isinstance(sources, dict) or not sources:
+            raise ValueError(f"{path.name}: Expected an object mapping CSV file names to export URLs")
+        for name, url in sources.items():
+            if Path(name).name != name or not name.endswith(".csv"):
+                raise ValueError(f"{path.name}: '{name}' is not a CSV file name")
+            if not isinstance(url, str) or urlsplit(url).scheme not in ("http", "https"):
+                raise ValueError(f"{path.name}: {name}: Expected an http(s) URL")
+        return sources
+
+    def fetch(self, sources: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Download every export and update ``state`` (see ``save_state``).
+
+        Args:
+            sources: CSV file name to export URL
+
+        Returns:
+            Result per CSV file name, in name order: ``status`` ("fetched",
+            "not-modified", "unchanged" when a full download had the same
+            content, or "failed"), ``sha256`` of the local CSV (None if
+            failed), ``bytes`` downloaded and ``error`` (None unless failed)
+        """
+        names = sorted(sources)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.connections, len(names)))) as pool:
+                results = list(pool.map(lambda name: self._fetch_one(name, sources[name]), names))
+        finally:
+            self.pool.close()
+        return dict(zip(names, results))
+
+    def save_state(self) -> None:
+        """Write the ETag/Last-Modified state atomically."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.state_path) as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+
+    def _load_state(self) -> Dict[str, Any]:
+        """State of the previous fetch (empty if missing or unreadable)."""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if isinstance(state, dict):
+                return state
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _fetch_one(self, name: str, url: str) -> Dict[str, Any]:
+        """Download one export, reporting any failure in the result."""
+        try:
+            return self._fetch_sheet(name, url)
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            return {"status": "failed", "sha256": None, "bytes": 0, "error": str(e) or type(e).__name__}
+
+    def _fetch_sheet(self, name: str, url: str) -> Dict[str, Any]:
+        """
+        Download one export into ``csv_dir``.
+
+        Raises:
+            OSError: On network errors and timeouts
+            ValueError: If the server answers with an error or an HTML page
+        """
+        csv_path = self.csv_dir / name
+        entry = self.state.get(name)
+        entry = entry if isinstance(entry, dict) else {}
+        headers = {"User-Agent": self.user_agent, "Accept": "text/csv, */*"}
+        conditional = entry.get("url") == url and self._is_downloaded_copy(csv_path, entry)
+        if conditional and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if conditional and entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+
+        location = url
+        for _ in range(self.MAX_REDIRECTS + 1):
+            with self.pool.request(location, headers) as response:
+                if response.status in (301, 302, 303, 307, 308) and response.getheader("Location"):
+                    response.read()
+                    # Conditional headers are kept on the redirected request
+                    location = urljoin(location, response.getheader("Location"))
+                    continue
+                if response.status == 304 and conditional:
+                    response.read()
+                    return {"status": "not-modified", "sha256": entry["csvSha256"], "bytes": 0, "error": None}
+                if response.status != 200:
+                    response.read()
+                    raise ValueError(f"HTTP {response.status} {response.reason}".rstrip())
+                if response.getheader("Content-Type", "").startswith("text/html"):
+                    raise ValueError("Got an HTML page instead of CSV (is the sheet shared with anyone who has the link?)")
+
+                digest = hashlib.sha256()
+                size = 0
+                with atomic_path(csv_path) as tmp_path:
+                    with open(tmp_path, "wb") as f:
+                        for chunk in iter(lambda: response.read(self.CHUNK_SIZE), b""):
+                            f.write(chunk)
+                            digest.update(chunk)
+                            size += len(chunk)
+                    csv_hash = digest.hexdigest()
+                    # Keep the local copy (and its mtime) when the content is the same
+                    unchanged = csv_path.exists() and file_sha256(csv_path) == csv_hash
+                    if unchanged:
+                        tmp_path.unlink()
+                break
+        else:
+            raise ValueError(f"More than {self.MAX_REDIRECTS} redirects")
+
+        stat = csv_path.stat()
+        self.state[name] = {
+            "url": url,
+            "etag": response.getheader("ETag"),
+            "lastModified": response.getheader("Last-Modified"),
+            "csvSha256": csv_hash,
+            "mtimeNs": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+        return {"status": "unchanged" if unchanged else "fetched", "sha256": csv_hash, "bytes": size, "error": None}
+
+    @staticmethod
+    def _is_downloaded_copy(csv_path: Path, entry: Dict[str, Any]) -> bool:
+        """Check that the local CSV was not touched since it was downloaded."""
+        try:
+            stat = csv_path.stat()
+        except OSError:
+            return False
+        return (
+            isinstance(entry.get("csvSha256"), str)
+            and entry.get("mtimeNs") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size
+        )
@@ -0,0 +1,685 @@
+"""
+Writers of the derived outputs: landmark shards, the spatial index,
+simplified capability geometry, tour bundles, hashed copies with their
+manifest, and the prebuilt search index.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+from collections import defaultdict
+from math import ceil, hypot
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from csv_pipeline.files import atomic_path, file_sha256, remove_output, temporary_path
+
+
+# Landmark sharding modes and the record field each one groups by
+SHARD_FIELDS = {"capability": "capabilityId", "zoom": "zoomThreshold"}
+
+# Map zoom levels (MapContainer minZoom..maxZoom) that get simplified polygons
+GEOMETRY_ZOOM_LEVELS = (-1, 0, 1, 2)
+
+# Searchable fields and weights of the prebuilt search index (mirrors the
+# Fuse.js keys in src/lib/search.ts), per entity type and its search label
+SEARCH_FIELDS = ("name", "tags", "description", "authors")
+SEARCH_WEIGHTS = (2, 1.5, 1, 1)
+SEARCH_ENTITIES = {"capabilities": "capability", "landmarks": "landmark", "organizations": "organization"}
+
+
+class LandmarkShardWriter:
+    """
+    Splits landmark records into per-shard JSON files plus an index.
+
+    Records are grouped by ``capabilityId`` or ``zoomThreshold`` and written
+    to ``<output_dir>/landmarks/<shard>.json`` as they arrive, so the writer
+    works with both the batch and the streaming conversion paths. The index
+    lists each shard's URL, record count and bounding box so the client can
+    fetch only the shards it needs.
+
+    At most ``MAX_OPEN_SHARDS`` shard files are open at a time; the least
+    recently written one is closed and reopened for appending when its
+    next record arrives.
+    """
+
+    MAX_OPEN_SHARDS = 64
+
+    def __init__(self, converter: "CSVToJSONConverter", shard_by: str):
+        """
+        Args:
+            converter: Converter whose output settings the shards follow
+            shard_by: Sharding mode (a key of ``SHARD_FIELDS``)
+        """
+        self.converter = converter
+        self.field = SHARD_FIELDS[shard_by]
+        self.shard_dir = converter.output_dir / "landmarks"
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self._shards: Dict[Any, Dict[str, Any]] = {}
+        self._names: Dict[str, Any] = {}
+        # Keys of the shards with an open file, least recently written first
+        self._open: Dict[Any, None] = {}
+
+    @staticmethod
+    def shard_name(field: str, key: Any) -> str:
+        """
+        File stem for a shard key (safe for URLs and file systems).
+
+        Keys that are already safe are used as they are. Other keys (and
+        "index", which would replace the index file) are sanitized and get
+        a short hash of the raw key, so keys such as "a b" and "a_b" never
+        share a file.
+        """
+        if field == "zoomThreshold":
+            return f"zoom-neg{-key}" if key < 0 else f"zoom-{key}"
+        if key is None:
+            return "unassigned"
+        text = str(key)
+        name = re.sub(r"[^A-Za-z0-9_-]", "_", text)
+        if name and name == text and name != "index":
+            return name
+        return f"{name or 'unassigned'}-{hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]}"
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """
+        Append a landmark record to its shard.
+
+        Raises:
+            ValueError: If two shard keys map to the same file name
+        """
+        key = record.get(self.field)
+        shard = self._shards.get(key)
+        if shard is None:
+            name = self.shard_name(self.field, key)
+            if name in self._names:
+                raise ValueError(
+                    f"Landmark shard keys {self._names[name]!r} and {key!r} both map to landmarks/{name}.json"
+                )
+            self._names[name] = key
+            shard = {
+                "name": name,
+                "tmp_path": temporary_path(self.shard_dir / f"{name}.json"),
+                "file": None,
+                "count": 0,
+                "bounds": None,
+            }
+            self._shards[key] = shard
+
+        self.converter._write_array_element(self._file(key, shard), record, shard["count"])
+        shard["count"] += 1
+
+        coords = record.get("coordinates") or {}
+        lat, lng = coords.get("lat"), coords.get("lng")
+        if lat is not None and lng is not None:
+            bounds = shard["bounds"]
+            if bounds is None:
+                shard["bounds"] = {"north": lat, "south": lat, "east": lng, "west": lng}
+            else:
+                bounds["north"] = max(bounds["north"], lat)
+                bounds["south"] = min(bounds["south"], lat)
+                bounds["east"] = max(bounds["east"], lng)
+                bounds["west"] = min(bounds["west"], lng)
+
+    def _file(self, key: Any, shard: Dict[str, Any]) -> TextIO:
+        """Return the shard's open file, closing the least recently written one if too many are open."""
+        if shard["file"] is not None:
+            del self._open[key]
+        else:
+            if len(self._open) >= self.MAX_OPEN_SHARDS:
+                oldest = next(iter(self._open))
+                del self._open[oldest]
+                self._shards[oldest]["file"].close()
+                self._shards[oldest]["file"] = None
+            shard["file"] = open(shard["tmp_path"], "a" if shard["count"] else "w", encoding="utf-8")
+        self._open[key] = None
+        return shard["file"]
+
+    def finish(self) -> str:
+        """
+        Publish the shard files and the index, and remove stale shards.
+
+        Returns:
+            Summary line for the console
+        """
+        converter = self.converter
+        entries: List[Dict[str, Any]] = []
+        published = {"index.json"}
+        for key in sorted(self._shards, key=lambda k: (k is None, k)):
+            shard = self._shards[key]
+            shard_path = self.shard_dir / f"{shard['name']}.json"
+            # The shard was written to its temporary path as records arrived
+            with atomic_path(shard_path), self._file(key, shard) as out:
+                out.write("\n]" if converter.output_profile == "pretty" else "]")
+            shard["file"] = None
+            del self._open[key]
+            converter._compress_output(shard_path)
+            published.add(shard_path.name)
+            entries.append({
+                "key": key,
+                "url": f"{converter.public_url_prefix}/landmarks/{shard_path.name}",
+                "count": shard["count"],
+                "bounds": shard["bounds"],
+            })
+
+        index = {
+            "shardBy": self.field,
+            "total": sum(entry["count"] for entry in entries),
+            "shards": entries,
+        }
+        converter._write_output(self.shard_dir / "index.json", index)
+
+        for path in self.shard_dir.iterdir():
+            if path.is_file() and path.name.split(".json")[0] + ".json" not in published:
+                path.unlink()
+
+        return f"Wrote {len(entries)} landmark shard(s) by {self.field}"
+
+    def abort(self) -> None:
+        """Discard partially written shards, leaving the published ones in place."""
+        for shard in self._shards.values():
+            if shard["file"] is not None:
+                shard["file"].close()
+            shard["tmp_path"].unlink(missing_ok=True)
+        self._shards = {}
+        self._names = {}
+        self._open = {}
+
+    @staticmethod
+    def remove(output_dir: Path) -> None:
+        """Remove previously published shards (when sharding is turned off)."""
+        shard_dir = output_dir / "landmarks"
+        if (shard_dir / "index.json").exists():
+            for path in shard_dir.iterdir():
+                if path.is_file():
+                    path.unlink()
+            shard_dir.rmdir()
+
+
+class SpatialIndexWriter:
+    """
+    Builds a uniform-grid spatial index over landmark coordinates.
+
+    The map (``map_height`` x ``map_width`` pixels in CRS.Simple space) is
+    divided into square tiles. For each zoom band (``zoomThreshold``) the
+    index maps ``"row/col"`` tile keys to positions in ``landmarks.json``,
+    so viewport culling becomes a lookup over the visible tiles instead of
+    a scan over every landmark.
+    """
+
+    FILENAME = "landmarks.spatial.json"
+
+    def __init__(self, converter: "CSVToJSONConverter", tile_size: int):
+        """
+        Args:
+            converter: Converter whose map size and output settings to use
+            tile_size: Tile edge length in map pixels
+        """
+        self.converter = converter
+        self.tile_size = tile_size
+        self.rows = max(1, ceil(converter.map_height / tile_size))
+        self.cols = max(1, ceil(converter.map_width / tile_size))
+        self._count = 0
+        self._bands: Dict[int, Dict[str, List[int]]] = {}
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Register the next landmark (in ``landmarks.json`` order)."""
+        position = self._count
+        self._count += 1
+
+        coords = record.get("coordinates") or {}
+        lat, lng = coords.get("lat"), coords.get("lng")
+        if lat is None or lng is None:
+            return
+
+        # Out-of-bounds points (already warned about) go to the edge tiles
+        row = min(max(int(lat) // self.tile_size, 0), self.rows - 1)
+        col = min(max(int(lng) // self.tile_size, 0), self.cols - 1)
+        band = self._bands.setdefault(record.get("zoomThreshold", 0), {})
+        band.setdefault(f"{row}/{col}", []).append(position)
+
+    def finish(self) -> str:
+        """
+        Write ``landmarks.spatial.json``.
+
+        Returns:
+            Summary line for the console
+        """
+        converter = self.converter
+        index = {
+            "tileSize": self.tile_size,
+            "mapHeight": converter.map_height,
+            "mapWidth": converter.map_width,
+            "rows": self.rows,
+            "cols": self.cols,
+            "count": self._count,
+            "bands": {
+                str(zoom): dict(sorted(tiles.items(), key=lambda item: tuple(map(int, item[0].split("/")))))
+                for zoom, tiles in sorted(self._bands.items())
+            },
+        }
+        converter._write_output(converter.output_dir / self.FILENAME, index)
+
+        tiles = sum(len(band) for band in self._bands.values())
+        return f"Wrote spatial index ({tiles} tile(s), {self.tile_size}px grid)"
+
+    def abort(self) -> None:
+        """Nothing is written before ``finish``."""
+
+    @staticmethod
+    def remove(output_dir: Path) -> None:
+        """Remove a previously written index (when the index is turned off)."""
+        remove_output(output_dir / SpatialIndexWriter.FILENAME)
+
+
+class CapabilityGeometryWriter:
+    """
+    Precomputes capability polygon geometry.
+
+    For every capability it records the bounding box, area centroid and area
+    of ``polygonCoordinates``, plus Douglas–Peucker simplified vertex sets
+    for each level in ``GEOMETRY_ZOOM_LEVELS``. The tolerance is given in
+    screen pixels; at zoom ``z`` one map pixel spans ``2**z`` screen pixels
+    in CRS.Simple, so the map-pixel tolerance halves with each zoom level.
+    """
+
+    FILENAME = "capabilities.geometry.json"
+
+    def __init__(self, converter: "CSVToJSONConverter", tolerance: float):
+        """
+        Args:
+            converter: Converter whose output settings to use
+            tolerance: Simplification tolerance in screen pixels
+        """
+        self.converter = converter
+        self.tolerance = tolerance
+        self._geometry: Dict[str, Dict[str, Any]] = {}
+        self._vertices_in = 0
+        self._vertices_out = 0
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Compute geometry for one capability record."""
+        points = [(vertex["lng"], vertex["lat"]) for vertex in record.get("polygonCoordinates") or []]
+        if not points:
+            return
+
+        simplified: Dict[str, List[Dict[str, int]]] = {}
+        for zoom in GEOMETRY_ZOOM_LEVELS:
+            kept = self.simplify(points, self.tolerance / (2 ** zoom))
+            simplified[str(zoom)] = [{"lat": y, "lng": x} for x, y in kept]
+            self._vertices_out += len(kept)
+        self._vertices_in += len(points) * len(GEOMETRY_ZOOM_LEVELS)
+
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        area, cx, cy = self.area_centroid(points)
+        self._geometry[record["id"]] = {
+            "bounds": {"north": max(ys), "south": min(ys), "east": max(xs), "west": min(xs)},
+            "centroid": {"lat": round(cy, 2), "lng": round(cx, 2)},
+            "area": round(area, 2),
+            "vertexCount": len(points),
+            "simplified": simplified,
+        }
+
+    @staticmethod
+    def area_centroid(points: List[Tuple[float, float]]) -> Tuple[float, float, float]:
+        """
+        Shoelace area and area centroid of a polygon ring.
+
+        Degenerate rings (zero area) fall back to the mean of their vertices.
+
+        Returns:
+            (absolute area, centroid x, centroid y)
+        """
+        twice_area = cx = cy = 0.0
+        for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+            cross = x0 * y1 - x1 * y0
+            twice_area += cross
+            cx += (x0 + x1) * cross
+            cy += (y0 + y1) * cross
+
+        if twice_area == 0:
+            return 0.0, sum(x for x, _ in points) / len(points), sum(y for _, y in points) / len(points)
+        return abs(twice_area) / 2, cx / (3 * twice_area), cy / (3 * twice_area)
+
+    @staticmethod
+    def simplify(points: List[Tuple[float, float]], tolerance: float) -> List[Tuple[float, float]]:
+        """
+        Douglas–Peucker simplification of a closed polygon ring.
+
+        The ring is treated as a polyline from the first vertex back to
+        itself. Rings that would collapse below three vertices are returned
+        unchanged.
+
+        Args:
+            points: Ring vertices as (x, y), without a repeated closing vertex
+            tolerance: Maximum allowed deviation in map pixels
+
+        Returns:
+            The kept vertices, in input order
+        """
+        if len(points) <= 3 or tolerance <= 0:
+            return list(points)
+
+        ring = points + points[:1]
+        keep = [False] * len(ring)
+        keep[0] = keep[-1] = True
+        stack = [(0, len(ring) - 1)]
+        while stack:
+            start, end = stack.pop()
+            (ax, ay), (bx, by) = ring[start], ring[end]
+            dx, dy = bx - ax, by - ay
+            length_sq = dx * dx + dy * dy
+            farthest, max_dist = -1, tolerance
+            for i in range(start + 1, end):
+                px, py = ring[i]
+                if length_sq == 0:
+                    dist = hypot(px - ax, py - ay)
+                else:
+                    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+                    dist = hypot(px - (ax + t * dx), py - (ay + t * dy))
+                if dist > max_dist:
+                    farthest, max_dist = i, dist
+            if farthest != -1:
+                keep[farthest] = True
+                stack.append((start, farthest))
+                stack.append((farthest, end))
+
+        kept = [point for point, flag in zip(ring[:-1], keep[:-1]) if flag]
+        return kept if len(kept) >= 3 else list(points)
+
+    def finish(self) -> str:
+        """
+        Write ``capabilities.geometry.json``.
+
+        Returns:
+            Summary line for the console
+        """
+        converter = self.converter
+        output = {
+            "tolerance": self.tolerance,
+            "zoomLevels": list(GEOMETRY_ZOOM_LEVELS),
+            "capabilities": self._geometry,
+        }
+        converter._write_output(converter.output_dir / self.FILENAME, output)
+
+        return (
+            f"Wrote geometry for {len(self._geometry)} capabilities "
+            f"({self._vertices_out}/{self._vertices_in} vertices kept across zoom levels)"
+        )
+
+    def abort(self) -> None:
+        """Nothing is written before ``finish``."""
+
+    @staticmethod
+    def remove(output_dir: Path) -> None:
+        """Remove a previously written geometry file (when the stage is off)."""
+        remove_output(output_dir / CapabilityGeometryWriter.FILENAME)
+
+
+class TourBundleWriter:
+    """
+    Writes a self-contained landmark bundle per tour.
+
+    ``<output_dir>/tours/<tourId>.json`` holds only the landmarks the tour's
+    stages reference (in first-reference order) plus the bounding box of the
+    whole tour and of each stage, so a tour can start without fetching
+    ``landmarks.json``. ``tours/index.json`` lists the bundle URLs.
+    """
+
+    DIRNAME = "tours"
+
+    def __init__(self, converter: "CSVToJSONConverter"):
+        """
+        Args:
+            converter: Converter whose output settings the bundles follow
+        """
+        self.converter = converter
+        self.bundle_dir = converter.output_dir / self.DIRNAME
+
+    @staticmethod
+    def bounds(landmarks: List[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+        """Bounding box of landmark coordinates (None if there are none)."""
+        coords = [landmark["coordinates"] for landmark in landmarks if landmark.get("coordinates")]
+        if not coords:
+            return None
+        lats = [coord["lat"] for coord in coords]
+        lngs = [coord["lng"] for coord in coords]
+        return {"north": max(lats), "south": min(lats), "east": max(lngs), "west": min(lngs)}
+
+    @classmethod
+    def build(cls, tour: Dict[str, Any], landmarks_by_id: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the bundle of one tour.
+
+        Args:
+            tour: Coerced tour record
+            landmarks_by_id: Landmark records keyed by id
+
+        Returns:
+            Bundle with the tour id, bounds, per-stage bounds and landmarks
+            (unknown landmark ids are left out)
+        """
+        landmarks: Dict[str, Dict[str, Any]] = {}
+        stages = []
+        for stage in tour.get("stages") or []:
+            found = [landmarks_by_id[i] for i in stage.get("landmarkIds", []) if i in landmarks_by_id]
+            for landmark in found:
+                landmarks.setdefault(landmark["id"], landmark)
+            stages.append({"index": stage.get("index"), "bounds": cls.bounds(found)})
+
+        bundle_landmarks = list(landmarks.values())
+        return {
+            "id": tour.get("id"),
+            "bounds": cls.bounds(bundle_landmarks),
+            "stages": stages,
+            "landmarks": bundle_landmarks,
+        }
+
+    def write(self, tours: List[Dict[str, Any]], landmarks: List[Dict[str, Any]]) -> str:
+        """
+        Publish one bundle per tour and the index, and remove stale bundles.
+
+        Returns:
+            Summary line for the console
+        """
+        converter = self.converter
+        landmarks_by_id = {landmark.get("id"): landmark for landmark in landmarks}
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+
+        entries: List[Dict[str, Any]] = []
+        published = {"index.json"}
+        for tour in tours:
+            bundle = self.build(tour, landmarks_by_id)
+            bundle_path = self.bundle_dir / f"{LandmarkShardWriter.shard_name('id', tour.get('id'))}.json"
+            if bundle_path.name in published:
+                raise ValueError(f"Tour id {tour.get('id')!r} maps to {self.DIRNAME}/{bundle_path.name}, which another tour uses")
+            converter._write_output(bundle_path, bundle)
+            published.add(bundle_path.name)
+            entries.append({
+                "id": bundle["id"],
+                "url": f"{converter.public_url_prefix}/{self.DIRNAME}/{bundle_path.name}",
+                "count": len(bundle["landmarks"]),
+                "bounds": bundle["bounds"],
+            })
+        converter._write_output(self.bundle_dir / "index.json", {"tours": entries})
+
+        for path in self.bundle_dir.iterdir():
+            if path.is_file() and path.name.split(".json")[0] + ".json" not in published:
+                path.unlink()
+
+        return f"Wrote {len(entries)} tour bundle(s)"
+
+    @classmethod
+    def remove(cls, output_dir: Path) -> None:
+        """Remove previously published bundles (when bundles are turned off)."""
+        bundle_dir = output_dir / cls.DIRNAME
+        if (bundle_dir / "index.json").exists():
+            for path in bundle_dir.iterdir():
+                if path.is_file():
+                    path.unlink()
+            bundle_dir.rmdir()
+
+
+class AssetManifestWriter:
+    """
+    Publishes content-hashed copies of the top-level JSON outputs.
+
+    Every ``<name>.json`` in the output directory is copied, with its
+    precompressed copies, to ``<name>.<hash>.json`` (the first
+    ``HASH_LENGTH`` hex digits of its SHA-256), and ``manifest.json`` maps
+    each logical name to the URL of its hashed copy. Hashed files never
+    change, so ``next.config.js`` serves them with ``Cache-Control:
+    immutable`` (its pattern matches ``HASH_LENGTH`` hex digits). Files in
+    the shard and tour bundle directories keep fixed names and are not
+    listed here; they revalidate like the manifest. The ``keep_versions`` most recent
+    versions of each file are kept, so pages that loaded an older manifest
+    can still fetch their data; older versions are removed.
+    """
+
+    FILENAME = "manifest.json"
+    VERSION = 1
+    HASH_LENGTH = 8
+    _HASHED_RE = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})\.json(?:\.gz|\.br)?$" % HASH_LENGTH)
+
+    def __init__(self, converter: "CSVToJSONConverter", keep_versions: int):
+        """
+        Args:
+            converter: Converter whose output directory and URL prefix are used
+            keep_versions: Versions of each file to keep, the current one included
+        """
+        self.converter = converter
+        self.output_dir = converter.output_dir
+        self.keep_versions = keep_versions
+
+    def write(self) -> str:
+        """
+        Copy every output to its hashed name, write the manifest and remove old versions.
+
+        Returns:
+            Summary line for the console
+        """
+        files: Dict[str, str] = {}
+        current = set()
+        for path in sorted(self.output_dir.glob("*.json")):
+            if path.name == self.FILENAME or self._HASHED_RE.match(path.name):
+                continue
+            digest = file_sha256(path)[:self.HASH_LENGTH]
+            hashed_name = f"{path.stem}.{digest}.json"
+            for suffix in ("", ".gz", ".br"):
+                source = path.with_name(f"{path.name}{suffix}")
+                if source.exists():
+                    self._publish(source, self.output_dir / f"{hashed_name}{suffix}")
+            current.add(hashed_name)
+            files[path.name] = f"{self.converter.public_url_prefix}/{hashed_name}"
+
+        self.converter._write_output(self.output_dir / self.FILENAME, {"version": self.VERSION, "files": files})
+        removed = self._remove_old_versions(current)
+        return f"Wrote {self.FILENAME} ({len(files)} hashed file(s), removed {removed} old version(s))"
+
+    @staticmethod
+    def _publish(source: Path, target: Path) -> None:
+        """Copy ``source`` to ``target`` unless that version exists; either way it becomes the newest."""
+        if target.exists():
+            os.utime(target)
+            return
+        with atomic_path(target) as tmp_path:
+            shutil.copyfile(source, tmp_path)
+
+    def _remove_old_versions(self, current: set) -> int:
+        """Remove hashed versions beyond the newest ``keep_versions`` of each file."""
+        versions: Dict[str, Dict[str, List[Path]]] = defaultdict(lambda: defaultdict(list))
+        for path in self.output_dir.iterdir():
+            match = self._HASHED_RE.match(path.name)
+            if match and path.is_file():
+                versions[match["stem"]][f"{match['stem']}.{match['hash']}.json"].append(path)
+
+        removed = 0
+        for by_version in versions.values():
+            newest_first = sorted(
+                by_version,
+                key=lambda name: (name in current, max(path.stat().st_mtime_ns for path in by_version[name])),
+                reverse=True,
+            )
+            for name in newest_first[self.keep_versions:]:
+                for path in by_version[name]:
+                    path.unlink()
+                removed += 1
+        return removed
+
+    @classmethod
+    def remove(cls, output_dir: Path) -> None:
+        """Remove the manifest and every hashed file (when hashed filenames are turned off)."""
+        if not (output_dir / cls.FILENAME).exists():
+            return
+        remove_output(output_dir / cls.FILENAME)
+        for path in output_dir.iterdir():
+            if cls._HASHED_RE.match(path.name) and path.is_file():
+                path.unlink()
+
+
+class SearchIndexBuilder:
+    """
+    Builds a serialized inverted index for client-side search.
+
+    Text in ``SEARCH_FIELDS`` is lowercased and split into alphanumeric
+    tokens (at least ``MIN_TOKEN_LENGTH`` characters, like Fuse.js's
+    ``minMatchCharLength``). The index holds a sorted vocabulary with
+    aligned postings of ``(doc, field)`` pairs, a prefix table of up to
+    ``PREFIX_LENGTH`` characters for type-ahead, and a trigram table for
+    typo-tolerant lookups. ``src/lib/prebuilt-search.ts`` reads this format.
+    """
+
+    FILENAME = "search-index.json"
+    VERSION = 1
+    MIN_TOKEN_LENGTH = 2
+    PREFIX_LENGTH = 4
+    NGRAM_SIZE = 3
+    _TOKEN_RE = re.compile(r"[^\W_]+")
+
+    def __init__(self):
+        self._docs: List[List[str]] = []
+        self._postings: Dict[str, set] = defaultdict(set)
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """Split text into lowercase alphanumeric search tokens."""
+        return [token for token in cls._TOKEN_RE.findall(text.lower()) if len(token) >= cls.MIN_TOKEN_LENGTH]
+
+    def add(self, entity_type: str, record: Dict[str, Any]) -> None:
+        """Index one record of a searchable entity type."""
+        doc = len(self._docs)
+        self._docs.append([SEARCH_ENTITIES[entity_type], str(record.get("id", "")), str(record.get("name", ""))])
+        for field_index, field in enumerate(SEARCH_FIELDS):
+            value = record.get(field)
+            if not value:
+                continue
+            text = " ".join(map(str, value)) if isinstance(value, list) else str(value)
+            for token in self.tokenize(text):
+                self._postings[token].add((doc, field_index))
+
+    def build(self) -> Dict[str, Any]:
+        """Return the serializable index."""
+        terms = sorted(self._postings)
+        prefixes: Dict[str, List[int]] = defaultdict(list)
+        ngrams: Dict[str, List[int]] = defaultdict(list)
+        postings: List[List[int]] = []
+        for term_index, term in enumerate(terms):
+            postings.append([value for pair in sorted(self._postings[term]) for value in pair])
+            for length in range(self.MIN_TOKEN_LENGTH, min(len(term), self.PREFIX_LENGTH) + 1):
+                prefixes[term[:length]].append(term_index)
+            for gram in sorted({term[i:i + self.NGRAM_SIZE] for i in range(len(term) - self.NGRAM_SIZE + 1)}):
+                ngrams[gram].append(term_index)
+
+        return {
+            "version": self.VERSION,
+            "fields": list(SEARCH_FIELDS),
+            "weights": list(SEARCH_WEIGHTS),
+            "prefixLength": self.PREFIX_LENGTH,
+            "ngramSize": self.NGRAM_SIZE,
+            "docs": self._docs,
+            "terms": terms,
+            "postings": postings,
+            "prefixes": dict(sorted(prefixes.items())),
+            "ngrams": dict(sorted(ngrams.items())),
+        }
@@ -11,7 +11,18 @@ import { Search, FileText, Box, Building2, Map } from 'lucide-react';
 import { Command, CommandEmpty, CommandGroup, CommandInput, CommandItem, CommandList } from '@/components/ui/command';
 import { useMapStore } from '@/lib/store';
 import { useFocusEntity } from '@/hooks/useFocusEntity';
-import { initializeSearchIndex, search as performSearch } from '@/lib/search';
+import {
+  createEntityLookup,
+  initializeSearchIndex,
+  search as performSearch,
+  searchPrebuilt,
+  type SearchEntityLookup,
+} from '@/lib/search';
+import {
+  fetchPrebuiltSearchIndex,
+  isPrebuiltSearchEnabled,
+  type PrebuiltSearchIndex,
+} from '@/lib/prebuilt-search';
 import type { SearchResult } from '@/types/search';
 import type { Landmark } from '@/types/data';
 import { cn } from '@/lib/utils';
@@ -120,7 +131,8 @@ export interface SearchBarProps {
 /**
  * SearchBar component with instant dropdown
  * Features:
- * - Fuzzy search across all entities
+ * - Fuzzy search across all entities (prebuilt index when the build has one,
+ *   otherwise a Fuse.js index built from the loaded data)
  * - Debounced input (300ms)
  * - Grouped results by type
  * - Keyboard navigation (built into Command component)
@@ -131,6 +143,9 @@ export function SearchBar({ className, placeholder = 'Search papers, models, cap
   const [isOpen, setIsOpen] = React.useState(false);
   const [results, setResults] = React.useState<SearchResult[]>([]);
   const searchIndexRef = React.useRef<ReturnType<typeof initializeSearchIndex> | null>(null);
+  const prebuiltIndexRef = React.useRef<PrebuiltSearchIndex | null>(null);
+  const entityLookupRef = React.useRef<SearchEntityLookup | null>(null);
+  const [usePrebuiltIndex, setUsePrebuiltIndex] = React.useState(isPrebuiltSearchEnabled);
 
   // Get data from store
   const capabilities = useMapStore((state) => state.capabilities);
@@ -141,16 +156,44 @@ export function SearchBar({ className, placeholder = 'Search papers, models, cap
   // Debounce the query
   const debouncedQuery = useDebounce(query, 300);
 
+  // Load the prebuilt index once; fall back to Fuse.js if it is unavailable
+  React.useEffect(() => {
+    if (!isPrebuiltSearchEnabled()) {
+      return;
+    }
+
+    let cancelled = false;
+    fetchPrebuiltSearchIndex().then((index) => {
+      if (cancelled) {
+        return;
+      }
+      if (index) {
+        prebuiltIndexRef.current = index;
+      } else {
+        setUsePrebuiltIndex(false);
+      }
+    });
+
+    return () => {
+      cancelled = true;
+    };
+  }, []);
+
   // Initialize search index when data is loaded
   React.useEffect(() => {
     if (capabilities.length > 0 || landmarks.length > 0 || organizations.length > 0) {
-      searchIndexRef.current = initializeSearchIndex({
-        capabilities,
-        landmarks,
-        organizations,
-      });
+      if (usePrebuiltIndex) {
+        // The prebuilt index only returns ids; resolve them to the loaded entities
+        entityLookupRef.current = createEntityLookup({ capabilities, landmarks, organizations });
+      } else {
+        searchIndexRef.current = initializeSearchIndex({
+          capabilities,
+          landmarks,
+          organizations,
+        });
+      }
     }
-  }, [capabilities, landmarks, organizations]);
+  }, [capabilities, landmarks, organizations, usePrebuiltIndex]);
 
   // Perform search when debounced query changes
   React.useEffect(() => {
@@ -160,12 +203,16 @@ export function SearchBar({ className, placeholder = 'Search papers, models, cap
       return;
     }
 
-    if (!searchIndexRef.current) {
+    let searchResults: SearchResult[];
+    if (prebuiltIndexRef.current && entityLookupRef.current) {
+      searchResults = searchPrebuilt(debouncedQuery, prebuiltIndexRef.current, entityLookupRef.current, 10);
+    } else if (searchIndexRef.current) {
+      searchResults = performSearch(debouncedQuery, searchIndexRef.current, 10);
+    } else {
       setResults([]);
       return;
     }
 
-    const searchResults = performSearch(debouncedQuery, searchIndexRef.current, 10);
     setResults(searchResults);
     setIsOpen(searchResults.length > 0);
   }, [debouncedQuery]);
@@ -2,6 +2,7 @@ import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
 import { renderHook, waitFor } from '@testing-library/react';
 import { useDataLoader } from '../useDataLoader';
 import { useMapStore } from '@/lib/store';
+import { DATA_MANIFEST_URL } from '@/lib/data-manifest';
 import type { Capability, Landmark, Organization } from '@/types/data';
 
 // Mock fetch globally
@@ -217,6 +218,8 @@ describe('useDataLoader', () => {
     // Verify data loaded successfully
     expect(result.current.data).toBeDefined();
     expect(result.current.data?.capabilities).toHaveLength(1);
+    // Without a data manifest every attempt went to the data files
+    expect(mockFetch.mock.calls.map(([url]) => url)).not.toContain(DATA_MANIFEST_URL);
   });
 
   it('should handle 404 errors', async () => {
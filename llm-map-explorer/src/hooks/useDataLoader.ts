@@ -8,6 +8,7 @@ import {
 } from '@/lib/schemas';
 import type { Capability, Landmark, Organization } from '@/types/data';
 import { normalizeCapability, normalizeLandmark } from '@/lib/data-normalizers';
+import { loadDataUrlResolver } from '@/lib/data-manifest';
 
 /**
  * Represents the state returned by the useDataLoader hook
@@ -116,11 +117,17 @@ export function useDataLoader(): DataLoaderState {
           return;
         }
 
-        // 1. Parallel Fetching - Fetch all JSON files simultaneously
+        // 1. Parallel Fetching - Fetch all JSON files simultaneously,
+        // through the hashed-filename manifest when there is one
+        const resolveDataUrl = await loadDataUrlResolver();
+        if (!isMounted) {
+          return;
+        }
+
         const [capabilitiesRes, landmarksRes, organizationsRes] = await Promise.all([
-          fetchWithRetry('/data/capabilities.json'),
-          fetchWithRetry('/data/landmarks.json'),
-          fetchWithRetry('/data/organizations.json'),
+          fetchWithRetry(resolveDataUrl('capabilities.json')),
+          fetchWithRetry(resolveDataUrl('landmarks.json')),
+          fetchWithRetry(resolveDataUrl('organizations.json')),
         ]);
 
         if (!isMounted) {
@@ -2,6 +2,7 @@
 import { useEffect } from 'react';
 import { useMapStore } from '@/lib/store';
 import { normalizeCapability, normalizeLandmark } from '@/lib/data-normalizers';
+import { loadDataUrlResolver } from '@/lib/data-manifest';
 import type { Capability, Landmark, Organization, Tour } from '@/types/data';
 
 export function useInitializeMapData() {
@@ -21,11 +22,16 @@ export function useInitializeMapData() {
           return;
         }
 
+        const resolveDataUrl = await loadDataUrlResolver();
+        if (!isMounted) {
+          return;
+        }
+
         const [capabilitiesRes, landmarksRes, organizationsRes, toursRes] = await Promise.all([
-          fetch('/data/capabilities.json'),
-          fetch('/data/landmarks.json'),
-          fetch('/data/organizations.json'),
-          fetch('/data/tours.json'),
+          fetch(resolveDataUrl('capabilities.json')),
+          fetch(resolveDataUrl('landmarks.json')),
+          fetch(resolveDataUrl('organizations.json')),
+          fetch(resolveDataUrl('tours.json')),
         ]);
 
         if (!isMounted) {
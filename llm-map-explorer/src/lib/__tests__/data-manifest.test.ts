@@ -0,0 +1,57 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
+import { DATA_MANIFEST_URL, loadDataUrlResolver } from '@/lib/data-manifest';
+
+describe('loadDataUrlResolver', () => {
+  afterEach(() => {
+    vi.restoreAllMocks();
+    vi.unstubAllEnvs();
+  });
+
+  it('should use fixed names without fetching when the build has no manifest', async () => {
+    vi.stubEnv('NEXT_PUBLIC_DATA_MANIFEST', '0');
+    const mockFetch = vi.fn();
+    global.fetch = mockFetch;
+
+    const resolve = await loadDataUrlResolver();
+
+    expect(mockFetch).not.toHaveBeenCalled();
+    expect(resolve('landmarks.json')).toBe('/data/landmarks.json');
+  });
+
+  describe('with a manifest', () => {
+    beforeEach(() => {
+      vi.stubEnv('NEXT_PUBLIC_DATA_MANIFEST', '1');
+    });
+
+    it('should resolve names to hashed URLs from the manifest', async () => {
+      const mockFetch = vi.fn().mockResolvedValue(
+        new Response(
+          JSON.stringify({ version: 1, files: { 'landmarks.json': '/data/landmarks.9c1005aa.json' } }),
+          { status: 200 }
+        )
+      );
+      global.fetch = mockFetch;
+
+      const resolve = await loadDataUrlResolver();
+
+      expect(mockFetch).toHaveBeenCalledTimes(1);
+      expect(mockFetch.mock.calls[0][0]).toBe(DATA_MANIFEST_URL);
+      expect(resolve('landmarks.json')).toBe('/data/landmarks.9c1005aa.json');
+      // Files missing from the manifest keep their fixed names
+      expect(resolve('tours.json')).toBe('/data/tours.json');
+    });
+
+    it.each([
+      ['a 404', () => Promise.resolve(new Response('Not Found', { status: 404 }))],
+      ['a network error', () => Promise.reject(new Error('offline'))],
+      ['invalid JSON', () => Promise.resolve(new Response('<html>', { status: 200 }))],
+      ['an unknown version', () => Promise.resolve(new Response('{"version":2,"files":{}}', { status: 200 }))],
+    ])('should fall back to fixed names on %s', async (_, respond) => {
+      global.fetch = vi.fn().mockImplementation(respond);
+
+      const resolve = await loadDataUrlResolver();
+
+      expect(resolve('landmarks.json')).toBe('/data/landmarks.json');
+    });
+  });
+});
@@ -0,0 +1,94 @@
+/**
+ * Data asset manifest
+ * Resolves logical data file names (e.g. "landmarks.json") to the
+ * content-hashed copies written by scripts/csv-to-json.py (--hashed-filenames),
+ * which can be cached as immutable. Builds without a manifest never request
+ * it (see isDataManifestEnabled), and a missing or unreadable manifest falls
+ * back to the fixed names.
+ */
+
+/**
+ * Manifest format written to public/data/manifest.json
+ */
+export interface DataManifest {
+  version: number;
+  /** Logical file name → URL of its hashed copy */
+  files: Record<string, string>;
+}
+
+export const DATA_MANIFEST_VERSION = 1;
+export const DATA_MANIFEST_URL = '/data/manifest.json';
+
+/**
+ * Resolves data file names through the manifest
+ */
+export type DataUrlResolver = (name: string) => string;
+
+/**
+ * Whether this build publishes a data manifest.
+ *
+ * next.config.js sets NEXT_PUBLIC_DATA_MANIFEST to '1' when
+ * public/data/manifest.json exists at build time, so builds without hashed
+ * filenames do not pay for a manifest request (and a 404) on every load.
+ */
+export function isDataManifestEnabled(): boolean {
+  return process.env.NEXT_PUBLIC_DATA_MANIFEST === '1';
+}
+
+/**
+ * Resolve names to their fixed URLs
+ */
+function fixedDataUrl(name: string): string {
+  return `/data/${name}`;
+}
+
+/**
+ * Check that parsed JSON looks like a manifest this build understands
+ */
+function isDataManifest(value: unknown): value is DataManifest {
+  if (typeof value !== 'object' || value === null) {
+    return false;
+  }
+  const manifest = value as Partial<DataManifest>;
+  return (
+    manifest.version === DATA_MANIFEST_VERSION &&
+    typeof manifest.files === 'object' &&
+    manifest.files !== null
+  );
+}
+
+/**
+ * Fetch the manifest once and return a resolver for data file URLs.
+ *
+ * Resolves immediately to the fixed names when the build has no manifest.
+ * Otherwise the manifest is fetched without retries: a failure only means
+ * the fixed file names are used.
+ *
+ * @example
+ * const resolve = await loadDataUrlResolver();
+ * const res = await fetch(resolve('landmarks.json'));
+ */
+export async function loadDataUrlResolver(): Promise<DataUrlResolver> {
+  if (!isDataManifestEnabled()) {
+    return fixedDataUrl;
+  }
+
+  let files: Record<string, string> = {};
+  try {
+    // Always revalidate the manifest itself; the files it points to are immutable
+    const response = await fetch(DATA_MANIFEST_URL, { cache: 'no-cache' });
+    if (response.ok) {
+      const manifest: unknown = await response.json();
+      if (isDataManifest(manifest)) {
+        files = manifest.files;
+      }
+    }
+  } catch {
+    // No manifest (or not JSON): use the fixed file names
+  }
+
+  return (name: string) => {
+    const url = files[name];
+    return typeof url === 'string' ? url : fixedDataUrl(name);
+  };
+}
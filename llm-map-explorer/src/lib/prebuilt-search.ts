@@ -0,0 +1,233 @@
+/**
+ * Prebuilt search index
+ * Loads the inverted index written by scripts/csv-to-json.py (--search-index)
+ * so search is ready without building a Fuse.js index on page load. Builds
+ * without the index never request it (see isPrebuiltSearchEnabled), and a
+ * missing or unreadable index falls back to Fuse.js.
+ */
+
+import { loadDataUrlResolver } from '@/lib/data-manifest';
+import type { SearchEntityType } from '@/types/search';
+
+/**
+ * Index format written to public/data/search-index.json
+ */
+export interface SerializedSearchIndex {
+  version: number;
+  /** Searchable fields, referenced by position in postings */
+  fields: string[];
+  /** Relevance weight of each field (same order as fields) */
+  weights: number[];
+  /** Maximum key length of the prefix table */
+  prefixLength: number;
+  /** N-gram size of the fuzzy lookup table */
+  ngramSize: number;
+  /** [entity type, id, name] per document */
+  docs: [SearchEntityType, string, string][];
+  /** Sorted vocabulary */
+  terms: string[];
+  /** Flattened [doc, field, doc, field, ...] pairs per term */
+  postings: number[][];
+  /** Prefix → term indices */
+  prefixes: Record<string, number[]>;
+  /** N-gram → term indices */
+  ngrams: Record<string, number[]>;
+}
+
+/**
+ * Loaded index ready for querying
+ */
+export interface PrebuiltSearchIndex {
+  source: SerializedSearchIndex;
+  termIds: Map<string, number>;
+  maxWeight: number;
+}
+
+/**
+ * Search hit from the prebuilt index
+ */
+export interface PrebuiltSearchHit {
+  entityType: SearchEntityType;
+  id: string;
+  name: string;
+  /** Relevance score (0-1, lower is better, like Fuse.js) */
+  score: number;
+}
+
+export const PREBUILT_SEARCH_INDEX_VERSION = 1;
+export const PREBUILT_SEARCH_INDEX_FILE = 'search-index.json';
+
+const TOKEN_PATTERN = /[\p{L}\p{N}]+/gu;
+const MIN_TOKEN_LENGTH = 2;
+const PREFIX_MATCH_QUALITY = 0.8;
+const FUZZY_MATCH_QUALITY = 0.6;
+const MIN_FUZZY_SIMILARITY = 0.5;
+
+/**
+ * Splits text into lowercase search tokens (same rules as the pipeline)
+ */
+export function tokenize(text: string): string[] {
+  return (text.toLowerCase().match(TOKEN_PATTERN) ?? []).filter(
+    (token) => token.length >= MIN_TOKEN_LENGTH
+  );
+}
+
+/**
+ * Prepares a serialized index for querying
+ *
+ * @param source - Parsed contents of search-index.json
+ * @returns Index ready for searchPrebuiltIndex
+ * @throws Error if the index was written by an incompatible pipeline version
+ */
+export function loadPrebuiltSearchIndex(source: SerializedSearchIndex): PrebuiltSearchIndex {
+  if (source.version !== PREBUILT_SEARCH_INDEX_VERSION) {
+    throw new Error(`Unsupported search index version: ${source.version}`);
+  }
+
+  const termIds = new Map<string, number>();
+  source.terms.forEach((term, termId) => termIds.set(term, termId));
+
+  return { source, termIds, maxWeight: Math.max(...source.weights) };
+}
+
+/**
+ * Whether this build publishes a prebuilt search index.
+ *
+ * next.config.js sets NEXT_PUBLIC_SEARCH_INDEX to '1' when
+ * public/data/search-index.json exists at build time (written by
+ * scripts/csv-to-json.py --search-index); otherwise search uses Fuse.js.
+ */
+export function isPrebuiltSearchEnabled(): boolean {
+  return process.env.NEXT_PUBLIC_SEARCH_INDEX === '1';
+}
+
+/**
+ * Fetch and load the prebuilt index.
+ *
+ * The URL is resolved through the data manifest, so hashed builds fetch the
+ * immutable copy. Resolves to null when the build has no index or it cannot
+ * be loaded, in which case callers build a Fuse.js index instead.
+ *
+ * @example
+ * const index = await fetchPrebuiltSearchIndex();
+ * const hits = index ? searchPrebuiltIndex(index, 'attention') : [];
+ */
+export async function fetchPrebuiltSearchIndex(): Promise<PrebuiltSearchIndex | null> {
+  if (!isPrebuiltSearchEnabled()) {
+    return null;
+  }
+
+  try {
+    const resolve = await loadDataUrlResolver();
+    const response = await fetch(resolve(PREBUILT_SEARCH_INDEX_FILE));
+    if (!response.ok) {
+      return null;
+    }
+    return loadPrebuiltSearchIndex((await response.json()) as SerializedSearchIndex);
+  } catch {
+    // Offline, not JSON or an incompatible version: fall back to Fuse.js
+    return null;
+  }
+}
+
+function ngramsOf(text: string, size: number): Set<string> {
+  const grams = new Set<string>();
+  for (let i = 0; i + size <= text.length; i++) {
+    grams.add(text.slice(i, i + size));
+  }
+  return grams;
+}
+
+/**
+ * Resolves a query token to vocabulary terms with a match quality (0-1):
+ * exact matches, then prefix matches, then n-gram (typo-tolerant) matches
+ */
+function expandToken(index: PrebuiltSearchIndex, token: string): Map<number, number> {
+  const { terms, prefixes, ngrams, prefixLength, ngramSize } = index.source;
+  const matches = new Map<number, number>();
+
+  const exact = index.termIds.get(token);
+  if (exact !== undefined) {
+    matches.set(exact, 1);
+  }
+
+  for (const termId of prefixes[token.slice(0, prefixLength)] ?? []) {
+    if (termId !== exact && terms[termId].startsWith(token)) {
+      matches.set(termId, PREFIX_MATCH_QUALITY);
+    }
+  }
+
+  if (matches.size > 0 || token.length < ngramSize) {
+    return matches;
+  }
+
+  const tokenGrams = ngramsOf(token, ngramSize);
+  const shared = new Map<number, number>();
+  tokenGrams.forEach((gram) => {
+    for (const termId of ngrams[gram] ?? []) {
+      shared.set(termId, (shared.get(termId) ?? 0) + 1);
+    }
+  });
+
+  shared.forEach((count, termId) => {
+    const similarity = (2 * count) / (tokenGrams.size + ngramsOf(terms[termId], ngramSize).size);
+    if (similarity >= MIN_FUZZY_SIMILARITY) {
+      matches.set(termId, similarity * FUZZY_MATCH_QUALITY);
+    }
+  });
+
+  return matches;
+}
+
+/**
+ * Searches the prebuilt index
+ *
+ * Each query token contributes its best field match per document, weighted
+ * like the Fuse.js keys (name > tags > description/authors).
+ *
+ * @param index - Loaded prebuilt index
+ * @param query - Search string
+ * @param limit - Maximum number of results to return (default: 10)
+ * @returns Hits sorted by relevance (lowest score first)
+ *
+ * @example
+ * ```typescript
+ * const index = loadPrebuiltSearchIndex(await response.json());
+ * const hits = searchPrebuiltIndex(index, 'attention');
+ * ```
+ */
+export function searchPrebuiltIndex(
+  index: PrebuiltSearchIndex,
+  query: string,
+  limit: number = 10
+): PrebuiltSearchHit[] {
+  const tokens = Array.from(new Set(tokenize(query)));
+  if (tokens.length === 0) {
+    return [];
+  }
+
+  const { docs, postings, weights } = index.source;
+  const totals = new Map<number, number>();
+
+  tokens.forEach((token) => {
+    const best = new Map<number, number>();
+    expandToken(index, token).forEach((quality, termId) => {
+      const pairs = postings[termId];
+      for (let i = 0; i < pairs.length; i += 2) {
+        const value = weights[pairs[i + 1]] * quality;
+        if (value > (best.get(pairs[i]) ?? 0)) {
+          best.set(pairs[i], value);
+        }
+      }
+    });
+    best.forEach((value, doc) => totals.set(doc, (totals.get(doc) ?? 0) + value));
+  });
+
+  const maxTotal = tokens.length * index.maxWeight;
+  return Array.from(totals, ([doc, total]) => {
+    const [entityType, id, name] = docs[doc];
+    return { entityType, id, name, score: 1 - total / maxTotal };
+  })
+    .sort((a, b) => a.score - b.score || a.name.localeCompare(b.name))
+    .slice(0, limit);
+}
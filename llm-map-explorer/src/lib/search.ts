@@ -7,6 +7,7 @@
 import Fuse, { type IFuseOptions } from 'fuse.js';
 import type { Capability, Landmark, Organization } from '@/types/data';
 import type { SearchResult, SearchEntityType } from '@/types/search';
+import { searchPrebuiltIndex, type PrebuiltSearchIndex } from '@/lib/prebuilt-search';
 
 /**
  * Searchable entity combining all searchable types
@@ -132,6 +133,63 @@ export function search(
   });
 }
 
+/**
+ * Loaded entities keyed by entity type and id, for resolving prebuilt index hits
+ */
+export type SearchEntityLookup = Map<string, Capability | Landmark | Organization>;
+
+function lookupKey(entityType: SearchEntityType, id: string): string {
+  return `${entityType}:${id}`;
+}
+
+/**
+ * Indexes loaded entities by type and id for searchPrebuilt
+ *
+ * @param data - Object containing capabilities, landmarks, and organizations
+ * @returns Lookup of every entity
+ */
+export function createEntityLookup(data: SearchIndexData): SearchEntityLookup {
+  const lookup: SearchEntityLookup = new Map();
+  data.capabilities.forEach((c) => lookup.set(lookupKey('capability', c.id), c));
+  data.landmarks.forEach((l) => lookup.set(lookupKey('landmark', l.id), l));
+  data.organizations.forEach((o) => lookup.set(lookupKey('organization', o.id), o));
+  return lookup;
+}
+
+/**
+ * Performs a search query against the prebuilt index
+ *
+ * Hits are resolved to the loaded entities, so results have the same shape as
+ * search() (without match highlights). Hits for entities that are not loaded
+ * are skipped.
+ *
+ * @param query - Search string
+ * @param index - Loaded prebuilt index (see fetchPrebuiltSearchIndex)
+ * @param lookup - Loaded entities (see createEntityLookup)
+ * @param limit - Maximum number of results to return (default: 10)
+ * @returns Array of search results sorted by relevance
+ *
+ * @example
+ * ```typescript
+ * const results = searchPrebuilt("attention", index, createEntityLookup(data));
+ * ```
+ */
+export function searchPrebuilt(
+  query: string,
+  index: PrebuiltSearchIndex,
+  lookup: SearchEntityLookup,
+  limit: number = 10
+): SearchResult[] {
+  const results: SearchResult[] = [];
+  searchPrebuiltIndex(index, query, limit).forEach((hit) => {
+    const item = lookup.get(lookupKey(hit.entityType, hit.id));
+    if (item) {
+      results.push({ item, entityType: hit.entityType, score: hit.score });
+    }
+  });
+  return results;
+}
+
 /**
  * Filters search results by entity type
  *
@@ -3,6 +3,8 @@
  * Based on architecture.md Section 4: Data Models
  */
 
+import type { BoundingBox } from '@/lib/utils';
+
 /**
  * Geographic coordinate representation
  */
@@ -185,6 +187,21 @@ export interface Tour {
   tags: string[];
 }
 
+/**
+ * Landmarks referenced by a tour, precomputed by the data pipeline
+ * (public/data/tours/<tourId>.json, written with --tour-bundles)
+ */
+export interface TourBundle {
+  /** Tour identifier */
+  id: string;
+  /** Bounding box of all referenced landmarks (null if none have coordinates) */
+  bounds: BoundingBox | null;
+  /** Bounding box of each stage's landmarks */
+  stages: { index: number; bounds: BoundingBox | null }[];
+  /** Referenced landmarks, in order of first appearance */
+  landmarks: Landmark[];
+}
+
 /**
  * Model-specific metadata
  */
@@ -16,6 +16,7 @@ export type {
   TourDifficulty,
   TourStage,
   Tour,
+  TourBundle,
   ModelMetadata,
   ModelLandmark,
 } from './data';
@@ -8,6 +8,7 @@ import { render, screen, waitFor, act } from '@testing-library/react';
 import userEvent from '@testing-library/user-event';
 import { SearchBar } from '@/components/search/SearchBar';
 import type { Capability, Landmark } from '@/types/data';
+import type { PrebuiltSearchIndex } from '@/lib/prebuilt-search';
 
 // Mock the store
 vi.mock('@/lib/store', () => ({
@@ -18,10 +19,19 @@ vi.mock('@/lib/store', () => ({
 vi.mock('@/lib/search', () => ({
   initializeSearchIndex: vi.fn(() => ({})),
   search: vi.fn(() => []),
+  createEntityLookup: vi.fn(() => new Map()),
+  searchPrebuilt: vi.fn(() => []),
+}));
+
+// Mock the prebuilt index (disabled unless a test enables it)
+vi.mock('@/lib/prebuilt-search', () => ({
+  isPrebuiltSearchEnabled: vi.fn(() => false),
+  fetchPrebuiltSearchIndex: vi.fn(() => Promise.resolve(null)),
 }));
 
 import * as storeModule from '@/lib/store';
 import * as searchModule from '@/lib/search';
+import * as prebuiltSearchModule from '@/lib/prebuilt-search';
 
 describe('SearchBar Component', () => {
   const mockCapabilities: Capability[] = [
@@ -94,6 +104,7 @@ describe('SearchBar Component', () => {
 
     // Reset search mock
     vi.mocked(searchModule.search).mockReturnValue([]);
+    vi.mocked(prebuiltSearchModule.isPrebuiltSearchEnabled).mockReturnValue(false);
   });
 
   afterEach(() => {
@@ -161,6 +172,52 @@ describe('SearchBar Component', () => {
     });
   });
 
+  describe('Prebuilt Index', () => {
+    beforeEach(() => {
+      vi.mocked(prebuiltSearchModule.isPrebuiltSearchEnabled).mockReturnValue(true);
+    });
+
+    it('should search the prebuilt index instead of building Fuse.js', async () => {
+      const prebuiltIndex = {} as PrebuiltSearchIndex;
+      vi.mocked(prebuiltSearchModule.fetchPrebuiltSearchIndex).mockResolvedValue(prebuiltIndex);
+
+      const user = userEvent.setup();
+      render(<SearchBar />);
+
+      await user.type(screen.getByRole('combobox'), 'attention');
+
+      await waitFor(
+        () => {
+          expect(searchModule.searchPrebuilt).toHaveBeenCalledWith('attention', prebuiltIndex, expect.any(Map), 10);
+        },
+        { timeout: 500 }
+      );
+      expect(searchModule.initializeSearchIndex).not.toHaveBeenCalled();
+      expect(searchModule.search).not.toHaveBeenCalled();
+    });
+
+    it('should fall back to Fuse.js when the index cannot be loaded', async () => {
+      vi.mocked(prebuiltSearchModule.fetchPrebuiltSearchIndex).mockResolvedValue(null);
+
+      const user = userEvent.setup();
+      render(<SearchBar />);
+
+      await waitFor(() => {
+        expect(searchModule.initializeSearchIndex).toHaveBeenCalled();
+      });
+
+      await user.type(screen.getByRole('combobox'), 'attention');
+
+      await waitFor(
+        () => {
+          expect(searchModule.search).toHaveBeenCalledWith('attention', {}, 10);
+        },
+        { timeout: 500 }
+      );
+      expect(searchModule.searchPrebuilt).not.toHaveBeenCalled();
+    });
+  });
+
   describe('Results Display', () => {
     it('should display search results with real timers', async () => {
       const mockResults = [
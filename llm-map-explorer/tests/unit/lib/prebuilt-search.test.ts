@@ -0,0 +1,193 @@
+/**
+ * Unit tests for the prebuilt search index
+ * Queries tests/fixtures/search-index.json, written by scripts/csv-to-json.py
+ * from the committed CSVs. Regenerate it after changing SearchIndexBuilder:
+ *
+ *   python scripts/csv-to-json.py --search-index --profile compact
+ *   cp public/data/search-index.json tests/fixtures/search-index.json
+ */
+
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import {
+  fetchPrebuiltSearchIndex,
+  loadPrebuiltSearchIndex,
+  searchPrebuiltIndex,
+  tokenize,
+  type SerializedSearchIndex,
+} from '@/lib/prebuilt-search';
+import { createEntityLookup, searchPrebuilt } from '@/lib/search';
+import type { Capability, Landmark, Organization } from '@/types/data';
+import fixture from '../../fixtures/search-index.json';
+
+const serialized = fixture as unknown as SerializedSearchIndex;
+const index = loadPrebuiltSearchIndex(serialized);
+
+function ids(query: string, limit?: number): string[] {
+  return searchPrebuiltIndex(index, query, limit).map((hit) => hit.id);
+}
+
+describe('tokenize', () => {
+  it('should lowercase and split on non-alphanumeric characters', () => {
+    expect(tokenize("GPT-4: Attention's  ALL")).toEqual(['gpt', 'attention', 'all']);
+  });
+
+  it('should drop single-character tokens', () => {
+    expect(tokenize('a b GPT-4')).toEqual(['gpt']);
+  });
+});
+
+describe('loadPrebuiltSearchIndex', () => {
+  it('should load the pipeline-built index', () => {
+    expect(index.source.fields).toEqual(['name', 'tags', 'description', 'authors']);
+    expect(index.maxWeight).toBe(2);
+    expect(index.termIds.get('attention')).toBe(serialized.terms.indexOf('attention'));
+  });
+
+  it('should reject an index from an incompatible pipeline version', () => {
+    expect(() => loadPrebuiltSearchIndex({ ...serialized, version: 2 })).toThrow(
+      'Unsupported search index version: 2'
+    );
+  });
+});
+
+describe('searchPrebuiltIndex', () => {
+  it('should return no results for empty or too-short queries', () => {
+    expect(searchPrebuiltIndex(index, '')).toEqual([]);
+    expect(searchPrebuiltIndex(index, '   ')).toEqual([]);
+    expect(searchPrebuiltIndex(index, 'a')).toEqual([]);
+  });
+
+  it('should return no results for unknown terms', () => {
+    expect(searchPrebuiltIndex(index, 'zzzz')).toEqual([]);
+  });
+
+  it('should find exact name matches with a perfect score', () => {
+    const [first] = searchPrebuiltIndex(index, 'anthropic');
+
+    expect(first).toEqual({ entityType: 'organization', id: 'org-004', name: 'Anthropic', score: 0 });
+  });
+
+  it('should rank name matches above description matches', () => {
+    // Constitutional AI only mentions Anthropic in its description
+    expect(ids('anthropic')).toEqual(['org-004', 'constitutional-ai']);
+  });
+
+  it('should rank documents matching every query token first', () => {
+    expect(ids('attention all')[0]).toBe('landmark-001');
+    expect(ids('Attention Is All')[0]).toBe('landmark-001');
+  });
+
+  it('should break score ties by name', () => {
+    expect(searchPrebuiltIndex(index, 'gpt', 3)).toEqual([
+      { entityType: 'landmark', id: 'landmark-003', name: 'GPT-2', score: 0 },
+      { entityType: 'landmark', id: 'landmark-004', name: 'GPT-3', score: 0 },
+      { entityType: 'landmark', id: 'landmark-018', name: 'GPT-4', score: 0 },
+    ]);
+  });
+
+  it('should match prefixes for type-ahead', () => {
+    const hits = searchPrebuiltIndex(index, 'atten');
+
+    expect(hits.map((hit) => hit.id)).toEqual(['attention-architecture', 'landmark-001']);
+    hits.forEach((hit) => expect(hit.score).toBeCloseTo(0.2));
+    // Longer terms starting with the token still match
+    expect(ids('gpt')).toContain('landmark-012'); // GPTQ
+  });
+
+  it('should tolerate typos', () => {
+    expect(ids('attentoin')).toEqual(['attention-architecture', 'landmark-001']);
+    expect(ids('transformr')[0]).toBe('landmark-022'); // Transformer-XL
+  });
+
+  it('should score typo matches below prefix and exact matches', () => {
+    const [exact] = searchPrebuiltIndex(index, 'attention');
+    const [prefix] = searchPrebuiltIndex(index, 'atten');
+    const [typo] = searchPrebuiltIndex(index, 'attentoin');
+
+    expect(exact.score).toBeLessThan(prefix.score);
+    expect(prefix.score).toBeLessThan(typo.score);
+    expect(typo.score).toBeLessThan(1);
+  });
+
+  it('should respect the limit', () => {
+    expect(ids('openai').length).toBeGreaterThan(3);
+    expect(ids('openai', 3)).toHaveLength(3);
+    expect(ids('openai', 3)).toEqual(ids('openai').slice(0, 3));
+    expect(ids('openai', 3)[0]).toBe('org-001');
+  });
+
+  it('should return results sorted by score', () => {
+    const scores = searchPrebuiltIndex(index, 'openai gpt').map((hit) => hit.score);
+
+    expect(scores).toEqual([...scores].sort((a, b) => a - b));
+  });
+});
+
+describe('searchPrebuilt', () => {
+  const capabilities = [{ id: 'attention-architecture', name: 'Attention & Architecture' }] as Capability[];
+  const landmarks = [{ id: 'landmark-001', name: 'Attention Is All You Need', type: 'paper' }] as Landmark[];
+  const organizations = [{ id: 'org-004', name: 'Anthropic' }] as Organization[];
+  const lookup = createEntityLookup({ capabilities, landmarks, organizations });
+
+  it('should resolve hits to the loaded entities', () => {
+    const results = searchPrebuilt('attention', index, lookup);
+
+    expect(results).toEqual([
+      { item: capabilities[0], entityType: 'capability', score: 0 },
+      { item: landmarks[0], entityType: 'landmark', score: 0 },
+    ]);
+  });
+
+  it('should skip hits for entities that are not loaded', () => {
+    // Constitutional AI is in the index but not in the lookup
+    expect(searchPrebuilt('anthropic', index, lookup).map((result) => result.item.id)).toEqual([
+      'org-004',
+    ]);
+  });
+
+  it('should return no results for an empty query', () => {
+    expect(searchPrebuilt('', index, lookup)).toEqual([]);
+  });
+});
+
+describe('fetchPrebuiltSearchIndex', () => {
+  afterEach(() => {
+    vi.restoreAllMocks();
+    vi.unstubAllEnvs();
+  });
+
+  it('should not fetch when the build has no index', async () => {
+    vi.stubEnv('NEXT_PUBLIC_SEARCH_INDEX', '0');
+    const mockFetch = vi.fn();
+    global.fetch = mockFetch;
+
+    expect(await fetchPrebuiltSearchIndex()).toBeNull();
+    expect(mockFetch).not.toHaveBeenCalled();
+  });
+
+  it('should fetch and load the index', async () => {
+    vi.stubEnv('NEXT_PUBLIC_SEARCH_INDEX', '1');
+    vi.stubEnv('NEXT_PUBLIC_DATA_MANIFEST', '0');
+    const mockFetch = vi.fn().mockResolvedValue(new Response(JSON.stringify(fixture), { status: 200 }));
+    global.fetch = mockFetch;
+
+    const loaded = await fetchPrebuiltSearchIndex();
+
+    expect(mockFetch).toHaveBeenCalledTimes(1);
+    expect(mockFetch.mock.calls[0][0]).toBe('/data/search-index.json');
+    expect(loaded && searchPrebuiltIndex(loaded, 'anthropic')[0].id).toBe('org-004');
+  });
+
+  it.each([
+    ['a 404', () => Promise.resolve(new Response('Not Found', { status: 404 }))],
+    ['a network error', () => Promise.reject(new Error('offline'))],
+    ['invalid JSON', () => Promise.resolve(new Response('<html>', { status: 200 }))],
+    ['an unknown version', () => Promise.resolve(new Response('{"version":2}', { status: 200 }))],
+  ])('should resolve to null on %s', async (_, respond) => {
+    vi.stubEnv('NEXT_PUBLIC_SEARCH_INDEX', '1');
+    vi.stubEnv('NEXT_PUBLIC_DATA_MANIFEST', '0');
+    global.fetch = vi.fn().mockImplementation(respond);
+
+    expect(await fetchPrebuiltSearchIndex()).toBeNull();
+  });
+});